@@ -5,8 +5,12 @@ import os
 
 from flask import Flask
 
-from app.extensions import cors, db, migrate
+from app.cli import register_commands
+from app.extensions import cache, cors, db, metrics, migrate
+from app.json_provider import FastJSONProvider
 from app.middleware.error_handler import register_error_handlers
+from app.middleware.query_audit import register_query_audit
+from app.middleware.request_timing import register_request_timing
 from config import config
 
 
@@ -25,6 +29,7 @@ def create_app(config_name=None):
 
     app = Flask(__name__)
     app.config.from_object(config.get(config_name, config["default"]))
+    app.json = FastJSONProvider(app)
 
     # --------------- Logging ---------------
     log_level = logging.DEBUG if app.debug else logging.INFO
@@ -36,23 +41,41 @@ def create_app(config_name=None):
     # --------------- Extensions ---------------
     db.init_app(app)
     migrate.init_app(app, db)
+    cache.init_app(app)
+    metrics.init_app(app)
     cors.init_app(
         app,
         resources={r"/api/*": {"origins": "*"}},
-        expose_headers=["X-Total-Count"],
+        expose_headers=[
+            "X-Total-Count",
+            "X-Total-Count-Mode",
+            "X-Next-Cursor",
+            "ETag",
+        ],
     )
 
     # --------------- Blueprints ---------------
     from app.controllers.campaign_controller import campaign_bp
     from app.controllers.dashboard_controller import dashboard_bp
     from app.controllers.health_controller import health_bp
+    from app.controllers.insight_controller import insight_bp
 
     app.register_blueprint(campaign_bp, url_prefix="/api/campaigns")
     app.register_blueprint(dashboard_bp, url_prefix="/api/dashboard")
+    app.register_blueprint(insight_bp, url_prefix="/api/insights")
     app.register_blueprint(health_bp, url_prefix="/api")
 
     # --------------- Error handlers ---------------
     register_error_handlers(app)
 
+    # --------------- Request timing (Server-Timing) ---------------
+    register_request_timing(app)
+
+    # --------------- Query budgets / N+1 detection ---------------
+    register_query_audit(app)
+
+    # --------------- CLI commands ---------------
+    register_commands(app)
+
     app.logger.info("Application created with config: %s", config_name)
     return app
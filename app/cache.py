@@ -0,0 +1,243 @@
+"""Versioned read-through cache for expensive read endpoints.
+
+Cached values are keyed by a namespace plus the normalised call arguments
+and stamped with a global *data version*.  Service write methods call
+:meth:`ResponseCache.bump_version`, which makes every earlier entry a miss
+without having to enumerate keys.  Entries also expire after
+``CACHE_TTL`` seconds; for a further ``CACHE_STALE_TTL`` seconds an expired
+entry is still served while a background thread recomputes it
+(stale-while-revalidate).
+
+Backends (``CACHE_BACKEND``):
+
+* ``lru``   -- in-process LRU.  The version counter is per process, so
+  under several gunicorn workers a write only invalidates its own worker;
+  other workers converge within ``CACHE_TTL``.
+* ``redis`` -- shared across workers and hosts (requires the optional
+  ``redis`` package and ``CACHE_REDIS_URL``).
+* ``none``  -- caching disabled.
+
+Only JSON-serialisable values may be cached.
+"""
+
+import functools
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+class LRUBackend:
+    """Bounded in-process store with a local version counter."""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry, expire):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_version(self):
+        return self._version
+
+    def bump_version(self):
+        with self._lock:
+            self._version += 1
+            return self._version
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._version += 1
+
+
+class RedisBackend:
+    """Redis-backed store shared by every worker process."""
+
+    def __init__(self, url, prefix="sb:cache:"):
+        try:
+            import redis
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError(
+                "CACHE_BACKEND=redis requires the 'redis' package"
+            ) from exc
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+        self._version_key = f"{prefix}version"
+
+    def get(self, key):
+        raw = self._client.get(self._prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, entry, expire):
+        self._client.set(
+            self._prefix + key, json.dumps(entry), ex=max(1, int(expire))
+        )
+
+    def get_version(self):
+        return int(self._client.get(self._version_key) or 0)
+
+    def bump_version(self):
+        return self._client.incr(self._version_key)
+
+    def clear(self):
+        self.bump_version()
+
+
+# ---------------------------------------------------------------------------
+# Cache front-end
+# ---------------------------------------------------------------------------
+class ResponseCache:
+    """Read-through cache with version-based invalidation."""
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.ttl = 30
+        self.stale_ttl = 30
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0}
+        # Counters are bumped from every request thread.
+        self._stats_lock = threading.Lock()
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configure the backend from ``app.config``."""
+        backend = app.config.get("CACHE_BACKEND", "lru")
+        self.ttl = app.config.get("CACHE_TTL", 30)
+        self.stale_ttl = app.config.get("CACHE_STALE_TTL", 30)
+
+        if backend == "lru":
+            self.backend = LRUBackend(app.config.get("CACHE_MAX_ENTRIES", 1024))
+        elif backend == "redis":
+            self.backend = RedisBackend(app.config["CACHE_REDIS_URL"])
+        elif backend == "none":
+            self.backend = None
+        else:
+            raise ValueError(f"Unknown CACHE_BACKEND: {backend!r}")
+
+        app.extensions["response_cache"] = self
+
+    @property
+    def enabled(self):
+        return self.backend is not None
+
+    # ---------------------------------------------------------------- keys
+    @staticmethod
+    def make_key(namespace, args, kwargs):
+        """Build a stable key from the namespace and call arguments."""
+        params = json.dumps(
+            {"args": list(args), "kwargs": kwargs},
+            sort_keys=True,
+            default=str,
+            separators=(",", ":"),
+        )
+        return f"{namespace}:{params}"
+
+    # ---------------------------------------------------------- versioning
+    def bump_version(self):
+        """Invalidate every cached entry (call after any data write)."""
+        if self.enabled:
+            self.backend.bump_version()
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        if self.enabled:
+            self.backend.clear()
+        with self._stats_lock:
+            self._stats = {"hits": 0, "stale_hits": 0, "misses": 0}
+
+    @property
+    def stats(self):
+        """A consistent copy of the hit / stale-hit / miss counters."""
+        with self._stats_lock:
+            return dict(self._stats)
+
+    # -------------------------------------------------------------- lookup
+    def get_or_set(self, key, compute):
+        """Return the cached value for ``key`` or compute and store it."""
+        if not self.enabled:
+            return compute()
+
+        version = self.backend.get_version()
+        entry = self.backend.get(key)
+        now = time.time()
+
+        if entry is not None and entry["version"] == version:
+            age = now - entry["stored_at"]
+            if age < self.ttl:
+                self._count("hits")
+                return entry["value"]
+            if age < self.ttl + self.stale_ttl:
+                self._count("stale_hits")
+                self._refresh_in_background(key, compute, version)
+                return entry["value"]
+
+        self._count("misses")
+        value = compute()
+        self._store(key, value, version)
+        return value
+
+    def cached(self, namespace):
+        """Decorator caching a function's return value under ``namespace``."""
+
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                key = self.make_key(namespace, args, kwargs)
+                return self.get_or_set(key, lambda: fn(*args, **kwargs))
+
+            return wrapper
+
+        return decorator
+
+    # ------------------------------------------------------------ internal
+    def _count(self, name):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def _store(self, key, value, version):
+        entry = {"version": version, "stored_at": time.time(), "value": value}
+        self.backend.set(key, entry, self.ttl + self.stale_ttl)
+
+    def _refresh_in_background(self, key, compute, version):
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        app = current_app._get_current_object()
+
+        def refresh():
+            try:
+                with app.app_context():
+                    self._store(key, compute(), version)
+            except Exception:
+                logger.exception("Cache refresh failed for %s", key)
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
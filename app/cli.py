@@ -0,0 +1,115 @@
+"""Flask CLI commands (``flask <group> <command>``).
+
+Commands are registered on the app in the application factory so they run
+inside an application context with the configured database.
+"""
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+summary_cli = AppGroup("summary", help="Dashboard summary table maintenance.")
+insights_cli = AppGroup("insights", help="Insight snapshot bulk operations.")
+
+
+@summary_cli.command("rebuild")
+def rebuild_summary():
+    """Rebuild campaign_summary from the campaigns table."""
+    from app.services.dashboard_service import DashboardService
+
+    count = DashboardService.rebuild_summary()
+    click.echo(f"✓ Rebuilt campaign_summary ({count} rows).")
+
+
+@insights_cli.command("ingest")
+@click.argument("source", type=click.File("r", encoding="utf-8"))
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["ndjson", "csv"]),
+    help="Input format (default: from the file extension).",
+)
+@click.option("--chunk-size", type=int, help="Rows per COPY round trip.")
+def ingest_insights(source, fmt, chunk_size):
+    """Load insight snapshots from SOURCE (a file path or '-' for stdin)."""
+    from app.services.ingest_service import InsightIngestService
+
+    if fmt is None:
+        fmt = "csv" if source.name.endswith(".csv") else "ndjson"
+    chunk_size = chunk_size or current_app.config["INGEST_CHUNK_SIZE"]
+
+    summary = InsightIngestService.ingest(source, fmt, chunk_size=chunk_size)
+    click.echo(
+        f"✓ Ingested {summary['inserted']} of {summary['received']} rows "
+        f"({summary['duplicates']} duplicates, "
+        f"{summary['unknownCampaigns']} unknown campaigns, "
+        f"{summary['rejected']} rejected)."
+    )
+    for error in summary["errors"]:
+        click.echo(f"  line {error['line']}: {error['details']}", err=True)
+
+
+@insights_cli.command("export")
+@click.argument("output", type=click.File("wb"))
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["ndjson", "csv", "arrow", "parquet"]),
+    help="Output format (default: from the file extension).",
+)
+@click.option("--campaign-id", help="Only this campaign's snapshots.")
+@click.option("--from", "start", help="Earliest capturedAt (ISO 8601).")
+@click.option("--to", "end", help="Latest capturedAt, exclusive (ISO 8601).")
+@click.option("--status", help="Only campaigns with this status.")
+@click.option("--platform", help="Only campaigns on this platform.")
+@click.option(
+    "--include-campaign",
+    is_flag=True,
+    help="Add campaign status / platform columns (arrow / parquet).",
+)
+def export_insights(output, fmt, include_campaign, **filters):
+    """Export insight snapshots to OUTPUT (a file path or '-' for stdout)."""
+    from marshmallow import ValidationError
+
+    from app.schemas import InsightExportQuerySchema
+    from app.services.export_service import (
+        EXPORT_EXTENSIONS,
+        ExportService,
+        UnexportableValue,
+    )
+
+    if fmt is None:
+        extension = output.name.rsplit(".", 1)[-1]
+        formats = {ext: name for name, ext in EXPORT_EXTENSIONS.items()}
+        fmt = formats.get(extension, "ndjson")
+
+    args = {
+        "format": fmt,
+        "campaignId": filters["campaign_id"],
+        "from": filters["start"],
+        "to": filters["end"],
+        "status": filters["status"],
+        "platform": filters["platform"],
+        "include": "campaign" if include_campaign else None,
+    }
+    try:
+        params = InsightExportQuerySchema().load(
+            {key: value for key, value in args.items() if value is not None}
+        )
+    except ValidationError as exc:
+        raise click.UsageError(str(exc.messages))
+
+    written = 0
+    try:
+        for chunk in ExportService.export_insights(**params):
+            output.write(chunk)
+            written += len(chunk)
+    except UnexportableValue as exc:
+        raise click.ClickException(f"Cannot export as {fmt}: {exc}")
+    click.echo(f"✓ Exported {written} bytes ({fmt}).", err=True)
+
+
+def register_commands(app):
+    """Register all CLI command groups on the Flask app."""
+    app.cli.add_command(summary_cli)
+    app.cli.add_command(insights_cli)
@@ -2,25 +2,46 @@
 
 Routes:
     GET    /api/campaigns                  List campaigns
+    GET    /api/campaigns/suggest          Typeahead suggestions
+    GET    /api/campaigns/export           Stream all matches (NDJSON / CSV)
     POST   /api/campaigns                  Create campaign
+    POST   /api/campaigns/batch            Create many campaigns
     GET    /api/campaigns/<id>             Get campaign
     PATCH  /api/campaigns/<id>             Update campaign
     DELETE /api/campaigns/<id>             Delete campaign
     GET    /api/campaigns/<id>/insights    Get campaign insights
+    GET    /api/campaigns/<id>/insights/series  Bucketed insight history
 """
 
+import hashlib
+import json
 import logging
 
-from flask import Blueprint, abort, jsonify, request
+from flask import Blueprint, abort, current_app, jsonify, make_response, request
+from marshmallow import ValidationError
 
+from app.extensions import cache
+from app.middleware.error_handler import APIError, format_validation_errors
+from app.middleware.query_audit import query_budget
+from app.middleware.request_timing import phase
 from app.schemas import (
+    CampaignBatchQuerySchema,
     CampaignCreateSchema,
-    CampaignInsightSchema,
+    CampaignExportQuerySchema,
+    CampaignGetQuerySchema,
     CampaignListQuerySchema,
-    CampaignSchema,
+    CampaignSuggestQuerySchema,
     CampaignUpdateSchema,
+    InsightSeriesQuerySchema,
+    campaign_row_dumper,
+    dump_campaign,
+    dump_campaign_rows,
+    dump_campaigns,
+    dump_insights,
+    encode_cursor,
 )
 from app.services.campaign_service import CampaignService
+from app.services.export_service import EXPORT_MIMETYPES, ExportService
 from app.services.insight_service import InsightService
 
 logger = logging.getLogger(__name__)
@@ -28,32 +49,128 @@ logger = logging.getLogger(__name__)
 campaign_bp = Blueprint("campaigns", __name__)
 
 # Instantiate schemas once (they are stateless & thread-safe)
-_campaign_schema = CampaignSchema()
-_campaigns_schema = CampaignSchema(many=True)
 _create_schema = CampaignCreateSchema()
+_get_query_schema = CampaignGetQuerySchema()
 _update_schema = CampaignUpdateSchema()
 _query_schema = CampaignListQuerySchema()
-_insight_schema = CampaignInsightSchema()
+_batch_query_schema = CampaignBatchQuerySchema()
+_series_query_schema = InsightSeriesQuerySchema()
+_suggest_query_schema = CampaignSuggestQuerySchema()
+_export_query_schema = CampaignExportQuerySchema()
+
+# Placeholder for NDJSON lines that are not valid JSON
+_INVALID_JSON = object()
+
+
+def _make_etag(*parts):
+    """Strong ETag value derived from ``parts``."""
+    raw = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _not_modified(etag):
+    """Empty 304 response carrying ``etag``."""
+    response = make_response("", 304)
+    response.set_etag(etag)
+    return response
 
 
 # ------------------------------------------------------------------
 # GET /api/campaigns
 # ------------------------------------------------------------------
 @campaign_bp.route("", methods=["GET"])
+@query_budget(4)
 def list_campaigns():
-    """Return a paginated list of campaigns with optional filters."""
+    """Return a paginated list of campaigns with optional filters.
+
+    ``X-Next-Cursor`` is set when more rows follow; pass it back as
+    ``cursor`` to fetch the next page.  ``X-Total-Count-Mode`` reports
+    whether ``X-Total-Count`` is exact, an estimate, or omitted.
+
+    The ETag is derived from the page itself (the query parameters, the
+    ``(id, updated_at)`` of every row and the headers), so a conditional
+    request costs no more than the page -- nothing when it is cached.
+    With ``include`` the embedded data changes independently of
+    campaigns, so the ETag hashes the whole payload instead.
+    """
     params = _query_schema.load(request.args)
-    campaigns, total = CampaignService.list_campaigns(**params)
+    body, headers, etag = _list_payload(**params)
+
+    if request.if_none_match.contains(etag):
+        return _not_modified(etag)
 
-    response = jsonify(_campaigns_schema.dump(campaigns))
-    response.headers["X-Total-Count"] = str(total)
+    response = jsonify(body)
+    response.headers.update(headers)
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
     return response
 
 
+@cache.cached("campaigns:list")
+def _list_payload(**params):
+    """Serialised list page, its headers and its ETag."""
+    page = CampaignService.list_campaigns(**params)
+
+    headers = {"X-Total-Count-Mode": page.count_mode}
+    if page.total is not None:
+        headers["X-Total-Count"] = str(page.total)
+    if page.next_key is not None:
+        headers["X-Next-Cursor"] = encode_cursor(*page.next_key)
+    with phase("serialize"):
+        body = dump_campaign_rows(page.items, params["field_names"])
+    if page.insights is not None:
+        for item, insight in zip(body, page.insights):
+            item["latestInsight"] = insight
+        etag = _make_etag(body, headers)
+    else:
+        versions = [(row.id, row.updated_at) for row in page.items]
+        etag = _make_etag(params, versions, headers)
+    return body, headers, etag
+
+
+# ------------------------------------------------------------------
+# GET /api/campaigns/suggest
+# ------------------------------------------------------------------
+@campaign_bp.route("/suggest", methods=["GET"])
+@query_budget(2)
+def suggest_campaigns():
+    """Return up to ``limit`` ``{id, name, status, platform}`` matches for
+    the typeahead prefix ``q`` (no count, no full serialisation)."""
+    params = _suggest_query_schema.load(request.args)
+    suggestions = CampaignService.suggest_campaigns(
+        params["q"], params["limit"]
+    )
+    return jsonify(suggestions)
+
+
+# ------------------------------------------------------------------
+# GET /api/campaigns/export
+# ------------------------------------------------------------------
+@campaign_bp.route("/export", methods=["GET"])
+@query_budget(repeats_ok=True)
+def export_campaigns():
+    """Stream every campaign matching the list filters as NDJSON or CSV.
+
+    Rows come from one consistent snapshot through a server-side cursor,
+    so memory use does not depend on the size of the export.
+    """
+    params = _export_query_schema.load(request.args)
+    fmt = params["fmt"]
+    chunks = ExportService.export_campaigns(**params)
+    return current_app.response_class(
+        chunks,
+        mimetype=EXPORT_MIMETYPES[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="campaigns.{fmt}"'
+        },
+    )
+
+
 # ------------------------------------------------------------------
 # POST /api/campaigns
 # ------------------------------------------------------------------
 @campaign_bp.route("", methods=["POST"])
+@query_budget(2)
 def create_campaign():
     """Create a new campaign."""
     body = request.get_json(silent=True)
@@ -62,25 +179,123 @@ def create_campaign():
 
     data = _create_schema.load(body)
     campaign = CampaignService.create_campaign(data)
-    return jsonify(_campaign_schema.dump(campaign)), 201
+    return jsonify(dump_campaign(campaign)), 201
+
+
+# ------------------------------------------------------------------
+# POST /api/campaigns/batch
+# ------------------------------------------------------------------
+@campaign_bp.route("/batch", methods=["POST"])
+@query_budget(2)
+def create_campaigns_batch():
+    """Create many campaigns in a single transaction.
+
+    Accepts a JSON array or NDJSON (``application/x-ndjson``) of
+    CampaignCreate payloads.  Invalid items are reported by index and
+    skipped (207); with ``atomic=true`` any invalid item rejects the whole
+    batch (400).
+    """
+    options = _batch_query_schema.load(request.args)
+    items = _parse_batch_body()
+
+    max_size = current_app.config["BATCH_MAX_SIZE"]
+    if len(items) > max_size:
+        raise APIError(
+            f"Batch exceeds the maximum of {max_size} items",
+            code="batch_too_large",
+            status_code=413,
+        )
+
+    rows, errors = [], []
+    for index, item in enumerate(items):
+        if item is _INVALID_JSON:
+            details = [{"field": "_schema", "message": "Invalid JSON."}]
+            errors.append({"index": index, "details": details})
+            continue
+        try:
+            rows.append(_create_schema.load(item))
+        except ValidationError as exc:
+            details = format_validation_errors(exc.messages)
+            errors.append({"index": index, "details": details})
+
+    if errors and options["atomic"]:
+        raise APIError(
+            "Validation failed",
+            code="validation_error",
+            details=[
+                {"field": f"[{e['index']}].{d['field']}", "message": d["message"]}
+                for e in errors
+                for d in e["details"]
+            ],
+        )
+
+    campaigns = CampaignService.create_campaigns(rows)
+    with phase("serialize"):
+        body = {"created": dump_campaigns(campaigns), "errors": errors}
+    return jsonify(body), 207 if errors else 201
+
+
+def _parse_batch_body():
+    """Return the list of raw batch items from a JSON array or NDJSON body."""
+    if request.mimetype == "application/x-ndjson":
+        items = []
+        for line in request.get_data(as_text=True).splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                items.append(_INVALID_JSON)
+        return items
+
+    body = request.get_json(silent=True)
+    if not isinstance(body, list):
+        abort(400, description="Request body must be a JSON array")
+    return body
 
 
 # ------------------------------------------------------------------
 # GET /api/campaigns/<id>
 # ------------------------------------------------------------------
 @campaign_bp.route("/<uuid:campaign_id>", methods=["GET"])
+@query_budget(2)
 def get_campaign(campaign_id):
-    """Fetch a single campaign by ID."""
-    campaign = CampaignService.get_campaign(campaign_id)
+    """Fetch a single campaign by ID.
+
+    Honours ``If-None-Match``: the freshness check reads only
+    ``updated_at``, so a 304 never loads or serialises the full row.
+    ``fields`` restricts both the columns loaded and the response keys.
+    """
+    field_names = _get_query_schema.load(request.args)["field_names"]
+
+    if request.if_none_match:
+        updated_at = CampaignService.get_campaign_version(campaign_id)
+        if updated_at is None:
+            abort(404, description="Campaign not found")
+        etag = _make_etag(campaign_id, updated_at, field_names)
+        if request.if_none_match.contains(etag):
+            return _not_modified(etag)
+
+    campaign = CampaignService.get_campaign(campaign_id, field_names)
     if campaign is None:
         abort(404, description="Campaign not found")
-    return jsonify(_campaign_schema.dump(campaign))
+
+    with phase("serialize"):
+        dump = campaign_row_dumper(field_names, campaign._fields)
+        body = dump(campaign)
+    response = jsonify(body)
+    response.set_etag(
+        _make_etag(campaign.id, campaign.updated_at, field_names)
+    )
+    response.cache_control.no_cache = True
+    return response
 
 
 # ------------------------------------------------------------------
 # PATCH /api/campaigns/<id>
 # ------------------------------------------------------------------
 @campaign_bp.route("/<uuid:campaign_id>", methods=["PATCH"])
+@query_budget(3)
 def update_campaign(campaign_id):
     """Partially update an existing campaign."""
     body = request.get_json(silent=True)
@@ -91,13 +306,14 @@ def update_campaign(campaign_id):
     campaign = CampaignService.update_campaign(campaign_id, data)
     if campaign is None:
         abort(404, description="Campaign not found")
-    return jsonify(_campaign_schema.dump(campaign))
+    return jsonify(dump_campaign(campaign))
 
 
 # ------------------------------------------------------------------
 # DELETE /api/campaigns/<id>
 # ------------------------------------------------------------------
 @campaign_bp.route("/<uuid:campaign_id>", methods=["DELETE"])
+@query_budget(2)
 def delete_campaign(campaign_id):
     """Delete a campaign."""
     deleted = CampaignService.delete_campaign(campaign_id)
@@ -110,11 +326,26 @@ def delete_campaign(campaign_id):
 # GET /api/campaigns/<id>/insights
 # ------------------------------------------------------------------
 @campaign_bp.route("/<uuid:campaign_id>/insights", methods=["GET"])
+@query_budget(2)
 def get_campaign_insights(campaign_id):
     """Return performance insights for a campaign."""
-    campaign = CampaignService.get_campaign(campaign_id)
-    if campaign is None:
+    if CampaignService.get_campaign_version(campaign_id) is None:
         abort(404, description="Campaign not found")
 
     insights = InsightService.get_campaign_insights(campaign_id)
-    return jsonify(_insight_schema.dump(insights))
+    return jsonify(dump_insights(insights))
+
+
+# ------------------------------------------------------------------
+# GET /api/campaigns/<id>/insights/series
+# ------------------------------------------------------------------
+@campaign_bp.route("/<uuid:campaign_id>/insights/series", methods=["GET"])
+@query_budget(2)
+def get_campaign_insight_series(campaign_id):
+    """Return bucketed insight history for charts."""
+    params = _series_query_schema.load(request.args)
+    if CampaignService.get_campaign_version(campaign_id) is None:
+        abort(404, description="Campaign not found")
+
+    series = InsightService.get_insight_series(campaign_id, **params)
+    return jsonify(series)
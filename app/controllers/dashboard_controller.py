@@ -8,6 +8,7 @@ import logging
 
 from flask import Blueprint, jsonify
 
+from app.middleware.query_audit import query_budget
 from app.services.dashboard_service import DashboardService
 
 logger = logging.getLogger(__name__)
@@ -16,6 +17,7 @@ dashboard_bp = Blueprint("dashboard", __name__)
 
 
 @dashboard_bp.route("/metrics", methods=["GET"])
+@query_budget(1)
 def get_metrics():
     """Return aggregated dashboard metrics."""
     metrics = DashboardService.get_metrics()
@@ -1,13 +1,15 @@
-"""Health-check endpoint.
+"""Health-check and operational endpoints.
 
-Useful for load balancers, container orchestrators, and uptime monitors.
+Useful for load balancers, container orchestrators, uptime monitors and
+Prometheus scrapers.
 """
 
 import logging
 
-from flask import Blueprint, jsonify
+from flask import Blueprint, Response, jsonify
 
-from app.extensions import db
+from app.extensions import cache, db, metrics
+from app.metrics import CONTENT_TYPE
 
 logger = logging.getLogger(__name__)
 
@@ -32,3 +34,26 @@ def health_check():
             ),
             503,
         )
+
+
+@health_bp.route("/cache/stats", methods=["GET"])
+def cache_stats():
+    """Report read-cache hit/miss counters for this worker process."""
+    stats = cache.stats
+    total = sum(stats.values())
+    hits = stats["hits"] + stats["stale_hits"]
+    return jsonify(
+        {
+            "enabled": cache.enabled,
+            "hits": stats["hits"],
+            "staleHits": stats["stale_hits"],
+            "misses": stats["misses"],
+            "hitRatio": round(hits / total, 4) if total else 0.0,
+        }
+    )
+
+
+@health_bp.route("/metrics", methods=["GET"])
+def prometheus_metrics():
+    """Prometheus text metrics, summed across all worker processes."""
+    return Response(metrics.render(), content_type=CONTENT_TYPE)
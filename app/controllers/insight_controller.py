@@ -0,0 +1,163 @@
+"""Insight API endpoints (Blueprint).
+
+Routes:
+    POST /api/insights/ingest   Bulk-load insight snapshots (NDJSON / CSV)
+    GET  /api/insights/latest   Latest snapshot for many campaigns (?ids=)
+    POST /api/insights/latest   Latest snapshot for many campaigns (body)
+    GET  /api/insights/export   Stream snapshots (NDJSON/CSV/Arrow/Parquet)
+"""
+
+import io
+import logging
+
+from flask import Blueprint, abort, current_app, jsonify, request
+
+from app.middleware.error_handler import APIError
+from app.middleware.query_audit import query_budget
+from app.schemas import InsightExportQuerySchema, LatestInsightsRequestSchema
+from app.schemas.campaign import COLUMNAR_FORMATS
+from app.services.export_service import (
+    COLUMNAR_AVAILABLE,
+    EXPORT_EXTENSIONS,
+    EXPORT_MIMETYPES,
+    ExportService,
+    UnexportableValue,
+)
+from app.services.ingest_service import InsightIngestService
+from app.services.insight_service import InsightService
+
+logger = logging.getLogger(__name__)
+
+insight_bp = Blueprint("insights", __name__)
+
+_latest_schema = LatestInsightsRequestSchema()
+_export_query_schema = InsightExportQuerySchema()
+
+_INGEST_MIMETYPES = {
+    "application/x-ndjson": "ndjson",
+    "text/csv": "csv",
+}
+
+
+class _WSGIInput(io.RawIOBase):
+    """Adapt a WSGI input stream to ``io``.
+
+    Servers that mark their input as terminated (gunicorn) hand it over
+    as-is, and their ``Body`` objects only implement ``read`` -- not the
+    ``readable`` / ``readinto`` that ``TextIOWrapper`` needs.
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._stream.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+# ------------------------------------------------------------------
+# POST /api/insights/ingest
+# ------------------------------------------------------------------
+@insight_bp.route("/ingest", methods=["POST"])
+@query_budget(repeats_ok=True)
+def ingest_insights():
+    """Stream insight snapshots from the request body into the database.
+
+    The body is read incrementally, so its size is not limited by memory.
+    """
+    fmt = _INGEST_MIMETYPES.get(request.mimetype)
+    if fmt is None:
+        raise APIError(
+            "Content-Type must be application/x-ndjson or text/csv",
+            code="unsupported_media_type",
+            status_code=415,
+        )
+
+    raw = io.BufferedReader(_WSGIInput(request.stream))
+    stream = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+    summary = InsightIngestService.ingest(
+        stream, fmt, chunk_size=current_app.config["INGEST_CHUNK_SIZE"]
+    )
+    return jsonify(summary)
+
+
+# ------------------------------------------------------------------
+# GET|POST /api/insights/latest
+# ------------------------------------------------------------------
+@insight_bp.route("/latest", methods=["GET", "POST"])
+@query_budget(1)
+def get_latest_insights():
+    """Return the latest snapshot for up to LATEST_INSIGHTS_MAX_IDS campaigns.
+
+    IDs come from a ``campaignIds`` JSON array (POST) or a comma-separated
+    ``ids`` query parameter (GET).  Unknown IDs are listed in ``notFound``.
+    """
+    if request.method == "POST":
+        body = request.get_json(silent=True)
+        if body is None:
+            abort(400, description="Request body must be valid JSON")
+    else:
+        ids = request.args.get("ids", "")
+        body = {"campaignIds": [i for i in ids.split(",") if i]}
+
+    campaign_ids = _latest_schema.load(body)["campaign_ids"]
+
+    max_ids = current_app.config["LATEST_INSIGHTS_MAX_IDS"]
+    if len(campaign_ids) > max_ids:
+        raise APIError(
+            "Validation failed",
+            code="validation_error",
+            details=[
+                {
+                    "field": "campaignIds",
+                    "message": f"At most {max_ids} IDs are allowed.",
+                }
+            ],
+        )
+
+    insights = InsightService.get_latest_insights(campaign_ids)
+    not_found = sorted({str(i) for i in campaign_ids} - insights.keys())
+    return jsonify({"insights": insights, "notFound": not_found})
+
+
+# ------------------------------------------------------------------
+# GET /api/insights/export
+# ------------------------------------------------------------------
+@insight_bp.route("/export", methods=["GET"])
+@query_budget(repeats_ok=True)
+def export_insights():
+    """Stream insight snapshots.
+
+    ``ndjson`` / ``csv`` use the ingest format and accept the campaign
+    list filters; ``arrow`` / ``parquet`` are columnar (see
+    ``ExportService.export_insights_columnar``).  All formats accept
+    ``campaignId`` and a ``from`` / ``to`` range on ``capturedAt``, and
+    read one consistent snapshot.
+    """
+    params = _export_query_schema.load(request.args)
+    fmt = params["fmt"]
+    if fmt in COLUMNAR_FORMATS and not COLUMNAR_AVAILABLE:
+        raise APIError(
+            "Arrow / Parquet exports are not available on this server",
+            code="not_implemented",
+            status_code=501,
+        )
+    try:
+        chunks = ExportService.export_insights(**params)
+    except UnexportableValue as exc:
+        raise APIError(
+            f"A stored snapshot cannot be exported as {fmt}: {exc}",
+            code="unexportable_value",
+            status_code=500,
+        )
+
+    filename = f"insights.{EXPORT_EXTENSIONS[fmt]}"
+    return current_app.response_class(
+        chunks,
+        mimetype=EXPORT_MIMETYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
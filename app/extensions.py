@@ -9,6 +9,11 @@ from flask_cors import CORS
 from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 
+from app.cache import ResponseCache
+from app.metrics import Metrics
+
 db = SQLAlchemy()
 migrate = Migrate()
 cors = CORS()
+cache = ResponseCache()
+metrics = Metrics()
@@ -0,0 +1,67 @@
+"""Flask JSON provider backed by orjson, with a stdlib fallback.
+
+Output matches :class:`flask.json.provider.DefaultJSONProvider` -- sorted
+keys, compact separators (indented in debug), a trailing newline, and the
+same handling of dates, ``Decimal`` and other non-native types (these are
+passed to Flask's ``default`` hook).  Two documented differences:
+non-ASCII text is emitted as UTF-8 rather than ``\\uXXXX`` escapes, and NaN
+/ infinity become ``null``.  Values orjson rejects (e.g. integers beyond
+64 bits) fall back to the stdlib encoder.
+
+``orjson`` is optional; without it the provider behaves exactly like the
+default one.
+"""
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+# dumps() keyword sets that orjson reproduces byte for byte.
+_ORJSON_LAYOUTS = ({"separators": (",", ":")}, {"indent": 2})
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """``DefaultJSONProvider`` with orjson encoding and decoding."""
+
+    def dumps(self, obj, **kwargs):
+        # orjson only has the two layouts response() uses; any other
+        # formatting request goes to the stdlib encoder.
+        if orjson is None or kwargs not in _ORJSON_LAYOUTS:
+            return super().dumps(obj, **kwargs)
+        try:
+            return self._encode(obj, "indent" in kwargs).decode()
+        except TypeError:
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or (
+            self.compact is False
+        )
+        try:
+            body = self._encode(obj, indent) + b"\n"
+        except TypeError:
+            return super().response(obj)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+    def _encode(self, obj, indent):
+        # Datetimes are passed through so Flask's default renders them
+        # (HTTP dates), exactly as the stdlib provider does.
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
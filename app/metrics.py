@@ -0,0 +1,191 @@
+"""Prometheus metrics aggregated across gunicorn workers.
+
+Recorded per request (``before_request`` / ``after_request``):
+
+* ``http_requests_total{endpoint,method,status}``
+* ``http_request_duration_seconds{endpoint,method}`` (histogram)
+* ``http_errors_total{code,status}`` -- ``code`` is the error code of the
+  JSON error body (see ``app/middleware/error_handler.py``)
+
+and from SQLAlchemy events: ``sqlalchemy_pool_checked_out``,
+``sqlalchemy_pool_overflow``, ``sqlalchemy_pool_size`` (gauges, updated on
+pool ``connect`` / ``checkout`` / ``checkin`` / ``close``) and
+``sqlalchemy_pool_wait_seconds`` (histogram of the time a session takes to
+get its connection, from the start of its transaction to ``after_begin``).
+
+Storage is ``prometheus_client``'s multiprocess mode.  With
+``PROMETHEUS_MULTIPROC_DIR`` in the environment (before the app is
+imported: ``prometheus_client`` reads it at import time) every worker
+writes its samples to memory-mapped files named after its pid, and
+``GET /api/metrics`` merges all of them, so any worker answers for every
+worker.  A worker marks itself dead when it exits, which drops its live
+gauges; its counters are kept so totals stay monotonic.  Workers that are
+killed are marked dead by the gunicorn ``child_exit`` hook (see README).
+Without the variable each process reports only itself.
+"""
+
+import atexit
+import os
+import time
+
+from flask import g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+
+REQUEST_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+MULTIPROCESS_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests handled.",
+    ["endpoint", "method", "status"],
+)
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time from before_request to after_request.",
+    ["endpoint", "method"],
+    buckets=REQUEST_BUCKETS,
+)
+ERRORS = Counter(
+    "http_errors_total", "Error responses by error code.", ["code", "status"]
+)
+# Gauges of exited workers are dropped ("live"), the rest summed.
+POOL_GAUGES = {
+    "checkedout": Gauge(
+        "sqlalchemy_pool_checked_out",
+        "Connections currently checked out of the pool.",
+        multiprocess_mode="livesum",
+    ),
+    "overflow": Gauge(
+        "sqlalchemy_pool_overflow",
+        "Overflow connections currently open beyond pool_size.",
+        multiprocess_mode="livesum",
+    ),
+    "size": Gauge(
+        "sqlalchemy_pool_size",
+        "Configured pool size.",
+        multiprocess_mode="livesum",
+    ),
+}
+POOL_WAIT = Histogram(
+    "sqlalchemy_pool_wait_seconds",
+    "Time a session spent obtaining its connection from the pool.",
+    buckets=POOL_WAIT_BUCKETS,
+)
+
+
+def mark_process_dead(pid=None):
+    """Drop the live gauges of ``pid`` (default: this process)."""
+    if MULTIPROCESS_DIR:
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+# Resolved at exit, so forked workers mark their own pid.
+atexit.register(mark_process_dead)
+
+
+class Metrics:
+    """Request and pool metrics; see the module docstring."""
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Install the request, pool and session hooks."""
+        app.extensions["metrics"] = self
+
+        from app.extensions import db
+
+        with app.app_context():
+            self._instrument_pool(db.engine)
+        self._instrument_sessions(db.session)
+
+        @app.before_request
+        def start_request_metrics():
+            g.metrics_started = time.perf_counter()
+
+        @app.after_request
+        def record_request_metrics(response):
+            started = g.pop("metrics_started", None)
+            if started is not None:
+                self.observe_request(
+                    request.endpoint or "unmatched",
+                    request.method,
+                    response.status_code,
+                    time.perf_counter() - started,
+                    g.get("error_code"),
+                )
+            return response
+
+    # ---------------------------------------------------------- recording
+    @staticmethod
+    def observe_request(endpoint, method, status, seconds, code=None):
+        """Record one handled request."""
+        REQUESTS.labels(endpoint, method, str(status)).inc()
+        REQUEST_DURATION.labels(endpoint, method).observe(seconds)
+        if status >= 400:
+            ERRORS.labels(code or "error", str(status)).inc()
+
+    @staticmethod
+    def _instrument_pool(engine):
+        def update_gauges(returning):
+            pool = engine.pool
+            for method, gauge in POOL_GAUGES.items():
+                if hasattr(pool, method):
+                    value = getattr(pool, method)()
+                    if returning and method == "checkedout":
+                        value -= 1  # "checkin" fires before the return
+                    # QueuePool.overflow() counts up from -pool_size.
+                    gauge.set(max(value, 0))
+
+        for name in ("connect", "checkout", "close"):
+            event.listen(engine, name, lambda *_: update_gauges(False))
+        event.listen(engine, "checkin", lambda *_: update_gauges(True))
+
+    @staticmethod
+    def _instrument_sessions(session):
+        # The pool has no event before a checkout starts waiting, so the
+        # wait is timed from the session side: a root transaction is
+        # created just before the session asks for its connection.
+        if event.contains(session, "after_begin", _session_connected):
+            return
+        event.listen(
+            session, "after_transaction_create", _session_connecting
+        )
+        event.listen(session, "after_begin", _session_connected)
+
+    # ------------------------------------------------------------ reading
+    @staticmethod
+    def render():
+        """Prometheus text exposition of every worker's samples."""
+        if not MULTIPROCESS_DIR:
+            return generate_latest(REGISTRY)
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+
+
+def _session_connecting(session, transaction):
+    if transaction.parent is None:
+        session.info["metrics_connecting"] = time.perf_counter()
+
+
+def _session_connected(session, transaction, connection):
+    started = session.info.pop("metrics_connecting", None)
+    if started is not None:
+        POOL_WAIT.observe(time.perf_counter() - started)
@@ -6,7 +6,7 @@ ErrorResponse / ValidationError schemas.
 
 import logging
 
-from flask import jsonify
+from flask import g, jsonify
 from marshmallow import ValidationError as MarshmallowValidationError
 from sqlalchemy.exc import IntegrityError
 from werkzeug.exceptions import HTTPException
@@ -25,44 +25,53 @@ class APIError(Exception):
         self.details = details or []
 
 
+def format_validation_errors(messages):
+    """Flatten marshmallow error messages into ValidationIssue dicts."""
+    details = []
+    for field, field_messages in messages.items():
+        if isinstance(field_messages, list):
+            for msg in field_messages:
+                details.append({"field": field, "message": msg})
+        elif isinstance(field_messages, dict):
+            for sub_field, sub_msgs in field_messages.items():
+                for msg in sub_msgs:
+                    details.append(
+                        {"field": f"{field}.{sub_field}", "message": msg}
+                    )
+        else:
+            details.append({"field": field, "message": str(field_messages)})
+    return details
+
+
+def error_response(code, message, status_code, details=None):
+    """JSON error response; ``code`` is also kept on ``g`` for metrics."""
+    g.error_code = code
+    body = {"code": code, "message": message}
+    if details is not None:
+        body["details"] = details
+    return jsonify(body), status_code
+
+
 def register_error_handlers(app):
     """Register all error handlers on the Flask app."""
 
     @app.errorhandler(MarshmallowValidationError)
     def handle_marshmallow_validation(error):
         """Convert marshmallow validation errors to the API format."""
-        details = []
-        for field, messages in error.messages.items():
-            if isinstance(messages, list):
-                for msg in messages:
-                    details.append({"field": field, "message": msg})
-            elif isinstance(messages, dict):
-                for sub_field, sub_msgs in messages.items():
-                    for msg in sub_msgs:
-                        details.append(
-                            {"field": f"{field}.{sub_field}", "message": msg}
-                        )
-            else:
-                details.append({"field": field, "message": str(messages)})
-
-        return (
-            jsonify(
-                {
-                    "code": "validation_error",
-                    "message": "Validation failed",
-                    "details": details,
-                }
-            ),
-            400,
+        details = format_validation_errors(error.messages)
+        return error_response(
+            "validation_error", "Validation failed", 400, details
         )
 
     @app.errorhandler(APIError)
     def handle_api_error(error):
         """Handle custom application errors."""
-        body = {"code": error.code, "message": error.message}
-        if error.details:
-            body["details"] = error.details
-        return jsonify(body), error.status_code
+        return error_response(
+            error.code,
+            error.message,
+            error.status_code,
+            error.details or None,
+        )
 
     @app.errorhandler(IntegrityError)
     def handle_integrity_error(error):
@@ -71,85 +80,48 @@ def register_error_handlers(app):
 
         db.session.rollback()
         logger.warning("Integrity error: %s", error.orig)
-        return (
-            jsonify(
-                {
-                    "code": "validation_error",
-                    "message": "Database constraint violation",
-                    "details": [
-                        {"field": "_schema", "message": str(error.orig)}
-                    ],
-                }
-            ),
+        return error_response(
+            "validation_error",
+            "Database constraint violation",
             400,
+            [{"field": "_schema", "message": str(error.orig)}],
         )
 
     @app.errorhandler(400)
     def handle_bad_request(error):
-        return (
-            jsonify(
-                {
-                    "code": "bad_request",
-                    "message": getattr(error, "description", "Bad request"),
-                }
-            ),
+        return error_response(
+            "bad_request",
+            getattr(error, "description", "Bad request"),
             400,
         )
 
     @app.errorhandler(404)
     def handle_not_found(error):
-        return (
-            jsonify(
-                {
-                    "code": "not_found",
-                    "message": getattr(
-                        error, "description", "Resource not found"
-                    ),
-                }
-            ),
+        return error_response(
+            "not_found",
+            getattr(error, "description", "Resource not found"),
             404,
         )
 
     @app.errorhandler(405)
     def handle_method_not_allowed(error):
-        return (
-            jsonify(
-                {
-                    "code": "method_not_allowed",
-                    "message": "Method not allowed",
-                }
-            ),
-            405,
+        return error_response(
+            "method_not_allowed", "Method not allowed", 405
         )
 
     @app.errorhandler(500)
     def handle_internal_error(error):
         logger.exception("Internal server error")
-        return (
-            jsonify(
-                {
-                    "code": "server_error",
-                    "message": "An internal server error occurred",
-                }
-            ),
-            500,
+        return error_response(
+            "server_error", "An internal server error occurred", 500
         )
 
     @app.errorhandler(Exception)
     def handle_unexpected_error(error):
         """Catch-all for unhandled exceptions."""
         if isinstance(error, HTTPException):
-            return (
-                jsonify({"code": "error", "message": error.description}),
-                error.code,
-            )
+            return error_response("error", error.description, error.code)
         logger.exception("Unexpected error: %s", error)
-        return (
-            jsonify(
-                {
-                    "code": "server_error",
-                    "message": "An unexpected error occurred",
-                }
-            ),
-            500,
+        return error_response(
+            "server_error", "An unexpected error occurred", 500
         )
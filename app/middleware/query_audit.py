@@ -0,0 +1,178 @@
+"""Query budgets and N+1 detection (development and tests).
+
+With ``QUERY_AUDIT`` set to ``warn`` or ``raise`` every SQL statement a
+request executes is recorded (SQLAlchemy ``before_cursor_execute``).  After
+the view returns, the request is checked for:
+
+* a **budget overrun** -- more statements than the view declared with
+  :func:`query_budget`;
+* a likely **N+1** -- one statement executed ``QUERY_REPEAT_THRESHOLD`` or
+  more times.  SQLAlchemy sends bound parameters separately, so the
+  statement text of a loop of per-row lookups is identical.  Views that
+  repeat statements by design (chunked ingest, batched exports) opt out
+  with ``query_budget(repeats_ok=True)``.
+
+``warn`` logs the findings; ``raise`` raises :class:`QueryBudgetExceeded`
+(an ``AssertionError``, so the test client surfaces it in tests) -- unless
+the request has already committed, in which case raising would report a
+failure for data that was written, so the findings are logged as errors
+instead.  With ``off`` (production) nothing is installed.
+
+Tests can also record any block directly with :func:`record_queries`;
+see the ``query_budget`` fixture in ``tests/conftest.py``.
+"""
+
+import contextlib
+import logging
+from collections import Counter
+from contextvars import ContextVar
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+AUDIT_MODES = ("off", "warn", "raise")
+
+# Every active recorder (a request's and any enclosing test's).
+_recorders = ContextVar("query_recorders", default=())
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A request ran more statements than its budget, or an N+1 loop."""
+
+
+class QueryRecorder:
+    """Statements executed while the recorder is active."""
+
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def repeated(self, threshold):
+        """``[(statement, times)]`` run at least ``threshold`` times."""
+        counts = Counter(_normalise(s) for s in self.statements)
+        return [(s, n) for s, n in counts.most_common() if n >= threshold]
+
+    def report(self):
+        """Numbered statement listing for failure messages."""
+        return "\n".join(
+            f"  {i}. {_normalise(s)}" for i, s in enumerate(self.statements, 1)
+        )
+
+
+def _normalise(statement):
+    return " ".join(statement.split())
+
+
+@contextlib.contextmanager
+def record_queries():
+    """Record the statements run inside the block (nestable)."""
+    recorder = QueryRecorder()
+    token = _recorders.set(_recorders.get() + (recorder,))
+    try:
+        yield recorder
+    finally:
+        _recorders.reset(token)
+
+
+def query_budget(max_queries=None, repeats_ok=False):
+    """Declare the most statements a view may run per request.
+
+    ``repeats_ok`` disables the N+1 check for the view, whose repeated
+    statements are deliberate (one per chunk or batch).
+    """
+
+    def decorator(view):
+        view.query_budget = max_queries
+        view.query_repeats_ok = repeats_ok
+        return view
+
+    return decorator
+
+
+def _record_statement(conn, cursor, statement, params, context, many):
+    for recorder in _recorders.get():
+        recorder.statements.append(statement)
+
+
+def instrument_engine(engine):
+    """Feed ``engine``'s statements to active recorders (idempotent)."""
+    if not event.contains(engine, "before_cursor_execute", _record_statement):
+        event.listen(engine, "before_cursor_execute", _record_statement)
+
+
+def _mark_committed(session):
+    if has_request_context() and "query_recorder" in g:
+        g.query_audit_committed = True
+
+
+def _findings(recorder, view, threshold):
+    findings = []
+    budget = getattr(view, "query_budget", None)
+    if budget is not None and recorder.count > budget:
+        findings.append(f"ran {recorder.count} queries (budget {budget})")
+    if not getattr(view, "query_repeats_ok", False):
+        for statement, times in recorder.repeated(threshold):
+            findings.append(f"possible N+1: {times} x {statement[:200]}")
+    return findings
+
+
+def register_query_audit(app):
+    """Install per-request recording if ``QUERY_AUDIT`` is not ``off``."""
+    mode = app.config["QUERY_AUDIT"]
+    if mode not in AUDIT_MODES:
+        raise ValueError(f"Unknown QUERY_AUDIT: {mode!r}")
+    if mode == "off":
+        return
+    with app.app_context():
+        instrument_engine(db.engine)
+    if not event.contains(Session, "after_commit", _mark_committed):
+        event.listen(Session, "after_commit", _mark_committed)
+
+    @app.before_request
+    def start_query_audit():
+        recorder = QueryRecorder()
+        g.query_recorder = recorder
+        g.query_recorder_token = _recorders.set(
+            _recorders.get() + (recorder,)
+        )
+
+    @app.after_request
+    def check_query_audit(response):
+        recorder = g.get("query_recorder")
+        if recorder is None:
+            return response
+        view = current_app.view_functions.get(request.endpoint)
+        findings = _findings(
+            recorder, view, current_app.config["QUERY_REPEAT_THRESHOLD"]
+        )
+        if findings:
+            message = (
+                f"{request.method} {request.path} ({request.endpoint}): "
+                + "; ".join(findings)
+                + "\n"
+                + recorder.report()
+            )
+            if current_app.config["QUERY_AUDIT"] != "raise":
+                logger.warning("%s", message)
+            elif g.get("query_audit_committed"):
+                logger.error(
+                    "%s\n(not raised: the request committed)", message
+                )
+            else:
+                raise QueryBudgetExceeded(message)
+        return response
+
+    @app.teardown_request
+    def stop_query_audit(exc):
+        token = g.pop("query_recorder_token", None)
+        if token is not None:
+            _recorders.reset(token)
+
@@ -0,0 +1,135 @@
+"""Per-request timing: SQL, serialisation and total time.
+
+For a sampled request (``REQUEST_TIMING_SAMPLE_RATE``, 0-1) the app
+records:
+
+* ``db``        -- number of SQL statements and time spent executing them
+  (SQLAlchemy ``before/after_cursor_execute`` on the app's engine);
+* ``serialize`` -- time in ``phase("serialize")`` blocks (the response
+  dumpers) plus JSON encoding in ``app.json.response``;
+* ``app``       -- the remainder of ``total`` (routing, validation, ...);
+* ``total``     -- ``before_request`` to ``after_request``.
+
+They are sent as a ``Server-Timing`` header (visible in browser dev
+tools) and logged as one logfmt line on the ``app.request_timing``
+logger.  Unsampled requests cost a random draw; the engine hooks a
+context-variable lookup per statement.  Work done after the view returns
+(streamed exports) is not included.
+"""
+
+import contextlib
+import logging
+import random
+import time
+from contextvars import ContextVar
+
+from flask import current_app, g, request
+from sqlalchemy import event
+
+from app.extensions import db
+
+logger = logging.getLogger("app.request_timing")
+
+_current = ContextVar("request_timing", default=None)
+
+
+class RequestTiming:
+    """Accumulated timings (seconds) for one sampled request."""
+
+    __slots__ = ("started", "queries", "db", "serialize")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db = 0.0
+        self.serialize = 0.0
+
+
+def current_timing():
+    """The active :class:`RequestTiming`, or None if not sampled."""
+    return _current.get()
+
+
+@contextlib.contextmanager
+def phase(name):
+    """Add the block's duration to phase ``name`` of a sampled request."""
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        setattr(timing, name, getattr(timing, name) + elapsed)
+
+
+def _before_cursor_execute(conn, cursor, statement, params, context, many):
+    if _current.get() is not None:
+        conn.info.setdefault("timing_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, params, context, many):
+    timing = _current.get()
+    if timing is None:
+        return
+    stack = conn.info.get("timing_started")
+    if stack:
+        timing.db += time.perf_counter() - stack.pop()
+        timing.queries += 1
+
+
+def register_request_timing(app):
+    """Install the request hooks, engine listeners and encoder wrapper."""
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    encode = app.json.response
+
+    def timed_response(*args, **kwargs):
+        with phase("serialize"):
+            return encode(*args, **kwargs)
+
+    app.json.response = timed_response
+
+    @app.before_request
+    def start_timing():
+        rate = current_app.config["REQUEST_TIMING_SAMPLE_RATE"]
+        if rate > 0 and (rate >= 1 or random.random() < rate):
+            g.request_timing_token = _current.set(RequestTiming())
+
+    @app.after_request
+    def report_timing(response):
+        timing = _current.get()
+        if timing is None:
+            return response
+        total = time.perf_counter() - timing.started
+        rest = max(total - timing.db - timing.serialize, 0.0)
+        response.headers["Server-Timing"] = (
+            f'db;dur={timing.db * 1000:.2f};desc="{timing.queries} queries", '
+            f"serialize;dur={timing.serialize * 1000:.2f}, "
+            f"app;dur={rest * 1000:.2f}, "
+            f"total;dur={total * 1000:.2f}"
+        )
+        logger.info(
+            "method=%s path=%s endpoint=%s status=%d queries=%d "
+            "db_ms=%.2f serialize_ms=%.2f total_ms=%.2f",
+            request.method,
+            request.path,
+            request.endpoint,
+            response.status_code,
+            timing.queries,
+            timing.db * 1000,
+            timing.serialize * 1000,
+            total * 1000,
+        )
+        return response
+
+    @app.teardown_request
+    def reset_timing(exc):
+        token = g.pop("request_timing_token", None)
+        if token is not None:
+            _current.reset(token)
@@ -2,3 +2,4 @@
 
 from app.models.campaign import Campaign  # noqa: F401
 from app.models.campaign_insight import CampaignInsight  # noqa: F401
+from app.models.campaign_summary import CampaignSummary  # noqa: F401
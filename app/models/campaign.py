@@ -4,11 +4,13 @@ Maps to the ``campaigns`` table defined in db-schema.sql.
 Uses String columns for status/platform for portability – enum validation
 is enforced at the API layer via marshmallow schemas.
 The DB-level trigger handles ``updated_at`` automatically on UPDATE.
+``search_vector`` is a generated column maintained by PostgreSQL; it is
+deferred so ordinary reads never fetch it.
 """
 
 import uuid
 
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 
 from app.extensions import db
 
@@ -37,12 +39,25 @@ class Campaign(db.Model):
         nullable=False,
         server_default=db.func.now(),
     )
+    search_vector = db.deferred(
+        db.Column(
+            TSVECTOR,
+            db.Computed(
+                "setweight(to_tsvector('english', name), 'A') || "
+                "setweight(to_tsvector('english', description), 'B') || "
+                "setweight(to_tsvector('english', target_audience), 'C')",
+                persisted=True,
+            ),
+        )
+    )
 
     # Relationship ----------------------------------------------------------
     insights = db.relationship(
         "CampaignInsight",
         back_populates="campaign",
         cascade="all, delete-orphan",
+        # ON DELETE CASCADE removes the rows; don't load them to delete
+        passive_deletes=True,
         lazy="dynamic",
     )
 
@@ -0,0 +1,26 @@
+"""CampaignSummary ORM model.
+
+Maps to the ``campaign_summary`` table defined in db-schema.sql.
+Holds one row per (status, platform) with the campaign count and budget
+sum.  Rows are maintained by statement-level triggers on ``campaigns``;
+the application only reads them (and rebuilds them on demand).
+"""
+
+from app.extensions import db
+
+
+class CampaignSummary(db.Model):
+    """Per-(status, platform) rollup of the campaigns table."""
+
+    __tablename__ = "campaign_summary"
+
+    status = db.Column(db.String(20), primary_key=True)
+    platform = db.Column(db.String(20), primary_key=True)
+    campaign_count = db.Column(db.BigInteger, nullable=False, default=0)
+    total_budget = db.Column(db.Numeric, nullable=False, default=0)
+
+    def __repr__(self):
+        return (
+            f"<CampaignSummary {self.status}/{self.platform} "
+            f"count={self.campaign_count}>"
+        )
@@ -1,9 +1,26 @@
 """Marshmallow schemas for request/response serialisation and validation."""
 
 from app.schemas.campaign import (  # noqa: F401
+    CampaignBatchQuerySchema,
     CampaignCreateSchema,
+    CampaignExportQuerySchema,
+    CampaignGetQuerySchema,
     CampaignInsightSchema,
     CampaignListQuerySchema,
     CampaignSchema,
+    CampaignSuggestQuerySchema,
     CampaignUpdateSchema,
+    InsightExportQuerySchema,
+    InsightSeriesQuerySchema,
+    LatestInsightsRequestSchema,
+    encode_cursor,
+)
+from app.schemas.fast import (  # noqa: F401
+    campaign_dumper,
+    campaign_row_dumper,
+    compile_dumper,
+    dump_campaign,
+    dump_campaign_rows,
+    dump_campaigns,
+    dump_insights,
 )
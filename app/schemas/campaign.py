@@ -6,13 +6,36 @@ Handles:
 * Serialisation of ORM model instances to JSON-friendly dicts
 """
 
-from marshmallow import RAISE, Schema, ValidationError, fields, validate, validates_schema
+import base64
+import binascii
+import json
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+
+from marshmallow import (
+    RAISE,
+    Schema,
+    ValidationError,
+    fields,
+    post_load,
+    validate,
+    validates_schema,
+)
 
 # ---------------------------------------------------------------------------
 # Allowed enum values (must stay in sync with db-schema.sql enums)
 # ---------------------------------------------------------------------------
 CAMPAIGN_STATUSES = ("active", "paused", "completed", "draft")
 PLATFORMS = ("facebook", "google", "instagram", "linkedin", "twitter")
+COUNT_MODES = ("exact", "estimate", "none")
+LIST_SORTS = ("updatedAt", "relevance")
+SEARCH_MODES = ("substring", "fulltext")
+# Hard cap on typeahead suggestions per request
+SUGGEST_MAX_LIMIT = 20
+SERIES_BUCKETS = ("hour", "day", "week")
+LIST_INCLUDES = ("latestInsight",)
+EXPORT_FORMATS = ("ndjson", "csv")
+COLUMNAR_FORMATS = ("arrow", "parquet")
 
 
 # ---------------------------------------------------------------------------
@@ -111,11 +134,91 @@ class CampaignUpdateSchema(Schema):
                 )
 
 
+# ---------------------------------------------------------------------------
+# Keyset pagination cursor
+# ---------------------------------------------------------------------------
+def encode_cursor(updated_at, campaign_id):
+    """Encode an ``(updated_at, id)`` sort key as an opaque cursor string."""
+    raw = json.dumps([updated_at.isoformat(), str(campaign_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by :func:`encode_cursor`.
+
+    Returns:
+        tuple: (datetime, uuid.UUID)
+
+    Raises:
+        ValueError: if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not (
+            isinstance(key, list)
+            and len(key) == 2
+            and all(isinstance(part, str) for part in key)
+        ):
+            raise ValueError("Invalid cursor")
+        updated_at, campaign_id = key
+        return datetime.fromisoformat(updated_at), uuid.UUID(campaign_id)
+    except (binascii.Error, TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+class SparseFieldsField(fields.String):
+    """Comma-separated response keys of ``schema_cls`` (``?fields=``).
+
+    Deserialises to a tuple of attribute names in the schema's declaration
+    order, so equivalent requests yield the same value (and cache key).
+    """
+
+    def __init__(self, schema_cls, **kwargs):
+        super().__init__(**kwargs)
+        self.attributes = {
+            field.data_key or name: name
+            for name, field in schema_cls._declared_fields.items()
+        }
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        value = super()._deserialize(value, attr, data, **kwargs)
+        requested = {key.strip() for key in value.split(",")} - {""}
+        if not requested:
+            raise ValidationError("At least one field must be given.")
+        unknown = sorted(requested - self.attributes.keys())
+        if unknown:
+            raise ValidationError(f"Unknown field(s): {', '.join(unknown)}.")
+        return tuple(
+            name for key, name in self.attributes.items() if key in requested
+        )
+
+
+class CursorField(fields.String):
+    """Opaque keyset cursor, deserialised to an ``(updated_at, id)`` tuple."""
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        value = super()._deserialize(value, attr, data, **kwargs)
+        try:
+            return decode_cursor(value)
+        except ValueError:
+            raise ValidationError("Invalid cursor.")
+
+
 # ---------------------------------------------------------------------------
 # Query-parameter schema for listing
 # ---------------------------------------------------------------------------
 class CampaignListQuerySchema(Schema):
-    """Validate GET /campaigns query parameters."""
+    """Validate GET /campaigns query parameters.
+
+    ``cursor`` selects keyset pagination and cannot be combined with a
+    non-zero ``offset``.  ``count`` chooses how ``X-Total-Count`` is
+    produced (see ``CampaignService.list_campaigns``).  ``include``
+    embeds related data in each item.  ``sort=relevance`` ranks search
+    results and therefore needs ``search`` and offset paging.
+    ``searchMode`` picks substring (trigram) or full-text matching.
+    ``fields`` restricts each item to the listed response keys.
+    """
 
     search = fields.String(load_default=None)
     status = fields.String(
@@ -130,6 +233,101 @@ class CampaignListQuerySchema(Schema):
     offset = fields.Integer(
         load_default=0, validate=validate.Range(min=0)
     )
+    cursor = CursorField(load_default=None)
+    count = fields.String(
+        load_default="exact", validate=validate.OneOf(COUNT_MODES)
+    )
+    include = fields.String(
+        load_default=None, validate=validate.OneOf(LIST_INCLUDES)
+    )
+    sort = fields.String(
+        load_default="updatedAt", validate=validate.OneOf(LIST_SORTS)
+    )
+    search_mode = fields.String(
+        data_key="searchMode",
+        load_default="substring",
+        validate=validate.OneOf(SEARCH_MODES),
+    )
+    field_names = SparseFieldsField(
+        CampaignSchema, data_key="fields", load_default=None
+    )
+
+    @validates_schema
+    def validate_cursor_offset(self, data, **kwargs):
+        if data.get("cursor") is not None and data.get("offset"):
+            raise ValidationError(
+                "cursor and offset cannot be combined.", field_name="cursor"
+            )
+
+    @validates_schema
+    def validate_relevance_sort(self, data, **kwargs):
+        if data.get("sort") != "relevance":
+            return
+        if not data.get("search"):
+            raise ValidationError(
+                "sort=relevance requires search.", field_name="sort"
+            )
+        if data.get("cursor") is not None:
+            raise ValidationError(
+                "cursor is not supported with sort=relevance.",
+                field_name="cursor",
+            )
+
+
+class CampaignGetQuerySchema(Schema):
+    """Validate GET /campaigns/{id} query parameters."""
+
+    field_names = SparseFieldsField(
+        CampaignSchema, data_key="fields", load_default=None
+    )
+
+
+class CampaignSuggestQuerySchema(Schema):
+    """Validate GET /campaigns/suggest query parameters.
+
+    ``q`` is trimmed, lower-cased and whitespace-collapsed so equivalent
+    keystrokes share one cache entry.
+    """
+
+    q = fields.String(required=True, validate=validate.Length(max=100))
+    limit = fields.Integer(
+        load_default=8, validate=validate.Range(min=1, max=SUGGEST_MAX_LIMIT)
+    )
+
+    @post_load
+    def normalise_query(self, data, **kwargs):
+        data["q"] = " ".join(data["q"].lower().split())
+        if not data["q"]:
+            raise ValidationError("Must not be blank.", field_name="q")
+        return data
+
+
+class CampaignBatchQuerySchema(Schema):
+    """Validate POST /campaigns/batch query parameters."""
+
+    atomic = fields.Boolean(load_default=False)
+
+
+class CampaignExportQuerySchema(Schema):
+    """Validate GET /campaigns/export query parameters (the list filters)."""
+
+    fmt = fields.String(
+        data_key="format",
+        load_default="ndjson",
+        validate=validate.OneOf(EXPORT_FORMATS),
+    )
+    search = fields.String(load_default=None)
+    status = fields.String(
+        load_default=None, validate=validate.OneOf(CAMPAIGN_STATUSES)
+    )
+    platform = fields.String(
+        load_default=None, validate=validate.OneOf(PLATFORMS)
+    )
+    search_mode = fields.String(
+        data_key="searchMode",
+        load_default="substring",
+        validate=validate.OneOf(SEARCH_MODES),
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -153,3 +351,113 @@ class CampaignInsightSchema(Schema):
     cpc = fields.Float()
     roi = fields.Float()
     engagement = fields.Nested(EngagementSchema)
+
+
+class LatestInsightsRequestSchema(Schema):
+    """Validate POST /insights/latest bodies (and GET ``?ids=``)."""
+
+    campaign_ids = fields.List(
+        fields.UUID(),
+        required=True,
+        data_key="campaignIds",
+        validate=validate.Length(min=1),
+    )
+
+    class Meta:
+        unknown = RAISE
+
+
+class DayOrDateTimeField(fields.AwareDateTime):
+    """``AwareDateTime`` (naive = UTC) that also accepts a plain date.
+
+    A date is midnight UTC at the start of that day or, with
+    ``through_day`` (for exclusive ``to`` bounds), at the end of it.
+    """
+
+    def __init__(self, through_day=False, **kwargs):
+        super().__init__(default_timezone=timezone.utc, **kwargs)
+        self.through_day = through_day
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        try:
+            day = date.fromisoformat(value)
+        except (TypeError, ValueError):
+            return super()._deserialize(value, attr, data, **kwargs)
+        start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+        return start + timedelta(days=1) if self.through_day else start
+
+
+class InsightSeriesQuerySchema(Schema):
+    """Validate GET /campaigns/{id}/insights/series query parameters.
+
+    ``from`` defaults to 30 days before ``to``; ``to`` defaults to the
+    next whole minute (so repeated polls share a cache key).  Naive
+    datetimes are interpreted as UTC; dates cover whole UTC days
+    (``from=2025-06-01&to=2025-06-30`` includes June 30).
+    """
+
+    start = DayOrDateTimeField(data_key="from", load_default=None)
+    end = DayOrDateTimeField(
+        data_key="to", through_day=True, load_default=None
+    )
+    bucket = fields.String(
+        load_default="day", validate=validate.OneOf(SERIES_BUCKETS)
+    )
+
+    @post_load
+    def apply_defaults(self, data, **kwargs):
+        if data["end"] is None:
+            now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+            data["end"] = now + timedelta(minutes=1)
+        if data["start"] is None:
+            data["start"] = data["end"] - timedelta(days=30)
+        if data["start"] >= data["end"]:
+            raise ValidationError("'to' must be after 'from'.", field_name="to")
+        return data
+
+
+class InsightExportQuerySchema(CampaignExportQuerySchema):
+    """Validate GET /insights/export query parameters.
+
+    The campaign filters select whose snapshots are exported; ``from`` /
+    ``to`` bound ``capturedAt`` (naive datetimes are UTC).  The columnar
+    formats (``arrow`` / ``parquet``) support the status and platform
+    filters only, and accept ``include=campaign`` to add those two
+    columns.
+    """
+
+    fmt = fields.String(
+        data_key="format",
+        load_default="ndjson",
+        validate=validate.OneOf(EXPORT_FORMATS + COLUMNAR_FORMATS),
+    )
+    include = fields.String(
+        load_default=None, validate=validate.OneOf(("campaign",))
+    )
+    campaign_id = fields.UUID(data_key="campaignId", load_default=None)
+    start = fields.AwareDateTime(
+        data_key="from", default_timezone=timezone.utc, load_default=None
+    )
+    end = fields.AwareDateTime(
+        data_key="to", default_timezone=timezone.utc, load_default=None
+    )
+
+    @validates_schema
+    def validate_range(self, data, **kwargs):
+        start, end = data.get("start"), data.get("end")
+        if start is not None and end is not None and start >= end:
+            raise ValidationError("'to' must be after 'from'.", field_name="to")
+
+    @validates_schema
+    def validate_columnar_options(self, data, **kwargs):
+        columnar = data.get("fmt") in COLUMNAR_FORMATS
+        if columnar and data.get("search"):
+            raise ValidationError(
+                "search is not supported with columnar formats.",
+                field_name="search",
+            )
+        if not columnar and data.get("include"):
+            raise ValidationError(
+                "include requires format=arrow or format=parquet.",
+                field_name="include",
+            )
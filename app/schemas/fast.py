@@ -0,0 +1,157 @@
+"""Precompiled dump functions generated from the marshmallow schemas.
+
+``Schema.dump`` walks every field per object: attribute lookup through
+``get_value``, field dispatch, and the generic ``_serialize`` machinery.
+For list endpoints that is most of the response CPU.  :func:`compile_dumper`
+reads a schema's ``dump_fields`` once and generates a plain Python function
+that builds the same dict with direct attribute access and one conversion
+per field, so the schemas (including every camelCase ``data_key``) remain
+the single source of truth.
+
+Only field types whose dump behaviour is reproduced exactly are supported;
+anything else raises ``TypeError`` at compile time rather than silently
+diverging from ``Schema.dump``.  Objects must expose every dumped field
+(marshmallow would omit missing attributes instead).
+
+Three access modes are generated: ``"orm"`` (mapped instances, read
+through the instance ``__dict__``), ``"row"`` (the ``Row`` tuples returned
+by the Core read path, read by position -- ``Row`` attribute lookup costs
+more than the rest of the dump) and ``"item"`` (dict payloads).
+"""
+
+import functools
+
+from marshmallow import fields
+
+from app.schemas.campaign import CampaignInsightSchema, CampaignSchema
+
+# Exact field type -> expression template applied to a non-None value.
+_CONVERSIONS = {
+    fields.String: "str({v})",
+    fields.UUID: "str({v})",
+    fields.Integer: "int({v})",
+    fields.Float: "float({v})",
+    fields.Date: "{v}.isoformat()",
+    fields.DateTime: "{v}.isoformat()",
+}
+
+
+_ACCESS_MODES = ("orm", "row", "item")
+
+
+def compile_dumper(schema, access="orm", columns=None):
+    """Generate a function equivalent to ``schema.dump`` for one object.
+
+    Args:
+        schema: Schema instance (its ``only`` / ``exclude`` are honoured).
+        access: how values are read -- ``"orm"`` (mapped instances),
+            ``"row"`` (``obj[position]``) or ``"item"`` (``obj[attr]``,
+            dict payloads).
+        columns: for ``"row"``, the row's column names (``Row._fields``).
+
+    Returns:
+        callable: ``dump(obj) -> dict``.
+
+    Raises:
+        TypeError: if a field has no exact fast equivalent (or, for
+            ``"row"``, no column).
+    """
+    if access not in _ACCESS_MODES:
+        raise ValueError(f"Unknown access mode: {access!r}")
+    if access == "row":
+        positions = {name: index for index, name in enumerate(columns)}
+    namespace = {}
+    lines = ["def dump(obj):"]
+    if access == "orm":
+        lines.append("    _d = obj.__dict__")
+    items = []
+
+    for index, (name, field) in enumerate(schema.dump_fields.items()):
+        attribute = field.attribute or name
+        key = field.data_key or name
+        if not attribute.isidentifier():
+            raise TypeError(f"{name}: dotted attributes are not supported")
+        value = f"_v{index}"
+        if access == "item":
+            source = f"obj[{attribute!r}]"
+        elif access == "row":
+            if attribute not in positions:
+                raise TypeError(f"{name}: no {attribute!r} column in rows")
+            source = f"obj[{positions[attribute]}]"
+        else:
+            # Loaded ORM attributes live in the instance __dict__; reading
+            # them there skips the descriptor.  Expired or deferred ones
+            # fall back to normal attribute access (and lazy loading).
+            source = (
+                f"_d[{attribute!r}] if {attribute!r} in _d "
+                f"else obj.{attribute}"
+            )
+        lines.append(f"    {value} = {source}")
+
+        if isinstance(field, fields.Nested) and access == "row":
+            raise TypeError(f"{name}: nested fields need object access")
+        if isinstance(field, fields.Nested) and not field.many:
+            nested = f"_nested{index}"
+            namespace[nested] = compile_dumper(field.schema, access)
+            converted = f"{nested}({value})"
+        else:
+            converted = _conversion(name, field).format(v=value)
+        items.append(
+            f"        {key!r}: None if {value} is None else {converted},"
+        )
+
+    lines.append("    return {")
+    lines.extend(items)
+    lines.append("    }")
+    exec("\n".join(lines), namespace)  # noqa: S102 - source built above
+    dump = namespace["dump"]
+    dump.__doc__ = f"Fast equivalent of {type(schema).__name__}().dump."
+    return dump
+
+
+def _conversion(name, field):
+    template = _CONVERSIONS.get(type(field))
+    if template is None:
+        raise TypeError(f"{name}: no fast dump for {type(field).__name__}")
+    if getattr(field, "as_string", False):
+        raise TypeError(f"{name}: as_string is not supported")
+    is_temporal = isinstance(field, (fields.Date, fields.DateTime))
+    if is_temporal and field.format not in (None, "iso"):
+        raise TypeError(f"{name}: only ISO date formats are supported")
+    return template
+
+
+dump_campaign = compile_dumper(CampaignSchema())
+dump_insights = compile_dumper(CampaignInsightSchema(), access="item")
+
+
+@functools.lru_cache(maxsize=128)
+def campaign_dumper(field_names=None):
+    """Dumper for ``CampaignSchema(only=field_names)``, compiled once per
+    distinct tuple of attribute names (None: every field)."""
+    if field_names is None:
+        return dump_campaign
+    return compile_dumper(CampaignSchema(only=field_names))
+
+
+def dump_campaigns(campaigns, field_names=None):
+    """Fast equivalent of ``CampaignSchema(many=True, only=...).dump``."""
+    dump = campaign_dumper(field_names)
+    return [dump(campaign) for campaign in campaigns]
+
+
+@functools.lru_cache(maxsize=128)
+def campaign_row_dumper(field_names, columns):
+    """Like :func:`campaign_dumper`, for Rows from the Core read path
+    whose column names (``Row._fields``) are ``columns``."""
+    return compile_dumper(
+        CampaignSchema(only=field_names), access="row", columns=columns
+    )
+
+
+def dump_campaign_rows(rows, field_names=None):
+    """Dump Rows returned by ``CampaignService`` reads."""
+    if not rows:
+        return []
+    dump = campaign_row_dumper(field_names, rows[0]._fields)
+    return [dump(row) for row in rows]
@@ -2,18 +2,54 @@
 
 Keeps the controller layer thin by encapsulating queries, transactions,
 and domain rules here.
+
+Reads use Core ``select()`` statements over plain columns and return
+SQLAlchemy ``Row`` tuples (attribute access by column name): no ORM
+instances, identity map or unit-of-work bookkeeping on the hot paths.
+Writes keep using the ORM.
 """
 
 import logging
+from collections import namedtuple
 
-from sqlalchemy import or_
+from flask import current_app
+from sqlalchemy import func, insert, or_, select, true, tuple_, union_all
 
-from app.extensions import db
+from app.extensions import cache, db
 from app.models.campaign import Campaign
 from app.schemas.campaign import CAMPAIGN_STATUSES, PLATFORMS
+from app.services.insight_service import (
+    insight_payload,
+    latest_insight_lateral,
+)
 
 logger = logging.getLogger(__name__)
 
+# Text columns covered by the lower(col) gin_trgm_ops indexes.
+SEARCH_COLUMNS = ("name", "description", "target_audience")
+# Text search configuration used by the search_vector generated column.
+SEARCH_CONFIG = "english"
+# Columns returned by the read path (everything except search_vector).
+READ_COLUMNS = (
+    "id",
+    "name",
+    "status",
+    "platform",
+    "budget",
+    "start_date",
+    "end_date",
+    "description",
+    "target_audience",
+    "created_at",
+    "updated_at",
+)
+
+CampaignPage = namedtuple(
+    "CampaignPage",
+    ["items", "total", "count_mode", "next_key", "insights"],
+    defaults=(None,),
+)
+
 
 class CampaignService:
     """Stateless service class for Campaign operations."""
@@ -23,27 +59,224 @@ class CampaignService:
     # ------------------------------------------------------------------
     @staticmethod
     def list_campaigns(
-        search=None, status=None, platform=None, limit=50, offset=0
+        search=None,
+        status=None,
+        platform=None,
+        limit=50,
+        offset=0,
+        cursor=None,
+        count="exact",
+        include=None,
+        sort="updatedAt",
+        search_mode="substring",
+        field_names=None,
     ):
         """Return a paginated, optionally filtered list of campaigns.
 
+        Rows are ordered by ``(updated_at DESC, id DESC)``.  When
+        ``cursor`` (a decoded ``(updated_at, id)`` tuple) is given the
+        page starts strictly after that key, so the
+        ``campaigns_updated_at_id_idx`` index is seeked directly instead
+        of skipping ``offset`` rows.
+
+        ``count`` selects how the total is produced:
+
+        * ``exact``    -- ``SELECT count(*)`` over the filtered set.
+        * ``estimate`` -- ``pg_class.reltuples`` when unfiltered, otherwise
+          the planner's row estimate; small estimates (below
+          ``COUNT_ESTIMATE_THRESHOLD``) are replaced by an exact count.
+        * ``none``     -- no count query at all.
+
+        ``search`` matches a case-insensitive substring of name,
+        description or target audience through the trigram indexes.
+        ``sort="relevance"`` additionally accepts fuzzy matches whose
+        ``word_similarity`` reaches ``SEARCH_SIMILARITY_THRESHOLD`` and
+        orders by the best similarity across the three columns (offset
+        paging only).
+
+        ``search_mode="fulltext"`` instead parses ``search`` with
+        ``websearch_to_tsquery`` and matches the GIN-indexed
+        ``search_vector``; ``sort="relevance"`` then orders by
+        ``ts_rank_cd``.
+
+        ``field_names`` (attribute names) restricts the columns selected
+        (``id`` and ``updated_at`` are always included).
+
+        ``include="latestInsight"`` joins each campaign on the page
+        ``LATERAL`` to its newest snapshot in the same statement.
+
         Returns:
-            tuple: (list[Campaign], int)  -- campaigns and total count.
+            CampaignPage: ``items`` (Rows), ``total`` (None for ``none``),
+            ``count_mode`` actually used, ``next_key`` -- the
+            ``(updated_at, id)`` of the last row when more rows follow --
+            and ``insights`` (CampaignInsights dicts aligned with
+            ``items``, or None when not requested).
         """
-        query = Campaign.query
+        query = CampaignService.apply_filters(
+            select(*_read_columns(field_names)),
+            search,
+            status,
+            platform,
+            sort,
+            search_mode,
+        )
 
+        filtered = bool(status or platform or search)
+        total, count_mode = CampaignService._count(query, count, filtered)
+
+        if cursor is not None:
+            query = query.filter(
+                tuple_(Campaign.updated_at, Campaign.id) < tuple_(*cursor)
+            )
+            offset = 0
+
+        ordering = CampaignService._ordering(search, sort, search_mode)
+
+        # Fetch one extra row to find out whether another page exists.
+        query = query.order_by(*ordering).offset(offset).limit(limit + 1)
+
+        insights = None
+        if include == "latestInsight":
+            rows, insights = CampaignService._with_latest_insight(
+                query, ordering
+            )
+        else:
+            rows = db.session.execute(query).all()
+
+        campaigns = rows[:limit]
+        next_key = None
+        # Keyset cursors only exist for the (updated_at, id) ordering.
+        if len(rows) > limit and sort != "relevance":
+            last = campaigns[-1]
+            next_key = (last.updated_at, last.id)
+        if insights is not None:
+            insights = insights[:limit]
+        return CampaignPage(campaigns, total, count_mode, next_key, insights)
+
+    @staticmethod
+    def _with_latest_insight(page_query, ordering):
+        """Run ``page_query`` with each row's newest snapshot joined in.
+
+        The lateral join is applied to the already-limited page subquery,
+        so it costs one index descent per returned row regardless of how
+        many rows match the filters.  The page carries its position
+        (``row_number()`` over ``ordering``) so the outer query keeps the
+        page order without re-evaluating the sort expressions.
+
+        Returns:
+            tuple: (list[Row], list[dict]) aligned by position; each Row
+            carries the page columns plus the snapshot columns.
+        """
+        page = page_query.add_columns(
+            func.row_number().over(order_by=ordering).label("position")
+        ).subquery("page")
+        latest = latest_insight_lateral(page.c.id)
+        rows = db.session.execute(
+            select(page, *latest.c)
+            .outerjoin(latest, true())
+            .order_by(page.c.position)
+        ).all()
+        insights = [
+            insight_payload(row if row.captured_at is not None else None)
+            for row in rows
+        ]
+        return rows, insights
+
+    @staticmethod
+    @cache.cached("campaigns:suggest")
+    def suggest_campaigns(prefix, limit=8):
+        """Typeahead matches for ``prefix`` (already lower-cased).
+
+        Name-prefix matches come first, read in byte order straight off
+        the ``lower(name) COLLATE "C"`` index so the scan stops after
+        ``limit`` entries however common the prefix.  When they do not fill
+        ``limit`` and ``prefix`` has at least three characters, names
+        containing it follow (trigram index), best word similarity first.
+        Fuzzy ``%>`` matching is deliberately not used here: a query word
+        shared by most names would make every row a candidate.  Only the
+        four returned columns are selected.
+
+        Returns:
+            list[dict]: ``{id, name, status, platform}`` (JSON-ready).
+        """
+        name = func.lower(Campaign.name)
+        sort_name = name.collate("C")
+        columns = (
+            Campaign.id,
+            Campaign.name,
+            Campaign.status,
+            Campaign.platform,
+        )
+        starts_with = sort_name.like(f"{_escape_like(prefix)}%")
+
+        rows = db.session.execute(
+            select(*columns)
+            .filter(starts_with)
+            .order_by(sort_name, Campaign.id)
+            .limit(limit)
+        ).all()
+
+        # A short prefix page already holds every prefix match.
+        if len(rows) < limit and len(prefix) >= 3:
+            rows += db.session.execute(
+                select(*columns)
+                .filter(name.like(f"%{_escape_like(prefix)}%"), ~starts_with)
+                .order_by(func.word_similarity(prefix, name).desc(), name)
+                .limit(limit - len(rows))
+            ).all()
+
+        return [
+            {
+                "id": str(row.id),
+                "name": row.name,
+                "status": row.status,
+                "platform": row.platform,
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def apply_filters(
+        query, search, status, platform, sort=None, search_mode="substring"
+    ):
+        """Apply the list filters to ``query`` (any select over campaigns)."""
         # Exact filters
         if status:
             query = query.filter(Campaign.status == status)
         if platform:
             query = query.filter(Campaign.platform == platform)
 
+        # Full-text search: the GIN index on search_vector serves the
+        # match; status / platform are applied as a BitmapAnd or recheck.
+        if search and search_mode == "fulltext":
+            return query.filter(
+                Campaign.search_vector.bool_op("@@")(_tsquery(search))
+            )
+
         # Free-text search: case-insensitive substring on name,
-        # or exact enum match for status / platform values that contain
-        # the search substring.
+        # description or target audience (plus fuzzy matches when ranking
+        # by relevance), or exact enum match for status / platform values
+        # that contain the search substring.
+        #
+        # The predicates are written as ``lower(col) LIKE`` and
+        # ``lower(col) %> term`` so each one can use the matching
+        # ``lower(col) gin_trgm_ops`` index; PostgreSQL combines them with
+        # a BitmapOr instead of scanning the table.
         if search:
             search_lower = search.lower()
-            filters = [Campaign.name.ilike(f"%{search}%")]
+            pattern = f"%{_escape_like(search_lower)}%"
+            columns = CampaignService._search_columns()
+            if sort == "relevance":
+                CampaignService._set_similarity_threshold()
+                filters = [
+                    or_(
+                        column.like(pattern),
+                        column.bool_op("%>")(search_lower),
+                    )
+                    for column in columns
+                ]
+            else:
+                filters = [column.like(pattern) for column in columns]
 
             matching_statuses = [
                 s for s in CAMPAIGN_STATUSES if search_lower in s
@@ -57,28 +290,152 @@ class CampaignService:
             if matching_platforms:
                 filters.append(Campaign.platform.in_(matching_platforms))
 
-            query = query.filter(or_(*filters))
+            if sort == "relevance":
+                # pg_trgm declares ``%>`` as cheap as ``=``, so with all
+                # predicates OR-ed the planner prices a seq scan under the
+                # BitmapOr although it is ~10x slower.  Planned one branch
+                # at a time, each column takes its own trigram index.
+                query = query.filter(
+                    Campaign.id.in_(
+                        union_all(
+                            *(select(Campaign.id).where(f) for f in filters)
+                        )
+                    )
+                )
+            else:
+                query = query.filter(or_(*filters))
 
-        total = query.count()
-        campaigns = (
-            query.order_by(Campaign.updated_at.desc())
-            .offset(offset)
-            .limit(limit)
-            .all()
+        return query
+
+    @staticmethod
+    def _search_columns():
+        """``lower(col)`` expressions matching the trigram indexes."""
+        return [
+            func.lower(getattr(Campaign, name)) for name in SEARCH_COLUMNS
+        ]
+
+    @staticmethod
+    def _set_similarity_threshold():
+        """Set the ``%>`` cut-off for the current transaction.
+
+        The operator (unlike a ``word_similarity(...) > x`` predicate) is
+        index-backed, so the threshold is applied through the
+        ``pg_trgm.word_similarity_threshold`` setting.
+        """
+        db.session.execute(
+            db.text(
+                "SELECT set_config("
+                "'pg_trgm.word_similarity_threshold', :threshold, true)"
+            ),
+            {
+                "threshold": str(
+                    current_app.config["SEARCH_SIMILARITY_THRESHOLD"]
+                )
+            },
+        )
+
+    @staticmethod
+    def _ordering(search=None, sort=None, search_mode="substring"):
+        """ORDER BY clauses for the list."""
+        keys = [Campaign.updated_at.desc(), Campaign.id.desc()]
+        if sort != "relevance" or not search:
+            return keys
+
+        if search_mode == "fulltext":
+            score = func.ts_rank_cd(Campaign.search_vector, _tsquery(search))
+        else:
+            score = func.greatest(
+                *(
+                    func.word_similarity(search.lower(), column)
+                    for column in CampaignService._search_columns()
+                )
+            )
+        return [score.desc(), *keys]
+
+    @staticmethod
+    def _count(query, mode, filtered):
+        """Resolve the total for ``query`` according to ``mode``.
+
+        Returns:
+            tuple: (int | None, str) -- the total and the mode that
+            produced it.
+        """
+        if mode == "none":
+            return None, "none"
+
+        if mode == "estimate":
+            estimate = None
+            if not filtered:
+                estimate = CampaignService._table_estimate()
+            if estimate is None:
+                estimate = CampaignService._plan_estimate(query)
+            if estimate >= current_app.config["COUNT_ESTIMATE_THRESHOLD"]:
+                return estimate, "estimate"
+
+        exact = select(func.count()).select_from(query.subquery())
+        return db.session.scalar(exact), "exact"
+
+    @staticmethod
+    def _table_estimate():
+        """Row estimate for ``campaigns`` from the statistics catalog.
+
+        Returns None when the table has never been analysed.
+        """
+        reltuples = db.session.execute(
+            db.text(
+                "SELECT reltuples FROM pg_class "
+                "WHERE oid = 'campaigns'::regclass"
+            )
+        ).scalar()
+        if reltuples is None or reltuples < 0:
+            return None
+        return int(reltuples)
+
+    @staticmethod
+    def _plan_estimate(query):
+        """Planner row estimate for ``query`` via ``EXPLAIN (FORMAT JSON)``."""
+        compiled = query.compile(
+            dialect=db.engine.dialect,
+            compile_kwargs={"render_postcompile": True},
+        )
+        plan = (
+            db.session.connection()
+            .exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+            )
+            .scalar()
         )
-        return campaigns, total
+        return int(plan[0]["Plan"]["Plan Rows"])
 
     # ------------------------------------------------------------------
     # Read
     # ------------------------------------------------------------------
     @staticmethod
-    def get_campaign(campaign_id):
+    def get_campaign(campaign_id, field_names=None):
         """Fetch a single campaign by primary key.
 
+        ``field_names`` restricts the columns selected (see
+        ``list_campaigns``).
+
         Returns:
-            Campaign | None
+            Row | None
         """
-        return db.session.get(Campaign, campaign_id)
+        return db.session.execute(
+            select(*_read_columns(field_names)).where(
+                Campaign.id == campaign_id
+            )
+        ).one_or_none()
+
+    @staticmethod
+    def get_campaign_version(campaign_id):
+        """Return only ``updated_at`` for a campaign (ETag freshness check).
+
+        Returns:
+            datetime | None -- None when the campaign does not exist.
+        """
+        return db.session.scalar(
+            select(Campaign.updated_at).where(Campaign.id == campaign_id)
+        )
 
     # ------------------------------------------------------------------
     # Create
@@ -96,9 +453,39 @@ class CampaignService:
         campaign = Campaign(**data)
         db.session.add(campaign)
         db.session.commit()
+        cache.bump_version()
         logger.info("Campaign created: %s", campaign.id)
         return campaign
 
+    @staticmethod
+    def create_campaigns(rows):
+        """Persist many campaigns in a single transaction.
+
+        Uses one ORM bulk ``INSERT ... RETURNING`` (batched into multi-row
+        VALUES statements by SQLAlchemy) instead of a round trip per row.
+
+        Args:
+            rows: list of dicts validated by CampaignCreateSchema.
+
+        Returns:
+            list[Campaign] -- in the same order as ``rows``.
+        """
+        if not rows:
+            return []
+
+        campaigns = db.session.scalars(
+            insert(Campaign).returning(Campaign, sort_by_parameter_order=True),
+            rows,
+        ).all()
+        ids = [campaign.id for campaign in campaigns]
+        db.session.commit()
+        # The commit expires the returned rows; reload them in one query
+        # rather than one lazy SELECT per campaign when they are dumped.
+        db.session.scalars(select(Campaign).where(Campaign.id.in_(ids))).all()
+        cache.bump_version()
+        logger.info("Campaigns created in batch: %d", len(campaigns))
+        return campaigns
+
     # ------------------------------------------------------------------
     # Update
     # ------------------------------------------------------------------
@@ -121,6 +508,7 @@ class CampaignService:
             setattr(campaign, key, value)
 
         db.session.commit()
+        cache.bump_version()
         logger.info("Campaign updated: %s", campaign.id)
         return campaign
 
@@ -140,5 +528,29 @@ class CampaignService:
 
         db.session.delete(campaign)
         db.session.commit()
+        cache.bump_version()
         logger.info("Campaign deleted: %s", campaign_id)
         return True
+
+
+def _read_columns(field_names=None):
+    """Columns for ``field_names`` plus the keys the API always needs
+    (``id``, and ``updated_at`` for cursors and ETags), in table order."""
+    if field_names:
+        wanted = {*field_names, "id", "updated_at"}
+        names = [name for name in READ_COLUMNS if name in wanted]
+    else:
+        names = READ_COLUMNS
+    return [getattr(Campaign, name) for name in names]
+
+
+def _tsquery(search):
+    """``websearch_to_tsquery`` for user input (quotes, ``or``, ``-``)."""
+    return func.websearch_to_tsquery(SEARCH_CONFIG, search)
+
+
+def _escape_like(term):
+    """Escape LIKE wildcards so ``term`` matches literally."""
+    return (
+        term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    )
@@ -2,10 +2,11 @@
 
 import logging
 
-from sqlalchemy import func
+from sqlalchemy import func, select
 
-from app.extensions import db
+from app.extensions import cache, db
 from app.models.campaign import Campaign
+from app.models.campaign_summary import CampaignSummary
 from app.schemas.campaign import CAMPAIGN_STATUSES, PLATFORMS
 
 logger = logging.getLogger(__name__)
@@ -15,45 +16,79 @@ class DashboardService:
     """Provides aggregated metrics consumed by the dashboard UI."""
 
     @staticmethod
+    @cache.cached("dashboard:metrics")
     def get_metrics():
         """Build the DashboardMetrics payload.
 
+        Reads the trigger-maintained ``campaign_summary`` rollup (at most
+        one row per status/platform pair), so the cost does not grow with
+        the size of ``campaigns``.
+
         Returns:
             dict matching the DashboardMetrics schema with keys:
                 - campaignsByStatus
                 - budgetByPlatform
                 - totalActiveBudget
         """
+        rows = db.session.execute(
+            select(
+                CampaignSummary.status,
+                CampaignSummary.platform,
+                CampaignSummary.campaign_count,
+                CampaignSummary.total_budget,
+            )
+        ).all()
 
-        # --- Campaigns by status -----------------------------------------
-        status_rows = (
-            db.session.query(Campaign.status, func.count(Campaign.id))
-            .group_by(Campaign.status)
-            .all()
-        )
         campaigns_by_status = {s: 0 for s in CAMPAIGN_STATUSES}
-        for status, count in status_rows:
-            campaigns_by_status[status] = count
-
-        # --- Budget by platform ------------------------------------------
-        budget_rows = (
-            db.session.query(Campaign.platform, func.sum(Campaign.budget))
-            .group_by(Campaign.platform)
-            .all()
-        )
         budget_by_platform = {p: 0.0 for p in PLATFORMS}
-        for platform, total in budget_rows:
-            budget_by_platform[platform] = float(total) if total else 0.0
-
-        # --- Total active budget -----------------------------------------
-        total_active = (
-            db.session.query(func.sum(Campaign.budget))
-            .filter(Campaign.status == "active")
-            .scalar()
-        )
+        total_active = 0.0
+
+        for status, platform, count, budget in rows:
+            budget = float(budget) if budget else 0.0
+            campaigns_by_status[status] += count
+            budget_by_platform[platform] += budget
+            if status == "active":
+                total_active += budget
 
         return {
             "campaignsByStatus": campaigns_by_status,
             "budgetByPlatform": budget_by_platform,
-            "totalActiveBudget": float(total_active) if total_active else 0.0,
+            "totalActiveBudget": total_active,
         }
+
+    @staticmethod
+    def rebuild_summary():
+        """Recompute ``campaign_summary`` from the campaigns table.
+
+        Writers are blocked (``SHARE`` lock) for the duration so the rollup
+        cannot drift while it is being rebuilt; readers are unaffected.
+
+        Returns:
+            int -- number of (status, platform) rows written.
+        """
+        db.session.execute(db.text("LOCK TABLE campaigns IN SHARE MODE"))
+        db.session.query(CampaignSummary).delete()
+
+        rows = (
+            db.session.query(
+                Campaign.status,
+                Campaign.platform,
+                func.count(Campaign.id),
+                func.sum(Campaign.budget),
+            )
+            .group_by(Campaign.status, Campaign.platform)
+            .all()
+        )
+        db.session.add_all(
+            CampaignSummary(
+                status=status,
+                platform=platform,
+                campaign_count=count,
+                total_budget=budget,
+            )
+            for status, platform, count, budget in rows
+        )
+        db.session.commit()
+        cache.bump_version()
+        logger.info("Campaign summary rebuilt: %d rows", len(rows))
+        return len(rows)
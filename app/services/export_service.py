@@ -0,0 +1,526 @@
+"""Streaming NDJSON / CSV exports of campaigns and insight snapshots.
+
+Exports take the same filters as the corresponding list endpoints.
+:func:`stream_export` runs one ``SELECT`` on its own connection inside a
+``REPEATABLE READ, READ ONLY`` transaction and fetches it through a
+server-side (named) cursor, ``EXPORT_BATCH_SIZE`` rows at a time.  Each
+batch is encoded and yielded as one chunk of the response body, so memory
+is bounded by the batch size whether the export holds a thousand rows or
+ten million, and every row comes from the same snapshot however long the
+client takes to read it.
+
+The statement is executed before the generator is returned: query errors
+surface as normal error responses rather than a truncated stream.  The
+connection is held until the response body is closed -- which the WSGI
+server does whether the body was read to the end, abandoned by the
+client, or never iterated at all (``HEAD``).
+
+Insight snapshots can also be exported as an Arrow IPC stream or a Parquet
+file (:func:`stream_columnar`, requires the optional ``pyarrow`` package).
+A single ``COPY (SELECT ...) TO STDOUT`` is piped from a worker thread into
+pyarrow's streaming CSV reader, which parses it in
+``EXPORT_COLUMNAR_BLOCK_SIZE`` blocks straight into column buffers: no
+Python object is created per row, and one statement means one snapshot.
+"""
+
+import csv
+import io
+import logging
+import os
+import threading
+
+from flask import current_app
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models.campaign import Campaign
+from app.models.campaign_insight import CampaignInsight
+from app.schemas.campaign import COLUMNAR_FORMATS, CampaignSchema
+from app.schemas.fast import dump_campaign_rows
+from app.services.campaign_service import READ_COLUMNS, CampaignService
+from app.services.ingest_service import INGEST_FIELDS
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pa_parquet
+except ImportError:  # pragma: no cover - optional dependency
+    pa = pa_csv = pa_parquet = None
+
+logger = logging.getLogger(__name__)
+
+EXPORT_MIMETYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+# Arrow IPC *stream* files conventionally use ".arrows".
+EXPORT_EXTENSIONS = {
+    "ndjson": "ndjson",
+    "csv": "csv",
+    "arrow": "arrows",
+    "parquet": "parquet",
+}
+COLUMNAR_AVAILABLE = pa is not None
+
+# Campaign records use the API response keys; insight records use the
+# ingest format, so an export can be loaded back with /insights/ingest.
+CAMPAIGN_EXPORT_COLUMNS = tuple(
+    field.data_key or name
+    for name, field in CampaignSchema().dump_fields.items()
+)
+INSIGHT_EXPORT_COLUMNS = tuple(INGEST_FIELDS)
+
+
+class ExportService:
+    """Builds export statements and streams them."""
+
+    @staticmethod
+    def export_campaigns(
+        fmt, search=None, status=None, platform=None, search_mode="substring"
+    ):
+        """Stream every campaign matching the list filters, by ``id``.
+
+        Returns:
+            iterable of ``bytes`` (see :func:`stream_export`).
+        """
+        query = CampaignService.apply_filters(
+            select(*(getattr(Campaign, name) for name in READ_COLUMNS)),
+            search,
+            status,
+            platform,
+            search_mode=search_mode,
+        ).order_by(Campaign.id)
+        return stream_export(
+            query, dump_campaign_rows, CAMPAIGN_EXPORT_COLUMNS, fmt
+        )
+
+    @staticmethod
+    def export_insights(
+        fmt,
+        campaign_id=None,
+        start=None,
+        end=None,
+        search=None,
+        status=None,
+        platform=None,
+        search_mode="substring",
+        include=None,
+    ):
+        """Stream insight snapshots by ``(campaignId, capturedAt)``.
+
+        ``start`` / ``end`` bound ``captured_at`` (inclusive / exclusive);
+        the campaign list filters select the campaigns whose snapshots are
+        exported.  ``arrow`` / ``parquet`` are delegated to
+        :meth:`export_insights_columnar` (``search`` is not supported
+        there).
+
+        Returns:
+            iterable of ``bytes`` (see :func:`stream_export`).
+        """
+        if fmt in COLUMNAR_FORMATS:
+            return ExportService.export_insights_columnar(
+                fmt, campaign_id, start, end, status, platform, include
+            )
+
+        query = select(
+            *(getattr(CampaignInsight, col) for col in INGEST_FIELDS.values())
+        )
+        if search or status or platform:
+            query = CampaignService.apply_filters(
+                query.join(Campaign, CampaignInsight.campaign),
+                search,
+                status,
+                platform,
+                search_mode=search_mode,
+            )
+        if campaign_id is not None:
+            query = query.filter(CampaignInsight.campaign_id == campaign_id)
+        if start is not None:
+            query = query.filter(CampaignInsight.captured_at >= start)
+        if end is not None:
+            query = query.filter(CampaignInsight.captured_at < end)
+        query = query.order_by(
+            CampaignInsight.campaign_id, CampaignInsight.captured_at
+        )
+        return stream_export(
+            query, _insight_records, INSIGHT_EXPORT_COLUMNS, fmt
+        )
+
+    @staticmethod
+    def export_insights_columnar(
+        fmt,
+        campaign_id=None,
+        start=None,
+        end=None,
+        status=None,
+        platform=None,
+        include=None,
+    ):
+        """Stream insight snapshots as Arrow (IPC stream) or Parquet.
+
+        Columns are the ``campaign_insights`` columns under their table
+        names, plus the campaign's ``status`` and ``platform``
+        (dictionary-encoded) with ``include="campaign"``.  Rows are in
+        table order.
+
+        Returns:
+            iterable of ``bytes`` (see :func:`stream_columnar`).
+
+        Raises:
+            RuntimeError: if ``pyarrow`` is not installed.
+        """
+        with_campaign = include == "campaign"
+        clauses, params = [], {}
+        if campaign_id is not None:
+            clauses.append("i.campaign_id = %(campaign_id)s")
+            params["campaign_id"] = str(campaign_id)
+        if start is not None:
+            clauses.append("i.captured_at >= %(start)s")
+            params["start"] = start
+        if end is not None:
+            clauses.append("i.captured_at < %(end)s")
+            params["end"] = end
+        if status:
+            clauses.append("c.status = %(status)s")
+            params["status"] = status
+        if platform:
+            clauses.append("c.platform = %(platform)s")
+            params["platform"] = platform
+
+        joined = with_campaign or status or platform
+        sql = _COLUMNAR_SQL.format(
+            dimensions=", c.status, c.platform" if with_campaign else "",
+            join=" JOIN campaigns c ON c.id = i.campaign_id" if joined else "",
+            where=" AND ".join(clauses) or "true",
+        )
+        schema = _columnar_schema(with_campaign)
+        return stream_columnar(sql, params, schema, fmt)
+
+
+# ---------------------------------------------------------------------------
+# Streaming
+# ---------------------------------------------------------------------------
+def stream_export(statement, dump_rows, columns, fmt):
+    """Execute ``statement`` and stream its encoded chunks.
+
+    Args:
+        statement: Core ``select()`` to export.
+        dump_rows: callable turning a list of Rows into record dicts
+            whose keys are ``columns`` (in order).
+        columns: record keys; also the CSV header row.
+        fmt: ``"ndjson"`` or ``"csv"``.
+
+    Returns:
+        :class:`_ExportStream` of ``bytes``.
+    """
+    encode = _encoder(fmt, columns)
+    batch_size = current_app.config["EXPORT_BATCH_SIZE"]
+
+    connection = db.engine.connect()
+    try:
+        connection.execution_options(isolation_level="REPEATABLE READ")
+        transaction = connection.begin()
+        connection.exec_driver_sql("SET TRANSACTION READ ONLY")
+        result = connection.execution_options(yield_per=batch_size).execute(
+            statement
+        )
+    except Exception:
+        connection.close()
+        raise
+
+    def generate():
+        exported = 0
+        if fmt == "csv":
+            yield encode(None)
+        for rows in result.partitions():
+            exported += len(rows)
+            yield encode(dump_rows(rows))
+        transaction.commit()
+        logger.info("Export finished: %d rows (%s)", exported, fmt)
+
+    return _ExportStream(generate(), connection.close)
+
+
+class _ExportStream:
+    """Response body: ``chunks``, then ``cleanup`` however the body ends.
+
+    A generator's ``finally`` only runs once iteration has started, so a
+    body that is never read would hold its connection (and snapshot)
+    open.  :meth:`close` -- called by the WSGI server for every response,
+    ``HEAD`` included -- closes ``chunks`` and always runs ``cleanup``;
+    a body dropped before it was sent is closed when it is collected.
+    """
+
+    def __init__(self, chunks, cleanup):
+        self._chunks = chunks
+        self._cleanup = cleanup
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._chunks)
+
+    def close(self):
+        cleanup, self._cleanup = self._cleanup, None
+        if cleanup is None:
+            return
+        try:
+            self._chunks.close()
+        finally:
+            cleanup()
+
+    __del__ = close
+
+
+def _encoder(fmt, columns):
+    """Return ``encode(records) -> bytes`` (``records=None``: CSV header)."""
+    if fmt == "csv":
+
+        def encode(records):
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            if records is None:
+                writer.writerow(columns)
+            else:
+                writer.writerows(
+                    ["" if v is None else v for v in record.values()]
+                    for record in records
+                )
+            return buffer.getvalue().encode()
+
+        return encode
+
+    dumps = current_app.json.dumps
+
+    def encode(records):
+        return "".join(
+            dumps(record, separators=(",", ":")) + "\n" for record in records
+        ).encode()
+
+    return encode
+
+
+# ---------------------------------------------------------------------------
+# Columnar (Arrow / Parquet)
+# ---------------------------------------------------------------------------
+_COLUMNAR_SQL = """
+SELECT i.id, i.campaign_id, i.captured_at,
+       i.impressions, i.clicks, i.conversions, i.ctr, i.cpc, i.roi,
+       i.engagement_likes, i.engagement_shares,
+       i.engagement_comments{dimensions}
+FROM campaign_insights i{join}
+WHERE {where}
+"""
+
+
+def _columnar_schema(with_campaign):
+    """Arrow schema of the ``_COLUMNAR_SQL`` select list."""
+    _require_pyarrow()
+    columns = [
+        ("id", pa.string()),
+        ("campaign_id", pa.string()),
+        ("captured_at", pa.timestamp("us", tz="UTC")),
+        ("impressions", pa.int64()),
+        ("clicks", pa.int64()),
+        ("conversions", pa.int64()),
+        ("ctr", pa.decimal128(5, 2)),
+        ("cpc", pa.decimal128(10, 2)),
+        ("roi", pa.decimal128(8, 2)),
+        ("engagement_likes", pa.int64()),
+        ("engagement_shares", pa.int64()),
+        ("engagement_comments", pa.int64()),
+    ]
+    if with_campaign:
+        dimension = pa.dictionary(pa.int32(), pa.string())
+        columns += [("status", dimension), ("platform", dimension)]
+    return pa.schema(columns)
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise RuntimeError("Arrow / Parquet exports require 'pyarrow'")
+
+
+def stream_columnar(sql, params, schema, fmt):
+    """``COPY`` ``sql`` out of PostgreSQL and re-encode it as Arrow batches.
+
+    The first block is read before the generator is returned, so query
+    errors surface as normal error responses.  Each following block
+    becomes one record batch (one Parquet row group).
+
+    Args:
+        sql: ``SELECT`` with psycopg2 ``%(name)s`` placeholders whose
+            columns match ``schema``.
+        params: placeholder values.
+        schema: ``pyarrow.Schema`` of the result.
+        fmt: ``"arrow"`` or ``"parquet"``.
+
+    Returns:
+        :class:`_ExportStream` of ``bytes``.
+
+    Raises:
+        UnexportableValue: if the first block holds a value the schema
+            cannot represent (e.g. an ``infinity`` timestamp or a
+            ``NaN`` numeric).  Later blocks raise it mid-stream.
+    """
+    _require_pyarrow()
+    connection = db.engine.connect()
+    cursor = connection.connection.cursor()
+    try:
+        cursor.execute("SET TRANSACTION READ ONLY")
+        select_sql = cursor.mogrify(sql, params).decode()
+    except Exception:
+        connection.close()
+        raise
+
+    read_fd, write_fd = os.pipe()
+    copied = {"bytes": 0, "error": None}
+
+    def copy():
+        try:
+            with os.fdopen(write_fd, "wb") as pipe:
+                cursor.copy_expert(
+                    f"COPY ({select_sql}) TO STDOUT WITH (FORMAT csv)",
+                    _CountingWriter(pipe, copied),
+                )
+        except Exception as exc:  # re-raised by the reading side
+            copied["error"] = exc
+
+    thread = threading.Thread(target=copy, name="export-copy", daemon=True)
+    thread.start()
+    source = os.fdopen(read_fd, "rb")
+
+    def finish(completed):
+        if source.closed:
+            return
+        source.close()  # unblocks the COPY thread if the client went away
+        thread.join()
+        if not completed:
+            connection.invalidate()
+        connection.close()
+
+    try:
+        reader = pa_csv.open_csv(
+            source,
+            read_options=pa_csv.ReadOptions(
+                column_names=schema.names,
+                block_size=current_app.config["EXPORT_COLUMNAR_BLOCK_SIZE"],
+            ),
+            convert_options=pa_csv.ConvertOptions(
+                column_types=schema,
+                # COPY writes NULL as an empty field; "NaN" is a value.
+                null_values=[""],
+                quoted_strings_can_be_null=False,
+            ),
+        )
+    except pa.ArrowInvalid as exc:
+        if copied["bytes"]:
+            # The first block does not parse; COPY may still be writing.
+            finish(False)
+            raise UnexportableValue(str(exc)) from exc
+        thread.join()  # EOF without output: COPY has finished
+        if copied["error"] is not None:
+            finish(False)
+            raise copied["error"]
+        reader = ()  # no rows: "Empty CSV file"
+    except Exception:
+        finish(False)
+        raise
+
+    def generate():
+        sink = _ChunkSink()
+        if fmt == "parquet":
+            writer = pa_parquet.ParquetWriter(
+                sink, schema, compression="zstd"
+            )
+        else:
+            writer = pa.ipc.new_stream(sink, schema)
+        exported = 0
+        completed = False
+        try:
+            for batch in _batches(reader):
+                exported += batch.num_rows
+                writer.write_batch(batch)
+                yield sink.drain()
+            thread.join()
+            if copied["error"] is not None:
+                raise copied["error"]
+            writer.close()
+            yield sink.drain()
+            completed = True
+            logger.info("Export finished: %d rows (%s)", exported, fmt)
+        finally:
+            finish(completed)
+
+    return _ExportStream(generate(), lambda: finish(False))
+
+
+class UnexportableValue(ValueError):
+    """A stored value has no representation in the export schema."""
+
+
+def _batches(reader):
+    try:
+        yield from reader
+    except pa.ArrowInvalid as exc:
+        raise UnexportableValue(str(exc)) from exc
+
+
+class _CountingWriter:
+    """File wrapper recording how many bytes ``COPY`` produced."""
+
+    def __init__(self, raw, counter):
+        self._raw = raw
+        self._counter = counter
+
+    def write(self, data):
+        self._counter["bytes"] += len(data)
+        return self._raw.write(data)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only sink collecting encoder output until it is drained."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _insight_records(rows):
+    """Insight Rows (``INGEST_FIELDS`` column order) as ingest records."""
+    return [
+        {
+            "campaignId": str(row[0]),
+            "capturedAt": row[1].isoformat(),
+            "impressions": row[2],
+            "clicks": row[3],
+            "conversions": row[4],
+            "ctr": float(row[5]),
+            "cpc": float(row[6]),
+            "roi": float(row[7]),
+            "engagementLikes": row[8],
+            "engagementShares": row[9],
+            "engagementComments": row[10],
+        }
+        for row in rows
+    ]
@@ -0,0 +1,350 @@
+"""High-throughput ingestion of campaign insight snapshots.
+
+Rows arrive as NDJSON or CSV (flat camelCase keys, see ``INGEST_FIELDS``),
+are validated in Python chunk by chunk, written to an in-memory CSV buffer
+and loaded with ``COPY ... FROM STDIN`` into a temporary staging table.
+Each chunk is then merged into ``campaign_insights`` with a single
+``INSERT ... SELECT``, which also derives ``ctr`` from clicks and
+impressions when a row omits it.  Memory is bounded by the chunk size regardless of
+how large the input stream is.
+
+The merge is idempotent: snapshots whose ``(campaignId, capturedAt)``
+already exist are skipped, as are rows for unknown campaigns.  Marshmallow
+is deliberately not used per row -- at hundreds of thousands of rows per
+second its per-field dispatch would dominate the load time.
+"""
+
+import csv
+import io
+import json
+import logging
+import uuid
+from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+from app.extensions import cache, db
+
+logger = logging.getLogger(__name__)
+
+INGEST_FORMATS = ("ndjson", "csv")
+
+# Input key -> campaign_insights column, in COPY column order.
+INGEST_FIELDS = {
+    "campaignId": "campaign_id",
+    "capturedAt": "captured_at",
+    "impressions": "impressions",
+    "clicks": "clicks",
+    "conversions": "conversions",
+    "ctr": "ctr",
+    "cpc": "cpc",
+    "roi": "roi",
+    "engagementLikes": "engagement_likes",
+    "engagementShares": "engagement_shares",
+    "engagementComments": "engagement_comments",
+}
+_FIELD_NAMES = frozenset(INGEST_FIELDS)
+_COUNT_FIELDS = (
+    "impressions",
+    "clicks",
+    "conversions",
+    "engagementLikes",
+    "engagementShares",
+    "engagementComments",
+)
+_DECIMAL_FIELDS = ("ctr", "cpc", "roi")
+# INGEST_FIELDS after campaignId / capturedAt.
+_ROW_TAIL = tuple(INGEST_FIELDS)[2:]
+# Largest value of the bigint count columns.
+_BIGINT_MAX = 2**63 - 1
+_CENT = Decimal("0.01")
+# Inclusive lower / exclusive upper bounds of the numeric(p, 2) columns.
+_DECIMAL_LIMITS = {
+    "ctr": (0, 1_000),
+    "cpc": (0, 100_000_000),
+    "roi": (-1_000_000, 1_000_000),
+}
+_MAX_REPORTED_ERRORS = 100
+_REQUIRED = "Missing data for required field."
+
+_COLUMNS = ", ".join(INGEST_FIELDS.values())
+
+_CREATE_STAGING_SQL = """
+CREATE TEMP TABLE IF NOT EXISTS insight_ingest_staging (
+  campaign_id uuid NOT NULL,
+  captured_at timestamptz,
+  impressions bigint NOT NULL,
+  clicks bigint NOT NULL,
+  conversions bigint NOT NULL,
+  ctr numeric(5,2),
+  cpc numeric(10,2) NOT NULL,
+  roi numeric(8,2) NOT NULL,
+  engagement_likes bigint NOT NULL,
+  engagement_shares bigint NOT NULL,
+  engagement_comments bigint NOT NULL
+) ON COMMIT DROP
+"""
+
+_MERGE_SQL = f"""
+WITH src AS (
+  SELECT DISTINCT ON (campaign_id, captured_at) *
+  FROM (
+    SELECT campaign_id, COALESCE(captured_at, now()) AS captured_at,
+           impressions, clicks, conversions,
+           COALESCE(
+             ctr, round(clicks * 100.0 / NULLIF(impressions, 0), 2), 0
+           ) AS ctr,
+           cpc, roi,
+           engagement_likes, engagement_shares, engagement_comments
+    FROM insight_ingest_staging
+  ) s
+  ORDER BY campaign_id, captured_at
+),
+known AS (
+  SELECT src.* FROM src
+  WHERE EXISTS (SELECT 1 FROM campaigns c WHERE c.id = src.campaign_id)
+),
+inserted AS (
+  INSERT INTO campaign_insights ({_COLUMNS})
+  SELECT {_COLUMNS} FROM known k
+  WHERE NOT EXISTS (
+    SELECT 1 FROM campaign_insights i
+    WHERE i.campaign_id = k.campaign_id AND i.captured_at = k.captured_at
+  )
+  RETURNING 1
+)
+SELECT
+  (SELECT count(*) FROM insight_ingest_staging),
+  (SELECT count(*) FROM src),
+  (SELECT count(*) FROM known),
+  (SELECT count(*) FROM inserted)
+"""
+
+
+class InsightIngestService:
+    """Validates and bulk-loads insight snapshots via ``COPY``."""
+
+    @staticmethod
+    def ingest(stream, fmt, chunk_size=10_000):
+        """Load insight rows from a text stream.
+
+        Args:
+            stream: text file-like object (request body or file).
+            fmt: ``"ndjson"`` or ``"csv"`` (CSV requires a header row).
+            chunk_size: rows validated and copied per round trip.
+
+        Returns:
+            dict with ``received``, ``inserted``, ``duplicates``,
+            ``unknownCampaigns``, ``rejected`` and the first
+            ``errors`` (line number plus ValidationIssue details).
+        """
+        summary = {
+            "received": 0,
+            "inserted": 0,
+            "duplicates": 0,
+            "unknownCampaigns": 0,
+            "rejected": 0,
+            "errors": [],
+        }
+
+        db.session.execute(db.text(_CREATE_STAGING_SQL))
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        pending = 0
+
+        with db.session.connection().connection.cursor() as cursor:
+            for line, record in _read_records(stream, fmt):
+                summary["received"] += 1
+                row, details = _validate(record)
+                if details:
+                    summary["rejected"] += 1
+                    if len(summary["errors"]) < _MAX_REPORTED_ERRORS:
+                        summary["errors"].append(
+                            {"line": line, "details": details}
+                        )
+                    continue
+
+                writer.writerow(row)
+                pending += 1
+                if pending >= chunk_size:
+                    _flush(cursor, buffer, summary)
+                    pending = 0
+
+            if pending:
+                _flush(cursor, buffer, summary)
+
+        db.session.commit()
+        if summary["inserted"]:
+            cache.bump_version()
+        logger.info(
+            "Insights ingested: %d inserted, %d rejected",
+            summary["inserted"],
+            summary["rejected"],
+        )
+        return summary
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+def _read_records(stream, fmt):
+    """Yield ``(line_number, record)`` pairs from an NDJSON or CSV stream.
+
+    Records that cannot be parsed are yielded as ``None``.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+        return
+
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield line_number, record
+
+
+def _validate(record):
+    """Validate one raw record.
+
+    Numeric values are checked here but written to COPY in their original
+    textual form; PostgreSQL does the final ``numeric(p, 2)`` rounding.
+
+    Returns:
+        tuple: (list | None, list) -- the COPY row in ``INGEST_FIELDS``
+        order, and ValidationIssue dicts (empty when valid).
+    """
+    if not isinstance(record, dict):
+        return None, [{"field": "_schema", "message": "Invalid record."}]
+
+    details = []
+    row = []
+
+    def error(field, message):
+        details.append({"field": field, "message": message})
+
+    if not record.keys() <= _FIELD_NAMES:
+        for key in sorted(str(k) for k in record if k not in _FIELD_NAMES):
+            error(key, "Unknown field.")
+
+    campaign_id = record.get("campaignId")
+    if campaign_id in (None, ""):
+        error("campaignId", _REQUIRED)
+    else:
+        try:
+            campaign_id = str(uuid.UUID(campaign_id))
+        except (AttributeError, TypeError, ValueError):
+            error("campaignId", "Not a valid UUID.")
+    row.append(campaign_id)
+
+    captured_at = record.get("capturedAt")
+    if captured_at in (None, ""):
+        captured_at = ""  # NULL -> now() at merge time
+    else:
+        try:
+            _parse_datetime(captured_at)
+        except (AttributeError, ValueError):
+            error("capturedAt", "Not a valid datetime.")
+    row.append(captured_at)
+
+    counts = {}
+    for key in _COUNT_FIELDS:
+        value = record.get(key)
+        if type(value) is not int or not 0 <= value <= _BIGINT_MAX:
+            try:
+                value = _parse_count(value)
+            except ValueError as exc:
+                error(key, str(exc))
+        counts[key] = value
+
+    for key in _DECIMAL_FIELDS:
+        value = record.get(key)
+        if value in (None, ""):
+            if key == "ctr":
+                value = ""  # NULL -> derived from clicks / impressions
+            else:
+                error(key, _REQUIRED)
+        else:
+            try:
+                _check_decimal(value, key)
+            except ValueError as exc:
+                error(key, str(exc))
+        counts[key] = value
+
+    if counts["ctr"] == "" and not details:
+        clicks, impressions = counts["clicks"], counts["impressions"]
+        # round(clicks * 100 / impressions, 2) must fit numeric(5,2)
+        if impressions and clicks * 100_000 >= 999_995 * impressions:
+            error("ctr", "Computed CTR out of range.")
+
+    if details:
+        return None, details
+    row.extend(counts[key] for key in _ROW_TAIL)
+    return row, []
+
+
+def _parse_datetime(value):
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
+def _parse_count(value):
+    if value is None:
+        raise ValueError(_REQUIRED)
+    if isinstance(value, bool):
+        raise ValueError("Not a valid integer.")
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError("Not a valid integer.")
+        value = int(value)
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("Not a valid integer.")
+    if number < 0:
+        raise ValueError("Must be greater than or equal to 0.")
+    if number > _BIGINT_MAX:
+        raise ValueError("Number out of range.")
+    return number
+
+
+def _check_decimal(value, key):
+    if isinstance(value, bool):
+        raise ValueError("Not a valid number.")
+    # Round the text COPY will see the way numeric(p, 2) does (half away
+    # from zero); float rounding disagrees at the boundaries.
+    try:
+        number = Decimal(str(value))
+    except (TypeError, ValueError, InvalidOperation):
+        raise ValueError("Not a valid number.")
+    if not number.is_finite():
+        raise ValueError("Number out of range.")
+    number = number.quantize(_CENT, rounding=ROUND_HALF_UP)
+    lower, upper = _DECIMAL_LIMITS[key]
+    if not lower <= number < upper:
+        raise ValueError("Number out of range.")
+
+
+def _flush(cursor, buffer, summary):
+    """COPY the buffered chunk into staging and merge it."""
+    buffer.seek(0)
+    cursor.copy_expert(
+        f"COPY insight_ingest_staging ({_COLUMNS}) FROM STDIN WITH (FORMAT csv)",
+        buffer,
+    )
+    staged, distinct, known, inserted = db.session.execute(
+        db.text(_MERGE_SQL)
+    ).one()
+    db.session.execute(db.text("TRUNCATE insight_ingest_staging"))
+
+    summary["inserted"] += inserted
+    summary["duplicates"] += (staged - distinct) + (known - inserted)
+    summary["unknownCampaigns"] += distinct - known
+
+    buffer.seek(0)
+    buffer.truncate()
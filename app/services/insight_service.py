@@ -1,16 +1,95 @@
-"""Business logic for campaign insights retrieval."""
+"""Business logic for campaign insights retrieval.
+
+All reads are Core ``select()`` statements returning ``Row`` tuples; no
+ORM instances are loaded.
+"""
 
 import logging
+import math
+from datetime import timedelta, timezone
+
+from flask import current_app
+from sqlalchemy import func, select, true
 
+from app.extensions import cache, db
+from app.models.campaign import Campaign
 from app.models.campaign_insight import CampaignInsight
 
 logger = logging.getLogger(__name__)
 
+BUCKET_WIDTHS = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+}
+
+
+# Snapshot columns read by insight_payload (plus captured_at).
+SNAPSHOT_COLUMNS = (
+    CampaignInsight.captured_at,
+    CampaignInsight.impressions,
+    CampaignInsight.clicks,
+    CampaignInsight.conversions,
+    CampaignInsight.ctr,
+    CampaignInsight.cpc,
+    CampaignInsight.roi,
+    CampaignInsight.engagement_likes,
+    CampaignInsight.engagement_shares,
+    CampaignInsight.engagement_comments,
+)
+
+
+def latest_insight_lateral(campaign_id_column):
+    """``LATERAL`` subquery selecting the newest snapshot for a campaign.
+
+    Outer-join it ``ON true`` to any query exposing ``campaign_id_column``.
+    """
+    return (
+        select(*SNAPSHOT_COLUMNS)
+        .where(CampaignInsight.campaign_id == campaign_id_column)
+        .order_by(CampaignInsight.captured_at.desc())
+        .limit(1)
+        .lateral("latest_insight")
+    )
+
+
+def insight_payload(insight):
+    """Build a CampaignInsights dict from a snapshot row (or zeros for None).
+
+    ``insight`` may be a CampaignInsight instance or any row exposing the
+    same column names.
+    """
+    if insight is None:
+        return {
+            "impressions": 0,
+            "clicks": 0,
+            "conversions": 0,
+            "ctr": 0.0,
+            "cpc": 0.0,
+            "roi": 0.0,
+            "engagement": {"likes": 0, "shares": 0, "comments": 0},
+        }
+
+    return {
+        "impressions": insight.impressions,
+        "clicks": insight.clicks,
+        "conversions": insight.conversions,
+        "ctr": float(insight.ctr),
+        "cpc": float(insight.cpc),
+        "roi": float(insight.roi),
+        "engagement": {
+            "likes": insight.engagement_likes,
+            "shares": insight.engagement_shares,
+            "comments": insight.engagement_comments,
+        },
+    }
+
 
 class InsightService:
     """Service for fetching campaign performance insights."""
 
     @staticmethod
+    @cache.cached("insights:latest")
     def get_campaign_insights(campaign_id):
         """Return the most recent insight snapshot for a campaign.
 
@@ -20,37 +99,142 @@ class InsightService:
         Returns:
             dict matching the CampaignInsights schema.
         """
-        insight = (
-            CampaignInsight.query.filter_by(campaign_id=campaign_id)
+        insight = db.session.execute(
+            select(*SNAPSHOT_COLUMNS)
+            .where(CampaignInsight.campaign_id == campaign_id)
             .order_by(CampaignInsight.captured_at.desc())
-            .first()
-        )
+            .limit(1)
+        ).first()
 
         if insight is None:
             logger.debug(
                 "No insights found for campaign %s – returning zeros",
                 campaign_id,
             )
-            return {
-                "impressions": 0,
-                "clicks": 0,
-                "conversions": 0,
-                "ctr": 0.0,
-                "cpc": 0.0,
-                "roi": 0.0,
-                "engagement": {"likes": 0, "shares": 0, "comments": 0},
-            }
+        return insight_payload(insight)
+
+    @staticmethod
+    def get_latest_insights(campaign_ids):
+        """Return the latest snapshot for many campaigns in one query.
+
+        Each campaign is joined ``LATERAL`` to its newest snapshot, which
+        is a single descent of ``campaign_insights_campaign_time_idx`` per
+        campaign.  Campaigns without snapshots get the same zeroed-out body
+        as :meth:`get_campaign_insights`; unknown IDs are left out.
+
+        Returns:
+            dict mapping campaign id (str) to a CampaignInsights dict.
+        """
+        latest = latest_insight_lateral(Campaign.id)
+        rows = db.session.execute(
+            select(Campaign.id, *latest.c)
+            .select_from(Campaign)
+            .outerjoin(latest, true())
+            .where(Campaign.id.in_(set(campaign_ids)))
+        ).all()
+        return {
+            str(row.id): insight_payload(
+                row if row.captured_at is not None else None
+            )
+            for row in rows
+        }
+
+    @staticmethod
+    @cache.cached("insights:series")
+    def get_insight_series(campaign_id, start, end, bucket="day"):
+        """Aggregate a campaign's snapshots into time buckets in PostgreSQL.
+
+        Buckets are aligned like ``date_trunc(bucket, start)`` (weeks start
+        on Monday).  When the range would produce more than
+        ``SERIES_MAX_POINTS`` buckets the bucket width is widened to a
+        whole multiple of ``bucket`` so the point count stays bounded;
+        ``date_bin`` then does the grouping.  Counters are summed; CTR and
+        CPC are recomputed from the sums and ROI is spend-weighted.
+        Buckets without snapshots are omitted.
+
+        Returns:
+            dict with ``bucket``, ``bucketSeconds`` and ``points``.
+        """
+        width = BUCKET_WIDTHS[bucket]
+        origin = _truncate(start, bucket)
+        buckets = math.ceil((end - origin) / width)
+        factor = max(
+            1, math.ceil(buckets / current_app.config["SERIES_MAX_POINTS"])
+        )
+        stride = width * factor
+
+        bucket_start = func.date_bin(
+            stride, CampaignInsight.captured_at, origin
+        ).label("bucket_start")
+        clicks = func.sum(CampaignInsight.clicks)
+        impressions = func.sum(CampaignInsight.impressions)
+        spend = func.sum(CampaignInsight.cpc * CampaignInsight.clicks)
+        roi_by_spend = func.sum(
+            CampaignInsight.roi * CampaignInsight.cpc * CampaignInsight.clicks
+        )
+
+        rows = db.session.execute(
+            select(
+                bucket_start,
+                impressions,
+                clicks,
+                func.sum(CampaignInsight.conversions),
+                func.coalesce(
+                    func.round(clicks * 100.0 / func.nullif(impressions, 0), 2),
+                    0,
+                ),
+                func.coalesce(
+                    func.round(spend / func.nullif(clicks, 0), 2), 0
+                ),
+                func.coalesce(
+                    func.round(roi_by_spend / func.nullif(spend, 0), 2),
+                    func.round(func.avg(CampaignInsight.roi), 2),
+                ),
+                func.sum(CampaignInsight.engagement_likes),
+                func.sum(CampaignInsight.engagement_shares),
+                func.sum(CampaignInsight.engagement_comments),
+            )
+            .filter(
+                CampaignInsight.campaign_id == campaign_id,
+                CampaignInsight.captured_at >= start,
+                CampaignInsight.captured_at < end,
+            )
+            .group_by(bucket_start)
+            .order_by(bucket_start)
+        ).all()
 
+        points = [
+            {
+                "start": row[0].isoformat(),
+                "impressions": int(row[1]),
+                "clicks": int(row[2]),
+                "conversions": int(row[3]),
+                "ctr": float(row[4]),
+                "cpc": float(row[5]),
+                "roi": float(row[6]),
+                "engagement": {
+                    "likes": int(row[7]),
+                    "shares": int(row[8]),
+                    "comments": int(row[9]),
+                },
+            }
+            for row in rows
+        ]
         return {
-            "impressions": insight.impressions,
-            "clicks": insight.clicks,
-            "conversions": insight.conversions,
-            "ctr": float(insight.ctr),
-            "cpc": float(insight.cpc),
-            "roi": float(insight.roi),
-            "engagement": {
-                "likes": insight.engagement_likes,
-                "shares": insight.engagement_shares,
-                "comments": insight.engagement_comments,
-            },
+            "bucket": bucket,
+            "bucketSeconds": int(stride.total_seconds()),
+            "points": points,
         }
+
+
+def _truncate(moment, bucket):
+    """Python equivalent of ``date_trunc(bucket, moment)`` in UTC."""
+    moment = moment.astimezone(timezone.utc).replace(
+        minute=0, second=0, microsecond=0
+    )
+    if bucket == "hour":
+        return moment
+    moment = moment.replace(hour=0)
+    if bucket == "day":
+        return moment
+    return moment - timedelta(days=moment.weekday())
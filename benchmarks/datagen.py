@@ -0,0 +1,348 @@
+"""Synthetic data generator: production-sized campaigns and insights.
+
+Builds on the ``seed.py`` templates (``SAMPLE_CAMPAIGNS``, ``STATUSES``,
+``PLATFORMS``) but at arbitrary volume, with skew that resembles real
+traffic:
+
+* status / platform follow fixed weights (mostly completed and active,
+  facebook and google dominate, twitter is rare);
+* start dates cluster towards the present (``--days`` of history);
+* snapshots per campaign are heavy-tailed (Pareto) around
+  ``--insights-per-campaign``; drafts have none, and no campaign gets more
+  than one snapshot per hour of its lifetime;
+* snapshot metrics are drawn per campaign (reach, CTR, CPC) and vary
+  around those per snapshot.
+
+Work is split into shards of ``--shard-size`` campaigns.  Each shard is
+generated from its own ``random.Random`` seeded with ``(seed, shard)``, so
+the data depends only on ``--seed`` and the sizes -- not on ``--workers``
+or scheduling.  Shards are generated in parallel processes, each loading
+its rows with ``COPY`` on its own connection and committing per shard.
+
+The ``campaign_summary`` insert trigger is disabled for the load: each
+shard's ``COPY`` would otherwise upsert (and row-lock until commit) the
+same few ``(status, platform)`` rows, so the shards would run one at a
+time.  The summary is rebuilt once at the end.
+
+Usage::
+
+    python -m benchmarks.datagen --campaigns 5000000 \\
+        --insights-per-campaign 100 --workers 8 --truncate --defer-indexes
+"""
+
+import argparse
+import csv
+import io
+import math
+import multiprocessing
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import psycopg2
+
+from app import create_app
+from app.services.dashboard_service import DashboardService
+from seed import PLATFORMS, SAMPLE_CAMPAIGNS, STATUSES
+
+# Relative weights, aligned with seed.STATUSES / seed.PLATFORMS.
+STATUS_WEIGHTS = (35, 15, 40, 10)
+PLATFORM_WEIGHTS = (34, 28, 20, 12, 6)
+REGIONS = (
+    "NYC", "London", "Berlin", "Tokyo", "São Paulo", "Sydney", "Toronto",
+    "Mumbai", "Paris", "Lagos", "Madrid", "Seoul", "Chicago", "Dubai",
+)
+AUDIENCE_SUFFIXES = (
+    "mobile first", "returning customers", "high intent", "lookalike",
+    "newsletter subscribers", "students", "premium tier",
+)
+# Pareto shape for snapshots per campaign (lower = heavier tail).
+INSIGHT_TAIL = 2.5
+# Insight rows buffered per COPY round trip.
+COPY_CHUNK_ROWS = 100_000
+# Maintains campaign_summary per statement; disabled during the load.
+SUMMARY_TRIGGER = "campaigns_summary_insert"
+
+CAMPAIGN_COLUMNS = (
+    "id", "name", "status", "platform", "budget", "start_date", "end_date",
+    "description", "target_audience", "created_at", "updated_at",
+)
+INSIGHT_COLUMNS = (
+    "campaign_id", "captured_at", "impressions", "clicks", "conversions",
+    "ctr", "cpc", "roi", "engagement_likes", "engagement_shares",
+    "engagement_comments",
+)
+_COPY_CAMPAIGNS = (
+    f"COPY campaigns ({', '.join(CAMPAIGN_COLUMNS)}) "
+    "FROM STDIN WITH (FORMAT csv)"
+)
+_COPY_INSIGHTS = (
+    f"COPY campaign_insights ({', '.join(INSIGHT_COLUMNS)}) "
+    "FROM STDIN WITH (FORMAT csv)"
+)
+
+
+# ---------------------------------------------------------------------------
+# Generation
+# ---------------------------------------------------------------------------
+def generate_shard(
+    seed, shard, first, count, insights_per_campaign, days, now
+):
+    """Generate campaigns ``first`` .. ``first + count - 1`` (shard ``shard``).
+
+    Returns:
+        tuple: (list of campaign CSV rows, generator of insight CSV lines).
+        Insight lines are produced lazily so a shard's snapshots never
+        have to fit in memory at once.
+    """
+    rng = random.Random(f"{seed}:{shard}")
+    campaigns = []
+    plans = []
+
+    for index in range(count):
+        sample = rng.choice(SAMPLE_CAMPAIGNS)
+        status = rng.choices(STATUSES, STATUS_WEIGHTS)[0]
+        platform = rng.choices(PLATFORMS, PLATFORM_WEIGHTS)[0]
+        campaign_id = uuid.UUID(bytes=rng.randbytes(16), version=4)
+
+        # Recent campaigns are more common than old ones.
+        start = now - timedelta(days=days * rng.random() ** 2)
+        end = start + timedelta(days=rng.randint(14, 180))
+        created = start - timedelta(days=rng.randint(0, 14))
+        updated = created + (now - created) * rng.random()
+        budget = min(5_000_000, max(100, rng.lognormvariate(8.5, 1.0)))
+
+        campaigns.append(
+            (
+                campaign_id,
+                f"{sample['name']} – {rng.choice(REGIONS)} "
+                f"{first + index}",
+                status,
+                platform,
+                f"{budget:.2f}",
+                start.date().isoformat(),
+                end.date().isoformat(),
+                sample["description"],
+                f"{sample['target_audience']}, "
+                f"{rng.choice(AUDIENCE_SUFFIXES)}",
+                created.isoformat(),
+                updated.isoformat(),
+            )
+        )
+
+        if status == "draft" or insights_per_campaign <= 0:
+            continue
+        span = (min(end, now) - start).total_seconds()
+        scale = insights_per_campaign * (INSIGHT_TAIL - 1) / INSIGHT_TAIL
+        snapshots = min(
+            int(scale * rng.paretovariate(INSIGHT_TAIL)), int(span // 3600)
+        )
+        if snapshots > 0:
+            plans.append((campaign_id, start, span, snapshots))
+
+    insight_seed = rng.getrandbits(64)
+    return campaigns, _insight_lines(insight_seed, plans)
+
+
+def _insight_lines(seed, plans):
+    """Yield insight CSV lines (numeric values only, so no quoting)."""
+    rng = random.Random(seed)
+    for campaign_id, start, span, snapshots in plans:
+        reach = rng.lognormvariate(9.5, 1.2)
+        base_ctr = rng.uniform(0.005, 0.08)
+        base_cpc = rng.uniform(0.10, 8.00)
+        conversion_rate = rng.uniform(0.01, 0.2)
+        base_roi = rng.gauss(80, 120)
+        step = span / snapshots
+
+        for i in range(snapshots):
+            # One snapshot per step, jittered inside it: timestamps are
+            # strictly increasing, hence unique per campaign.
+            captured = start + timedelta(
+                seconds=(i + rng.random() * 0.9) * step
+            )
+            impressions = int(reach * rng.uniform(0.5, 1.5))
+            ctr_draw = min(1, base_ctr * rng.uniform(0.8, 1.2))
+            clicks = int(impressions * ctr_draw)
+            ctr = round(clicks * 100 / impressions, 2) if impressions else 0
+            roi = min(999_999, max(-999_999, base_roi + rng.gauss(0, 20)))
+            yield (
+                f"{campaign_id},{captured.isoformat()},{impressions},"
+                f"{clicks},{int(clicks * conversion_rate)},{ctr:.2f},"
+                f"{base_cpc * rng.uniform(0.8, 1.2):.2f},{roi:.2f},"
+                f"{int(impressions * rng.uniform(0.001, 0.02))},"
+                f"{int(impressions * rng.uniform(0.0001, 0.004))},"
+                f"{int(impressions * rng.uniform(0.0001, 0.002))}\n"
+            )
+
+
+# ---------------------------------------------------------------------------
+# Loading
+# ---------------------------------------------------------------------------
+def load_shard(task):
+    """Generate shard ``task["shard"]`` and ``COPY`` it in one transaction.
+
+    Returns:
+        tuple: (campaigns loaded, insights loaded).
+    """
+    campaigns, lines = generate_shard(
+        task["seed"],
+        task["shard"],
+        task["first"],
+        task["count"],
+        task["insights_per_campaign"],
+        task["days"],
+        task["now"],
+    )
+    connection = psycopg2.connect(task["dsn"], options=task["options"])
+    try:
+        with connection, connection.cursor() as cursor:
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(campaigns)
+            buffer.seek(0)
+            cursor.copy_expert(_COPY_CAMPAIGNS, buffer)
+
+            inserted = 0
+            chunk = []
+            for line in lines:
+                chunk.append(line)
+                if len(chunk) >= COPY_CHUNK_ROWS:
+                    inserted += _copy_lines(cursor, chunk)
+                    chunk = []
+            if chunk:
+                inserted += _copy_lines(cursor, chunk)
+    finally:
+        connection.close()
+    return len(campaigns), inserted
+
+
+def _copy_lines(cursor, lines):
+    cursor.copy_expert(_COPY_INSIGHTS, io.StringIO("".join(lines)))
+    return len(lines)
+
+
+def _secondary_indexes(cursor):
+    """``(name, definition)`` of the non-constraint indexes on both tables."""
+    cursor.execute(
+        """
+        SELECT i.indexname, i.indexdef
+        FROM pg_indexes i
+        WHERE i.schemaname = current_schema()
+          AND i.tablename IN ('campaigns', 'campaign_insights')
+          AND NOT EXISTS (
+            SELECT 1 FROM pg_constraint c WHERE c.conname = i.indexname
+          )
+        ORDER BY i.indexname
+        """
+    )
+    return cursor.fetchall()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--campaigns", type=int, default=100_000)
+    parser.add_argument(
+        "--insights-per-campaign",
+        type=float,
+        default=10,
+        help="Mean snapshots per non-draft campaign.",
+    )
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--shard-size", type=int, default=10_000)
+    parser.add_argument(
+        "--workers", type=int, default=multiprocessing.cpu_count()
+    )
+    parser.add_argument(
+        "--now",
+        default="2025-06-01T00:00:00+00:00",
+        help="Reference 'now' (fixed by default so runs are reproducible).",
+    )
+    parser.add_argument("--config", default="development")
+    parser.add_argument(
+        "--truncate",
+        action="store_true",
+        help="Delete existing campaigns and insights first.",
+    )
+    parser.add_argument(
+        "--defer-indexes",
+        action="store_true",
+        help="Drop secondary indexes during the load and rebuild them after.",
+    )
+    args = parser.parse_args(argv)
+
+    app = create_app(args.config)
+    dsn = app.config["SQLALCHEMY_DATABASE_URI"]
+    engine_options = app.config["SQLALCHEMY_ENGINE_OPTIONS"]
+    options = engine_options["connect_args"]["options"]
+    now = datetime.fromisoformat(args.now).astimezone(timezone.utc)
+
+    shards = math.ceil(args.campaigns / args.shard_size)
+    tasks = [
+        {
+            "dsn": dsn,
+            "options": options,
+            "seed": args.seed,
+            "shard": shard,
+            "first": shard * args.shard_size,
+            "count": min(
+                args.shard_size, args.campaigns - shard * args.shard_size
+            ),
+            "insights_per_campaign": args.insights_per_campaign,
+            "days": args.days,
+            "now": now,
+        }
+        for shard in range(shards)
+    ]
+
+    admin = psycopg2.connect(dsn, options=options)
+    admin.autocommit = True
+    cursor = admin.cursor()
+    if args.truncate:
+        cursor.execute("TRUNCATE campaigns CASCADE")
+    deferred = _secondary_indexes(cursor) if args.defer_indexes else []
+    for name, _ in deferred:
+        cursor.execute(f'DROP INDEX "{name}"')
+    cursor.execute(f"ALTER TABLE campaigns DISABLE TRIGGER {SUMMARY_TRIGGER}")
+
+    started = time.perf_counter()
+    loaded_campaigns = loaded_insights = 0
+    try:
+        with multiprocessing.Pool(args.workers) as pool:
+            for done, (campaigns, insights) in enumerate(
+                pool.imap_unordered(load_shard, tasks), 1
+            ):
+                loaded_campaigns += campaigns
+                loaded_insights += insights
+                rate = (loaded_campaigns + loaded_insights) / (
+                    time.perf_counter() - started
+                )
+                print(
+                    f"  shard {done}/{shards}: {loaded_campaigns} campaigns, "
+                    f"{loaded_insights} insights ({rate:,.0f} rows/s)",
+                    flush=True,
+                )
+    finally:
+        cursor.execute(
+            f"ALTER TABLE campaigns ENABLE TRIGGER {SUMMARY_TRIGGER}"
+        )
+        with app.app_context():
+            summary_rows = DashboardService.rebuild_summary()
+        print(f"  rebuilt campaign_summary ({summary_rows} rows)", flush=True)
+        for name, definition in deferred:
+            print(f"  rebuilding {name}", flush=True)
+            cursor.execute(definition)
+    cursor.execute("ANALYZE campaigns")
+    cursor.execute("ANALYZE campaign_insights")
+    admin.close()
+
+    print(
+        f"✓ Loaded {loaded_campaigns} campaigns and {loaded_insights} "
+        f"insights in {time.perf_counter() - started:.1f} s "
+        f"(seed {args.seed})."
+    )
+
+
+if __name__ == "__main__":
+    main()
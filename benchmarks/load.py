@@ -0,0 +1,763 @@
+"""HTTP load test: throughput and p50/p95/p99 latency per endpoint.
+
+Boots ``create_app`` under gunicorn (as in production, see README) against
+the configured database (``DATABASE_URL``), drives every operation in
+``openapi.yaml`` from ``--concurrency`` client threads with a weighted
+request mix, and writes a JSON report.  ``--url`` targets an already
+running server instead.
+
+Reproducibility:
+
+* ``--campaigns`` pins the dataset size; the run refuses to start on a
+  database of a different size unless ``--prepare`` regenerates it with
+  :mod:`benchmarks.datagen` (same ``--seed``, so the same data).
+  ``--prepare`` truncates the tables and is refused under the default
+  (production) config; name the benchmark database's config explicitly.
+* Request parameters are drawn from a fixed sample of campaign ids with a
+  per-client ``random.Random(seed, client)``.
+* Writes only touch campaigns created by the run, which are deleted at the
+  end, so the dataset is unchanged afterwards.
+
+Every ``openapi.yaml`` operation must have a scenario below; the suite
+refuses to run otherwise, so new endpoints cannot silently go unmeasured.
+The monitoring endpoints (``OPS_OPERATIONS``) are the only exception.
+
+Usage::
+
+    python -m benchmarks.load run --campaigns 200000 --prepare \\
+        --config development --concurrency 16 --duration 60 --output load.json
+    python -m benchmarks.load run --mix list=50,get=50 --baseline base.json
+    python -m benchmarks.load compare load.json base.json --threshold 0.1
+"""
+
+import argparse
+import collections
+import http.client
+import json
+import math
+import os
+import platform
+import random
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app import create_app
+from app.extensions import db
+from seed import PLATFORMS, SAMPLE_CAMPAIGNS, STATUSES
+
+OPENAPI_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "openapi.yaml"
+)
+# Campaign ids sampled from the dataset to parameterise requests.
+SAMPLE_SIZE = 2_000
+# Rows per POST /campaigns/batch and POST /insights/ingest request.
+BATCH_ITEMS = 50
+INGEST_ROWS = 100
+# Matches the datagen default --now, so series windows contain data.
+SERIES_END = datetime(2025, 6, 1, tzinfo=timezone.utc)
+PERCENTILES = (50, 95, 99)
+# Operations-tagged endpoints: per-process counters and the Prometheus
+# scrape, not API traffic, so check_coverage does not require scenarios.
+OPS_OPERATIONS = frozenset({"GET /cache/stats", "GET /metrics"})
+
+Request = collections.namedtuple(
+    "Request", "method path body content_type on_response", defaults=(None,) * 3
+)
+
+
+# ---------------------------------------------------------------------------
+# Scenarios
+# ---------------------------------------------------------------------------
+class Client:
+    """One load-generating thread: a keep-alive connection, its own RNG
+    and the campaigns it created (so writes never race other clients)."""
+
+    def __init__(self, host, port, seed, index, sample):
+        self.host = host
+        self.port = port
+        self.rng = random.Random(f"{seed}:{index}")
+        self.sample = sample
+        self.created = []
+        self.ingested = 0
+        self.connection = None
+
+    def send(self, request):
+        """Send ``request``; return (status, body bytes, seconds)."""
+        headers = {}
+        body = request.body
+        if body is not None and not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+        if body is not None:
+            headers["Content-Type"] = request.content_type or "application/json"
+        started = time.perf_counter()
+        try:
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(
+                    self.host, self.port, timeout=120
+                )
+            self.connection.request(
+                request.method, request.path, body=body, headers=headers
+            )
+            response = self.connection.getresponse()
+            payload = response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            self.close()
+            payload, status = b"", 0
+        elapsed = time.perf_counter() - started
+        if request.on_response is not None and 0 < status < 400:
+            request.on_response(self, status, payload)
+        return status, payload, elapsed
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def own_campaign(self):
+        """A campaign created by this client (created untimed if needed);
+        None if that create failed."""
+        if not self.created:
+            self.send(create_campaign(self))
+        return self.created[-1] if self.created else None
+
+    def remember(self, _client, _status, payload):
+        self.created.append(json.loads(payload)["id"])
+
+    def remember_batch(self, _client, _status, payload):
+        self.created.extend(c["id"] for c in json.loads(payload)["created"])
+
+
+def _campaign_payload(client):
+    sample = client.rng.choice(SAMPLE_CAMPAIGNS)
+    return {
+        "name": f"{sample['name']} load {client.rng.getrandbits(32):08x}",
+        "status": client.rng.choice(STATUSES),
+        "platform": client.rng.choice(PLATFORMS),
+        "budget": round(client.rng.uniform(100, 50_000), 2),
+        "startDate": "2025-06-01",
+        "endDate": "2025-08-31",
+        "description": sample["description"],
+        "targetAudience": sample["target_audience"],
+    }
+
+
+def _query(path, **params):
+    return f"{path}?{urllib.parse.urlencode(params)}" if params else path
+
+
+def list_campaigns(client):
+    params = {"limit": 20}
+    roll = client.rng.random()
+    if roll < 0.3:
+        params["status"] = client.rng.choice(STATUSES)
+    elif roll < 0.5:
+        params["platform"] = client.rng.choice(PLATFORMS)
+    elif roll < 0.7:
+        params["search"] = client.rng.choice(SAMPLE_CAMPAIGNS)["name"].split()[0]
+    return Request("GET", _query("/api/campaigns", **params))
+
+
+def suggest_campaigns(client):
+    name = client.rng.choice(SAMPLE_CAMPAIGNS)["name"]
+    prefix = name[: client.rng.randint(2, 6)]
+    return Request("GET", _query("/api/campaigns/suggest", q=prefix))
+
+
+def get_campaign(client):
+    campaign_id = client.rng.choice(client.sample["campaigns"])
+    return Request("GET", f"/api/campaigns/{campaign_id}")
+
+
+def get_campaign_insights(client):
+    campaign_id = client.rng.choice(client.sample["with_insights"])
+    return Request("GET", f"/api/campaigns/{campaign_id}/insights")
+
+
+def get_insight_series(client):
+    campaign_id = client.rng.choice(client.sample["with_insights"])
+    path = _query(
+        f"/api/campaigns/{campaign_id}/insights/series",
+        **{
+            "from": (SERIES_END - timedelta(days=90)).isoformat(),
+            "to": SERIES_END.isoformat(),
+            "bucket": "day",
+        },
+    )
+    return Request("GET", path)
+
+
+def latest_insights_get(client):
+    ids = _sample_campaigns(client, 20)
+    return Request("GET", _query("/api/insights/latest", ids=",".join(ids)))
+
+
+def latest_insights_post(client):
+    ids = _sample_campaigns(client, 100)
+    return Request("POST", "/api/insights/latest", {"campaignIds": ids})
+
+
+def _sample_campaigns(client, count):
+    """Up to ``count`` distinct sampled ids (fewer on a small dataset)."""
+    campaigns = client.sample["campaigns"]
+    return client.rng.sample(campaigns, min(len(campaigns), count))
+
+
+def dashboard_metrics(client):
+    return Request("GET", "/api/dashboard/metrics")
+
+
+def create_campaign(client):
+    return Request(
+        "POST",
+        "/api/campaigns",
+        _campaign_payload(client),
+        on_response=client.remember,
+    )
+
+
+def create_campaigns_batch(client):
+    items = [_campaign_payload(client) for _ in range(BATCH_ITEMS)]
+    return Request(
+        "POST",
+        "/api/campaigns/batch",
+        items,
+        on_response=client.remember_batch,
+    )
+
+
+def update_campaign(client):
+    campaign_id = client.own_campaign()
+    if campaign_id is None:
+        return None
+    body = {"budget": round(client.rng.uniform(100, 50_000), 2)}
+    return Request("PATCH", f"/api/campaigns/{campaign_id}", body)
+
+
+def delete_campaign(client):
+    if client.own_campaign() is None:
+        return None
+    return Request("DELETE", f"/api/campaigns/{client.created.pop()}")
+
+
+def ingest_insights(client):
+    campaign_id = client.own_campaign()
+    if campaign_id is None:
+        return None
+    lines = []
+    for _ in range(INGEST_ROWS):
+        client.ingested += 1
+        captured = SERIES_END + timedelta(minutes=client.ingested)
+        impressions = client.rng.randint(1_000, 100_000)
+        row = {
+            "campaignId": campaign_id,
+            "capturedAt": captured.isoformat(),
+            "impressions": impressions,
+            "clicks": impressions // 50,
+            "conversions": impressions // 500,
+            "cpc": 1.25,
+            "roi": 42.5,
+            "engagementLikes": impressions // 100,
+            "engagementShares": impressions // 1_000,
+            "engagementComments": impressions // 2_000,
+        }
+        lines.append(json.dumps(row))
+    body = ("\n".join(lines) + "\n").encode()
+    return Request(
+        "POST", "/api/insights/ingest", body, "application/x-ndjson"
+    )
+
+
+def export_campaigns(client):
+    name = client.rng.choice(client.sample["names"])
+    path = _query("/api/campaigns/export", format="ndjson", search=name)
+    return Request("GET", path)
+
+
+def export_insights(client):
+    campaign_id = client.rng.choice(client.sample["with_insights"])
+    path = _query("/api/insights/export", format="csv", campaignId=campaign_id)
+    return Request("GET", path)
+
+
+Scenario = collections.namedtuple("Scenario", "operation weight build")
+
+# name -> (openapi operation, default weight, request builder); a builder
+# returns None when it cannot build its request (its setup create failed),
+# which is counted as an error with status 0.
+SCENARIOS = {
+    "list": Scenario("GET /campaigns", 25, list_campaigns),
+    "suggest": Scenario("GET /campaigns/suggest", 10, suggest_campaigns),
+    "get": Scenario("GET /campaigns/{id}", 20, get_campaign),
+    "insights": Scenario(
+        "GET /campaigns/{id}/insights", 10, get_campaign_insights
+    ),
+    "series": Scenario(
+        "GET /campaigns/{id}/insights/series", 5, get_insight_series
+    ),
+    "latest_get": Scenario("GET /insights/latest", 5, latest_insights_get),
+    "latest_post": Scenario("POST /insights/latest", 5, latest_insights_post),
+    "dashboard": Scenario("GET /dashboard/metrics", 5, dashboard_metrics),
+    "create": Scenario("POST /campaigns", 4, create_campaign),
+    "update": Scenario("PATCH /campaigns/{id}", 3, update_campaign),
+    "delete": Scenario("DELETE /campaigns/{id}", 3, delete_campaign),
+    "batch": Scenario("POST /campaigns/batch", 1, create_campaigns_batch),
+    "ingest": Scenario("POST /insights/ingest", 1, ingest_insights),
+    "export_campaigns": Scenario("GET /campaigns/export", 1, export_campaigns),
+    "export_insights": Scenario("GET /insights/export", 1, export_insights),
+}
+
+
+def openapi_operations(path=OPENAPI_PATH):
+    """Return the set of ``"METHOD /path"`` operations in ``openapi.yaml``.
+
+    A line-based scan of the ``paths`` section is enough for this file and
+    avoids a YAML dependency.
+    """
+    operations = set()
+    in_paths = False
+    current = None
+    with open(path, encoding="utf-8") as spec:
+        for line in spec:
+            if re.match(r"^\S", line):
+                in_paths = line.startswith("paths:")
+                continue
+            match = re.match(r"^  (/\S*):\s*$", line)
+            if in_paths and match:
+                current = match.group(1)
+                continue
+            match = re.match(r"^    (get|post|put|patch|delete):", line)
+            if in_paths and current and match:
+                operations.add(f"{match.group(1).upper()} {current}")
+    return operations
+
+
+def check_coverage():
+    """Raise SystemExit if an openapi API operation has no scenario."""
+    covered = {scenario.operation for scenario in SCENARIOS.values()}
+    missing = openapi_operations() - covered - OPS_OPERATIONS
+    if missing:
+        raise SystemExit(
+            "No load scenario for: " + ", ".join(sorted(missing))
+        )
+
+
+def parse_mix(text):
+    """``"list=50,get=50"`` -> weights (scenarios not named get 0)."""
+    if not text:
+        return {name: s.weight for name, s in SCENARIOS.items()}
+    mix = dict.fromkeys(SCENARIOS, 0)
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in SCENARIOS:
+            raise SystemExit(
+                f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}"
+            )
+        mix[name] = float(weight or 1)
+    return mix
+
+
+# ---------------------------------------------------------------------------
+# Dataset and server
+# ---------------------------------------------------------------------------
+def prepare_dataset(args):
+    """Check (or regenerate) the dataset; return (sizes, id sample).
+
+    ``--prepare`` truncates the tables, so it is refused under the
+    production config (the default): the database must be named with an
+    explicit non-production ``--config``.
+    """
+    if args.prepare and args.config == "production":
+        raise SystemExit(
+            "--prepare truncates campaigns and insights; refusing under the "
+            "production config. Pass --config development (with "
+            "DATABASE_URL set to the benchmark database)."
+        )
+    app = create_app(args.config)
+    with app.app_context():
+        campaigns = db.session.scalar(db.text("SELECT count(*) FROM campaigns"))
+        if args.campaigns is not None and campaigns != args.campaigns:
+            if not args.prepare:
+                raise SystemExit(
+                    f"Database has {campaigns} campaigns, expected "
+                    f"{args.campaigns}; rerun with --prepare to regenerate."
+                )
+            db.session.remove()
+            from benchmarks import datagen
+
+            datagen.main(
+                [
+                    "--campaigns", str(args.campaigns),
+                    "--insights-per-campaign", str(args.insights_per_campaign),
+                    "--seed", str(args.seed),
+                    "--config", args.config,
+                    "--truncate",
+                ]
+            )
+            campaigns = args.campaigns
+
+        insights = db.session.scalar(
+            db.text("SELECT count(*) FROM campaign_insights")
+        )
+        rows = db.session.execute(
+            db.text(
+                """
+                SELECT c.id::text, c.name, EXISTS (
+                  SELECT 1 FROM campaign_insights i WHERE i.campaign_id = c.id
+                )
+                FROM campaigns c
+                ORDER BY c.id
+                LIMIT :limit
+                """
+            ),
+            {"limit": SAMPLE_SIZE},
+        ).all()
+        db.session.remove()
+
+    if not rows or not any(has for _, _, has in rows):
+        raise SystemExit("The dataset needs campaigns with insights.")
+    sample = {
+        "campaigns": [campaign_id for campaign_id, _, _ in rows],
+        "names": [name for _, name, _ in rows],
+        "with_insights": [campaign_id for campaign_id, _, has in rows if has],
+    }
+    return {"campaigns": campaigns, "insights": insights}, sample
+
+
+def _free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def start_server(args):
+    """Start gunicorn on a free port; return (process, host, port)."""
+    port = _free_port()
+    log = open(args.server_log or os.devnull, "ab")  # noqa: SIM115
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "gunicorn",
+            f"app:create_app({args.config!r})",
+            "--bind", f"127.0.0.1:{port}",
+            "--workers", str(args.workers),
+            "--log-level", "warning",
+        ],
+        stdout=log,
+        stderr=log,
+    )
+    log.close()
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit("gunicorn exited during startup")
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            connection.request("GET", "/api/health")
+            if connection.getresponse().status == 200:
+                return process, "127.0.0.1", port
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise SystemExit("gunicorn did not become healthy within 30 s")
+
+
+# ---------------------------------------------------------------------------
+# Running and reporting
+# ---------------------------------------------------------------------------
+def percentile(ordered, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def summarize(latencies, errors, elapsed):
+    ordered = sorted(latencies)
+    summary = {
+        "requests": len(ordered),
+        "errors": errors,
+        "throughput_rps": round(len(ordered) / elapsed, 2),
+    }
+    for pct in PERCENTILES:
+        value = percentile(ordered, pct) * 1000 if ordered else None
+        summary[f"p{pct}_ms"] = None if value is None else round(value, 3)
+    return summary
+
+
+def run_load(host, port, sample, mix, args):
+    """Run the mix; return (per-scenario results, measured seconds)."""
+    names = [name for name, weight in mix.items() if weight > 0]
+    weights = [mix[name] for name in names]
+    latencies = collections.defaultdict(list)
+    errors = collections.Counter()
+    statuses = collections.defaultdict(collections.Counter)
+    lock = threading.Lock()
+    measure_from = time.perf_counter() + args.warmup
+    deadline = measure_from + args.duration
+
+    def worker(index):
+        client = Client(host, port, args.seed, index, sample)
+        local = collections.defaultdict(list)
+        local_errors = collections.Counter()
+        local_statuses = collections.defaultdict(collections.Counter)
+        try:
+            while True:
+                started = time.perf_counter()
+                if started >= deadline:
+                    break
+                name = client.rng.choices(names, weights)[0]
+                request = SCENARIOS[name].build(client)
+                if request is None:
+                    if started >= measure_from:
+                        local_statuses[name][0] += 1
+                        local_errors[name] += 1
+                    continue
+                status, _, elapsed = client.send(request)
+                if started < measure_from:
+                    continue
+                local[name].append(elapsed)
+                local_statuses[name][status] += 1
+                if status == 0 or status >= 400:
+                    local_errors[name] += 1
+        finally:
+            while client.created:  # leave the dataset as we found it
+                client.send(
+                    Request("DELETE", f"/api/campaigns/{client.created.pop()}")
+                )
+            client.close()
+        with lock:
+            for name, values in local.items():
+                latencies[name].extend(values)
+                statuses[name].update(local_statuses[name])
+            errors.update(local_errors)
+
+    threads = [
+        threading.Thread(target=worker, args=(index,), daemon=True)
+        for index in range(args.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    results = {}
+    for name in names:
+        summary = summarize(latencies[name], errors[name], args.duration)
+        summary["operation"] = SCENARIOS[name].operation
+        summary["status_counts"] = {
+            str(code): count for code, count in sorted(statuses[name].items())
+        }
+        results[name] = summary
+    every = [value for values in latencies.values() for value in values]
+    total = summarize(every, sum(errors.values()), args.duration)
+    return results, total
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report):
+    print(
+        f"  {'scenario':<17} {'requests':>8} {'err':>5} {'rps':>8} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    rows = list(report["endpoints"].items()) + [("total", report["total"])]
+    for name, result in rows:
+        cells = [
+            "-" if result[f"p{pct}_ms"] is None else f"{result[f'p{pct}_ms']:.2f}"
+            for pct in PERCENTILES
+        ]
+        print(
+            f"  {name:<17} {result['requests']:>8} {result['errors']:>5} "
+            f"{result['throughput_rps']:>8.1f} "
+            + " ".join(f"{cell:>8}" for cell in cells)
+        )
+
+
+def compare(report, baseline, threshold, min_delta_ms):
+    """Return human-readable regressions of ``report`` against ``baseline``.
+
+    A latency percentile regresses when it is more than ``threshold``
+    (relative) *and* ``min_delta_ms`` (absolute) slower; throughput when it
+    drops by more than ``threshold``; errors whenever the error rate grows.
+    """
+    regressions = []
+    for key in ("dataset", "concurrency", "workers", "mix"):
+        if report["meta"].get(key) != baseline["meta"].get(key):
+            print(f"  warning: {key} differs from the baseline")
+
+    for name, current in report["endpoints"].items():
+        before = baseline["endpoints"].get(name)
+        if before is None or not before["requests"] or not current["requests"]:
+            continue
+        for pct in PERCENTILES:
+            key = f"p{pct}_ms"
+            old, new = before[key], current[key]
+            if new > old * (1 + threshold) and new - old > min_delta_ms:
+                regressions.append(
+                    f"{name}: {key} {old:.2f} -> {new:.2f} "
+                    f"(+{(new / old - 1) * 100:.0f}%)"
+                )
+        old, new = before["throughput_rps"], current["throughput_rps"]
+        if new < old * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {old:.1f} -> {new:.1f} rps "
+                f"({(new / old - 1) * 100:.0f}%)"
+            )
+        old_rate = before["errors"] / before["requests"]
+        new_rate = current["errors"] / current["requests"]
+        if new_rate > old_rate:
+            regressions.append(
+                f"{name}: error rate {old_rate:.2%} -> {new_rate:.2%}"
+            )
+    return regressions
+
+
+def _report_regressions(report, baseline, args):
+    regressions = compare(report, baseline, args.threshold, args.min_delta_ms)
+    if not regressions:
+        print("✓ No regressions against the baseline.")
+        return 0
+    print(f"✗ {len(regressions)} regression(s) against the baseline:")
+    for line in regressions:
+        print(f"  {line}")
+    return 1
+
+
+def _load_report(path):
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def cmd_run(args):
+    check_coverage()
+    mix = parse_mix(args.mix)
+    dataset, sample = prepare_dataset(args)
+
+    process = None
+    if args.url:
+        target = urllib.parse.urlsplit(args.url)
+        host, port = target.hostname, target.port or 80
+    else:
+        process, host, port = start_server(args)
+    try:
+        print(
+            f"{args.concurrency} clients, {args.duration:g} s "
+            f"(+{args.warmup:g} s warm-up), {dataset['campaigns']} campaigns"
+        )
+        endpoints, total = run_load(host, port, sample, mix, args)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    report = {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "run_id": str(uuid.uuid4()),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "server": args.url or f"gunicorn --workers {args.workers}",
+            "workers": None if args.url else args.workers,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "seed": args.seed,
+            "dataset": dataset,
+            "mix": {name: weight for name, weight in mix.items() if weight},
+        },
+        "total": total,
+        "endpoints": endpoints,
+    }
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+            handle.write("\n")
+        print(f"Report written to {args.output}")
+    if args.baseline:
+        return _report_regressions(report, _load_report(args.baseline), args)
+    return 0
+
+
+def cmd_compare(args):
+    return _report_regressions(
+        _load_report(args.report), _load_report(args.baseline), args
+    )
+
+
+def _add_threshold_options(parser):
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Relative slowdown that counts as a regression (default 0.10).",
+    )
+    parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=1.0,
+        help="Ignore latency changes smaller than this (noise floor).",
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the load test.")
+    run.add_argument("--config", default="production")
+    run.add_argument(
+        "--campaigns",
+        type=int,
+        help="Required dataset size (checked before the run).",
+    )
+    run.add_argument(
+        "--prepare",
+        action="store_true",
+        help="Regenerate the dataset with benchmarks.datagen if its size "
+        "differs from --campaigns (truncates the tables; not allowed with "
+        "the production config).",
+    )
+    run.add_argument("--insights-per-campaign", type=float, default=10)
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--url", help="Target a running server instead.")
+    run.add_argument("--workers", type=int, default=4)
+    run.add_argument("--server-log", help="Append gunicorn output here.")
+    run.add_argument("--concurrency", type=int, default=8)
+    run.add_argument("--duration", type=float, default=30)
+    run.add_argument("--warmup", type=float, default=5)
+    run.add_argument(
+        "--mix",
+        help="Scenario weights, e.g. list=50,get=50 (default: "
+        + ",".join(f"{n}={s.weight}" for n, s in SCENARIOS.items())
+        + ")",
+    )
+    run.add_argument("--output", help="Write the JSON report here.")
+    run.add_argument("--baseline", help="Compare against this report.")
+    _add_threshold_options(run)
+    run.set_defaults(handler=cmd_run)
+
+    diff = commands.add_parser("compare", help="Compare two reports.")
+    diff.add_argument("report")
+    diff.add_argument("baseline")
+    _add_threshold_options(diff)
+    diff.set_defaults(handler=cmd_compare)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,421 @@
+"""Query plan regression suite for the service-layer queries.
+
+Calls ``CampaignService``, ``DashboardService`` and ``InsightService``
+methods for each query shape below against the configured database
+(``DATABASE_URL``), captures the SQL they send (``before_cursor_execute``)
+and runs it again under ``EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)`` in the
+same transaction.  Each shape is then checked:
+
+* no ``Seq Scan`` on ``campaigns`` once the table has more than
+  ``--seq-scan-rows`` rows (unless the shape reads the whole table by
+  design);
+* the indexes the shape is expected to use appear in its plans;
+* shared buffers touched (hit + read, summed over the shape's statements)
+  stay under the shape's ceiling.
+
+Plans are reduced to an indented tree of node types, relations, indexes
+and join types (no costs or timings), so a ``--baseline`` from an
+earlier ``--output`` shows a unified diff of any plan that changed.  The
+run exits 1 on a failed check or a changed plan.
+
+The tables are ``ANALYZE``d first so plans depend on the data, not on
+when autovacuum last ran.  As in :mod:`benchmarks.load`, ``--campaigns``
+pins the dataset size and ``--prepare`` regenerates it with
+:mod:`benchmarks.datagen` (not under the default production config).
+
+Usage::
+
+    python -m benchmarks.plans --campaigns 200000 --prepare \\
+        --config development --output plans.json
+    python -m benchmarks.plans --baseline plans.json [--filter list]
+"""
+
+import argparse
+import contextlib
+import difflib
+import json
+import sys
+import uuid
+from dataclasses import dataclass
+from datetime import timedelta
+
+from sqlalchemy import event
+
+from app import create_app
+from app.extensions import cache, db
+from app.services.campaign_service import CampaignService
+from app.services.dashboard_service import DashboardService
+from app.services.insight_service import InsightService
+from benchmarks.load import SERIES_END, prepare_dataset
+from seed import SAMPLE_CAMPAIGNS
+
+# Campaign ids passed to get_latest_insights (LATEST_INSIGHTS_MAX_IDS).
+LATEST_IDS = 200
+# A word in ~10% of campaign names (datagen reuses the seed templates) and
+# one in none, which the planner should take to the trigram indexes.  (Not
+# to the full-text index: datagen's ~100-word vocabulary makes the planner
+# expect any unknown word in 0.5% of rows.)
+SEARCH_TERM = SAMPLE_CAMPAIGNS[0]["name"].split()[0].lower()
+RARE_TERM = "quasar"
+
+
+@dataclass
+class Shape:
+    """A service call plus what its plans must satisfy."""
+
+    call: object
+    indexes: tuple = ()
+    max_buffers: int = 1_000
+    # The shape reads every campaign (whole-table counts).
+    seq_scan_ok: bool = False
+
+
+def _page(**params):
+    return lambda sample: CampaignService.list_campaigns(
+        limit=50, count="none", **params
+    )
+
+
+def _cursor_page(sample):
+    first = CampaignService.list_campaigns(limit=50, count="none")
+    last = first.items[-1]
+    return CampaignService.list_campaigns(
+        limit=50, count="none", cursor=(last.updated_at, last.id)
+    )
+
+
+def _ids(sample, size=LATEST_IDS):
+    return [uuid.UUID(i) for i in sample["campaigns"][:size]]
+
+
+SHAPES = {
+    "campaigns.list": Shape(
+        _page(), indexes=("campaigns_updated_at_id_idx",), max_buffers=100
+    ),
+    "campaigns.list.cursor": Shape(
+        _cursor_page,
+        indexes=("campaigns_updated_at_id_idx",),
+        max_buffers=200,
+    ),
+    "campaigns.list.status": Shape(
+        _page(status="paused"),
+        indexes=("campaigns_updated_at_id_idx",),
+        max_buffers=500,
+    ),
+    "campaigns.list.platform": Shape(
+        _page(platform="twitter"),
+        indexes=("campaigns_updated_at_id_idx",),
+        max_buffers=1_500,
+    ),
+    # Common terms fill a page early in updated_at order.
+    "campaigns.list.search": Shape(
+        _page(search=SEARCH_TERM),
+        indexes=("campaigns_updated_at_id_idx",),
+        max_buffers=2_000,
+    ),
+    "campaigns.list.search.rare": Shape(
+        _page(search=RARE_TERM),
+        indexes=(
+            "campaigns_name_trgm_idx",
+            "campaigns_desc_trgm_idx",
+            "campaigns_audience_trgm_idx",
+        ),
+        max_buffers=500,
+    ),
+    "campaigns.list.fulltext": Shape(
+        _page(search=SEARCH_TERM, search_mode="fulltext"),
+        indexes=("campaigns_updated_at_id_idx",),
+        max_buffers=2_000,
+    ),
+    # Every match is ranked: one trigram-index branch per column, then a
+    # campaigns_pkey lookup per match (~20k for a term in 10% of rows).
+    "campaigns.list.relevance": Shape(
+        _page(search=SEARCH_TERM, sort="relevance"),
+        indexes=(
+            "campaigns_name_trgm_idx",
+            "campaigns_desc_trgm_idx",
+            "campaigns_audience_trgm_idx",
+            "campaigns_pkey",
+        ),
+        max_buffers=120_000,
+    ),
+    "campaigns.list.include": Shape(
+        _page(include="latestInsight"),
+        indexes=(
+            "campaigns_updated_at_id_idx",
+            "campaign_insights_campaign_time_idx",
+        ),
+        max_buffers=500,
+    ),
+    # Exact count of every row (the list default); count=estimate avoids it.
+    "campaigns.count": Shape(
+        lambda sample: CampaignService.list_campaigns(limit=1),
+        seq_scan_ok=True,
+        max_buffers=20_000,
+    ),
+    "campaigns.suggest": Shape(
+        lambda sample: CampaignService.suggest_campaigns(SEARCH_TERM[:3]),
+        indexes=("campaigns_name_prefix_idx",),
+        max_buffers=50,
+    ),
+    # No name starts with it, ~10% contain it: every match is ranked.
+    "campaigns.suggest.contains": Shape(
+        lambda sample: CampaignService.suggest_campaigns("ale 20"),
+        indexes=("campaigns_name_prefix_idx", "campaigns_name_trgm_idx"),
+        max_buffers=15_000,
+    ),
+    "campaigns.get": Shape(
+        lambda sample: CampaignService.get_campaign(_ids(sample, 1)[0]),
+        indexes=("campaigns_pkey",),
+        max_buffers=10,
+    ),
+    "dashboard.metrics": Shape(
+        lambda sample: DashboardService.get_metrics(), max_buffers=10
+    ),
+    "insights.campaign": Shape(
+        lambda sample: InsightService.get_campaign_insights(
+            sample["with_insights"][0]
+        ),
+        indexes=("campaign_insights_campaign_time_idx",),
+        max_buffers=10,
+    ),
+    "insights.latest": Shape(
+        lambda sample: InsightService.get_latest_insights(_ids(sample)),
+        indexes=("campaigns_pkey", "campaign_insights_campaign_time_idx"),
+        max_buffers=2_000,
+    ),
+    "insights.series": Shape(
+        lambda sample: InsightService.get_insight_series(
+            sample["with_insights"][0],
+            SERIES_END - timedelta(days=365),
+            SERIES_END,
+        ),
+        indexes=("campaign_insights_campaign_time_idx",),
+        max_buffers=200,
+    ),
+}
+
+
+# ---------------------------------------------------------------------------
+# Capture
+# ---------------------------------------------------------------------------
+@contextlib.contextmanager
+def captured_statements(engine):
+    """Collect ``(statement, parameters)`` executed inside the block."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def explain_shape(shape, sample):
+    """Run ``shape`` and return the EXPLAIN ANALYZE plan of each statement.
+
+    The call runs twice (the first warms the buffer cache), then every
+    captured statement is explained in the same transaction, so settings
+    such as the similarity threshold still apply.
+    """
+    shape.call(sample)
+    cache.clear()
+    with captured_statements(db.engine) as statements:
+        shape.call(sample)
+    connection = db.session.connection()
+    plans = []
+    for statement, parameters in statements:
+        if statement.lstrip().upper().startswith("EXPLAIN"):
+            continue  # count=estimate's own EXPLAIN
+        plan = connection.exec_driver_sql(
+            f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}",
+            parameters,
+        ).scalar()
+        plans.append(plan[0])
+    db.session.rollback()
+    cache.clear()
+    return plans
+
+
+# ---------------------------------------------------------------------------
+# Plan summaries
+# ---------------------------------------------------------------------------
+def _nodes(node):
+    yield node
+    for child in node.get("Plans", ()):
+        yield from _nodes(child)
+
+
+def plan_tree(node, depth=0):
+    """Indented lines describing the plan shape (no costs or timings)."""
+    label = node["Node Type"]
+    if node.get("Join Type") and "Join" not in label:
+        label += f" ({node['Join Type']})"
+    elif node.get("Join Type", "Inner") != "Inner":
+        label = label.replace("Join", f"{node['Join Type']} Join")
+    if node.get("Scan Direction") == "Backward":
+        label += " Backward"
+    if "Index Name" in node:
+        label += f" using {node['Index Name']}"
+    if "Relation Name" in node:
+        label += f" on {node['Relation Name']}"
+    if "Subplan Name" in node:
+        label = f"{node['Subplan Name']}: {label}"
+    lines = ["  " * depth + label]
+    for child in node.get("Plans", ()):
+        lines.extend(plan_tree(child, depth + 1))
+    return lines
+
+
+def summarize(plans):
+    """Plan tree, indexes, seq-scanned tables and totals for one shape."""
+    tree, indexes, seq_scans = [], set(), set()
+    buffers = 0
+    execution_ms = 0.0
+    for number, plan in enumerate(plans, 1):
+        root = plan["Plan"]
+        if len(plans) > 1:
+            tree.append(f"-- statement {number}")
+        tree.extend(plan_tree(root))
+        for node in _nodes(root):
+            if "Index Name" in node:
+                indexes.add(node["Index Name"])
+            if node["Node Type"] == "Seq Scan":
+                seq_scans.add(node["Relation Name"])
+        buffers += root.get("Shared Hit Blocks", 0)
+        buffers += root.get("Shared Read Blocks", 0)
+        execution_ms += plan["Execution Time"]
+    return {
+        "plan": tree,
+        "indexes": sorted(indexes),
+        "seq_scans": sorted(seq_scans),
+        "buffers": buffers,
+        "execution_ms": round(execution_ms, 3),
+    }
+
+
+def check(shape, summary, campaigns, seq_scan_rows):
+    """Return the failed checks for one shape."""
+    failures = []
+    if (
+        "campaigns" in summary["seq_scans"]
+        and campaigns > seq_scan_rows
+        and not shape.seq_scan_ok
+    ):
+        failures.append(f"Seq Scan on campaigns ({campaigns:,} rows)")
+    missing = set(shape.indexes) - set(summary["indexes"])
+    if missing:
+        failures.append(
+            f"expected index not used: {', '.join(sorted(missing))}"
+        )
+    if summary["buffers"] > shape.max_buffers:
+        failures.append(
+            f"{summary['buffers']:,} buffers > ceiling {shape.max_buffers:,}"
+        )
+    return failures
+
+
+def plan_diff(name, baseline, summary):
+    """Unified diff of a shape's plan tree against the baseline."""
+    return list(
+        difflib.unified_diff(
+            baseline["plan"],
+            summary["plan"],
+            fromfile=f"{name} (baseline)",
+            tofile=f"{name} (current)",
+            lineterm="",
+        )
+    )
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default="production")
+    parser.add_argument(
+        "--campaigns",
+        type=int,
+        help="Required dataset size (checked before the run).",
+    )
+    parser.add_argument(
+        "--prepare",
+        action="store_true",
+        help="Regenerate the dataset with benchmarks.datagen if its size "
+        "differs from --campaigns (truncates the tables; not allowed with "
+        "the production config).",
+    )
+    parser.add_argument("--insights-per-campaign", type=float, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--seq-scan-rows",
+        type=int,
+        default=10_000,
+        help="Fail on a Seq Scan of campaigns above this many rows.",
+    )
+    parser.add_argument("--filter", help="Only run shapes containing this.")
+    parser.add_argument("--verbose", action="store_true", help="Print plans.")
+    parser.add_argument("--output", help="Write the plans as JSON here.")
+    parser.add_argument("--baseline", help="Diff against this --output.")
+    args = parser.parse_args(argv)
+
+    dataset, sample = prepare_dataset(args)
+    shapes = {
+        name: shape
+        for name, shape in SHAPES.items()
+        if not args.filter or args.filter in name
+    }
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)["shapes"]
+
+    app = create_app(args.config)
+    results, failed, changed = {}, 0, 0
+    with app.app_context():
+        db.session.execute(db.text("ANALYZE campaigns, campaign_insights"))
+        db.session.commit()
+        for name, shape in shapes.items():
+            summary = summarize(explain_shape(shape, sample))
+            results[name] = summary
+            failures = check(
+                shape, summary, dataset["campaigns"], args.seq_scan_rows
+            )
+            diff = []
+            if name in baseline:
+                diff = plan_diff(name, baseline[name], summary)
+            status = "FAIL" if failures else "changed" if diff else "ok"
+            print(
+                f"  {name:<28} {status:<8} {summary['buffers']:>8,} buf "
+                f"{summary['execution_ms']:>9.2f} ms  "
+                + ", ".join(summary["indexes"] or ["-"])
+            )
+            for failure in failures:
+                print(f"      {failure}")
+            if args.verbose and not diff:
+                print("\n".join(f"      {line}" for line in summary["plan"]))
+            if diff:
+                print("\n".join(f"      {line}" for line in diff))
+            failed += bool(failures)
+            changed += bool(diff)
+        db.session.remove()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(
+                {"meta": {"dataset": dataset}, "shapes": results},
+                handle,
+                indent=2,
+            )
+            handle.write("\n")
+
+    print(f"{len(results)} shapes: {failed} failed, {changed} plans changed")
+    return 1 if failed or changed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
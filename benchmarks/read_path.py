@@ -0,0 +1,99 @@
+"""Benchmark: campaign reads through the ORM vs the Core read path.
+
+Runs each case against the configured database (``DATABASE_URL``) once
+per simulated request -- a fresh session every time, as in the app -- and
+reports per-request latency (median / p95) and the peak Python memory
+allocated while building the response body (``tracemalloc``):
+
+* orm  -- ``Campaign.query`` / ``session.get`` + the ORM dumpers; every
+  row becomes a mapped instance tracked by the identity map.
+* core -- ``CampaignService`` reads (``select()`` over columns, Rows)
+  + the Row dumpers.
+
+The database needs at least ``--rows`` campaigns.
+
+Usage::
+
+    python -m benchmarks.read_path [--rows 100] [--requests 200]
+"""
+
+import argparse
+import statistics
+import time
+import tracemalloc
+
+from app import create_app
+from app.extensions import db
+from app.models.campaign import Campaign
+from app.schemas import dump_campaign, dump_campaign_rows, dump_campaigns
+from app.services.campaign_service import CampaignService
+
+
+def measure(fn, requests):
+    """Return (latencies in ms, peak allocation in KiB) for ``fn``."""
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - started) * 1000)
+        db.session.remove()
+
+    peaks = []
+    for _ in range(min(requests, 20)):
+        tracemalloc.start()
+        fn()
+        peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+        tracemalloc.stop()
+        db.session.remove()
+    return latencies, statistics.median(peaks)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--config", default="development")
+    args = parser.parse_args(argv)
+
+    app = create_app(args.config)
+    with app.app_context():
+        campaign_id = db.session.scalar(
+            db.select(Campaign.id).order_by(Campaign.updated_at.desc())
+        )
+        db.session.remove()
+
+        ordering = (Campaign.updated_at.desc(), Campaign.id.desc())
+        cases = {
+            f"list {args.rows}: orm": lambda: dump_campaigns(
+                Campaign.query.order_by(*ordering).limit(args.rows).all()
+            ),
+            f"list {args.rows}: core": lambda: dump_campaign_rows(
+                CampaignService.list_campaigns(
+                    limit=args.rows, count="none"
+                ).items
+            ),
+            "get: orm": lambda: dump_campaign(
+                db.session.get(Campaign, campaign_id)
+            ),
+            "get: core": lambda: dump_campaign_rows(
+                [CampaignService.get_campaign(campaign_id)]
+            ),
+        }
+
+        for fn in cases.values():  # warm up pools and compiled caches
+            fn()
+            db.session.remove()
+
+        print(f"{args.requests} requests per case")
+        print(f"  {'case':<18} {'p50 ms':>8} {'p95 ms':>8} {'peak KiB':>9}")
+        for name, fn in cases.items():
+            latencies, peak = measure(fn, args.requests)
+            p95 = statistics.quantiles(latencies, n=20)[-1]
+            print(
+                f"  {name:<18} {statistics.median(latencies):8.2f} "
+                f"{p95:8.2f} {peak:9.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Micro-benchmark: campaign list serialisation, marshmallow vs fast path.
+
+Measures building a list response body for ``--rows`` campaigns (the
+``limit=100`` list page by default) two ways:
+
+* baseline -- ``CampaignSchema(many=True).dump`` + Flask's stdlib provider
+* fast     -- :func:`app.schemas.fast.dump_campaigns` + ``FastJSONProvider``
+
+No database is needed; campaigns are transient ORM objects.
+
+Usage::
+
+    python -m benchmarks.serialization [--rows 100] [--repeat 7]
+"""
+
+import argparse
+import timeit
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.json_provider import FastJSONProvider
+from app.models.campaign import Campaign
+from app.schemas import CampaignSchema, dump_campaigns
+
+
+def make_campaigns(rows):
+    """Build ``rows`` transient campaigns with realistic field values."""
+    now = datetime(2025, 6, 1, tzinfo=timezone.utc)
+    return [
+        Campaign(
+            id=uuid.uuid4(),
+            name=f"Campaign {i} summer promotion",
+            status="active",
+            platform="instagram",
+            budget=Decimal(f"{1000 + i}.50"),
+            start_date=date(2025, 6, 1),
+            end_date=date(2025, 8, 31),
+            description="Seasonal push for the new collection " * 3,
+            target_audience="Adults 25-45 interested in outdoor sports",
+            created_at=now - timedelta(days=i),
+            updated_at=now - timedelta(hours=i),
+        )
+        for i in range(rows)
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    app = Flask(__name__)
+    stdlib = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+    schema = CampaignSchema(many=True)
+    campaigns = make_campaigns(args.rows)
+
+    def baseline():
+        return stdlib.response(schema.dump(campaigns)).get_data()
+
+    def fast_path():
+        return fast.response(dump_campaigns(campaigns)).get_data()
+
+    body = dump_campaigns(campaigns)
+    assert baseline() == fast_path(), "fast path output differs"
+
+    with app.app_context():
+        cases = {
+            "dump: marshmallow": lambda: schema.dump(campaigns),
+            "dump: compiled": lambda: dump_campaigns(campaigns),
+            "encode: stdlib json": lambda: stdlib.response(body),
+            "encode: orjson": lambda: fast.response(body),
+            "total: baseline": baseline,
+            "total: fast": fast_path,
+        }
+        results = {}
+        for name, fn in cases.items():
+            best = min(
+                timeit.repeat(fn, repeat=args.repeat, number=args.number)
+            )
+            results[name] = best / args.number * 1e6
+
+    print(f"{args.rows} campaigns, best of {args.repeat} x {args.number}")
+    for name, micros in results.items():
+        print(f"  {name:<22} {micros:10.1f} us")
+    speedup = results["total: baseline"] / results["total: fast"]
+    print(f"  speedup (total)        {speedup:10.1f} x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""Micro-benchmark: request validation, response dumps and error formatting.
+
+Times every schema in ``app/schemas/campaign.py`` the way the controllers
+use it -- the module-level instances loading a JSON body or
+``request.args`` (an ``ImmutableMultiDict``), ``many=True`` dumps -- on
+valid and invalid inputs of realistic size, plus the validation error
+path: ``format_validation_errors`` and the registered
+``MarshmallowValidationError`` handler rendering the 400 body.
+
+Per case it reports calls per second (best of ``--repeat`` timeit runs)
+and the peak memory allocated during one call (``tracemalloc``, bytes),
+which tracks the transient garbage a call creates.  No database is needed.
+
+Usage::
+
+    python -m benchmarks.validation [--repeat 5] [--output validation.json]
+    python -m benchmarks.validation --filter create
+"""
+
+import argparse
+import json
+import timeit
+import tracemalloc
+import uuid
+from datetime import datetime, timezone
+
+from marshmallow import ValidationError
+from werkzeug.datastructures import ImmutableMultiDict
+
+from app import create_app
+from app.middleware.error_handler import format_validation_errors
+from app.schemas import (
+    CampaignBatchQuerySchema,
+    CampaignCreateSchema,
+    CampaignExportQuerySchema,
+    CampaignGetQuerySchema,
+    CampaignInsightSchema,
+    CampaignListQuerySchema,
+    CampaignSchema,
+    CampaignSuggestQuerySchema,
+    CampaignUpdateSchema,
+    InsightExportQuerySchema,
+    InsightSeriesQuerySchema,
+    LatestInsightsRequestSchema,
+    dump_campaigns,
+    dump_insights,
+    encode_cursor,
+)
+from benchmarks.serialization import make_campaigns
+
+# Sizes mirror the defaults: list pages of 50, BATCH_MAX_SIZE / 10 items,
+# LATEST_INSIGHTS_MAX_IDS campaign ids.
+LIST_ROWS = 50
+BATCH_ITEMS = 100
+LATEST_IDS = 200
+
+
+def create_payload(index=0):
+    return {
+        "name": f"Summer Sale {index} – new collection",
+        "status": "active",
+        "platform": "instagram",
+        "budget": 12_500.5,
+        "startDate": "2025-06-01",
+        "endDate": "2025-08-31",
+        "description": "Seasonal push for the new outdoor collection. " * 8,
+        "targetAudience": "Adults 25-45 interested in outdoor sports",
+    }
+
+
+INVALID_CREATE = {
+    "name": "",
+    "status": "archived",
+    "platform": "myspace",
+    "budget": -5,
+    "startDate": "2025-09-01",
+    "endDate": "not-a-date",
+    "targetAudience": "Adults",
+    "colour": "red",
+}
+
+
+def _args(**params):
+    return ImmutableMultiDict(params)
+
+
+def _load(schema, data):
+    return lambda: schema.load(data)
+
+
+def _rejects(schema, data):
+    """A call that must raise ValidationError (and return its messages)."""
+
+    def call():
+        try:
+            schema.load(data)
+        except ValidationError as exc:
+            return exc.messages
+        raise AssertionError("expected a ValidationError")
+
+    return call
+
+
+def build_cases(app):
+    """Return ``{name: callable}``, grouped by the request path they model."""
+    create = CampaignCreateSchema()
+    update = CampaignUpdateSchema()
+    list_query = CampaignListQuerySchema()
+    campaigns_schema = CampaignSchema(many=True)
+    insight_schema = CampaignInsightSchema()
+    now = datetime(2025, 6, 1, tzinfo=timezone.utc)
+    cursor = encode_cursor(now, uuid.UUID(int=7))
+    ids = [str(uuid.UUID(int=i)) for i in range(LATEST_IDS)]
+    batch = [create_payload(i) for i in range(BATCH_ITEMS)]
+    invalid_batch = [
+        INVALID_CREATE if i % 10 == 0 else item for i, item in enumerate(batch)
+    ]
+    campaigns = make_campaigns(LIST_ROWS)
+    invalid_messages = _rejects(create, INVALID_CREATE)()
+
+    def load_batch(items):
+        # Mirrors create_campaigns_batch: per-item load, errors by index.
+        def call():
+            rows, errors = [], []
+            for index, item in enumerate(items):
+                try:
+                    rows.append(create.load(item))
+                except ValidationError as exc:
+                    details = format_validation_errors(exc.messages)
+                    errors.append({"index": index, "details": details})
+            return rows, errors
+
+        return call
+
+    handler = app._find_error_handler(ValidationError(invalid_messages), [])
+
+    def render_error():
+        with app.test_request_context():
+            response, status = handler(ValidationError(invalid_messages))
+            return response.get_data(), status
+
+    insight = {
+        "impressions": 120_000,
+        "clicks": 2_400,
+        "conversions": 96,
+        "ctr": 2.0,
+        "cpc": 1.25,
+        "roi": 42.5,
+        "engagement": {"likes": 900, "shares": 120, "comments": 45},
+    }
+
+    return {
+        "create: valid": _load(create, create_payload()),
+        "create: invalid": _rejects(create, INVALID_CREATE),
+        "update: valid": _load(update, {"budget": 99.5, "status": "paused"}),
+        "update: invalid": _rejects(update, {"budget": "x", "name": ""}),
+        f"batch {BATCH_ITEMS}: valid": load_batch(batch),
+        f"batch {BATCH_ITEMS}: 10% invalid": load_batch(invalid_batch),
+        "list args: default": _load(list_query, _args()),
+        "list args: filtered": _load(
+            list_query,
+            _args(
+                search="summer",
+                status="active",
+                platform="google",
+                limit="20",
+                cursor=cursor,
+                fields="id,name,status,budget,updatedAt",
+            ),
+        ),
+        "list args: invalid": _rejects(
+            list_query,
+            _args(limit="0", status="archived", cursor="%%%", fields="nope"),
+        ),
+        "get args: fields": _load(
+            CampaignGetQuerySchema(), _args(fields="id,name,budget")
+        ),
+        "suggest args": _load(
+            CampaignSuggestQuerySchema(), _args(q="  Summer  Sa ", limit="8")
+        ),
+        "batch args": _load(CampaignBatchQuerySchema(), _args(atomic="true")),
+        "series args": _load(
+            InsightSeriesQuerySchema(),
+            _args(**{"from": "2025-03-01T00:00Z", "to": "2025-06-01T00:00Z"}),
+        ),
+        "export args: campaigns": _load(
+            CampaignExportQuerySchema(), _args(format="csv", status="active")
+        ),
+        "export args: insights": _load(
+            InsightExportQuerySchema(),
+            _args(format="parquet", include="campaign", platform="google"),
+        ),
+        f"latest body {LATEST_IDS} ids: valid": _load(
+            LatestInsightsRequestSchema(), {"campaignIds": ids}
+        ),
+        f"latest body {LATEST_IDS} ids: invalid": _rejects(
+            LatestInsightsRequestSchema(),
+            {"campaignIds": ids[:-1] + ["not-a-uuid"]},
+        ),
+        f"dump {LIST_ROWS}: marshmallow": lambda: campaigns_schema.dump(
+            campaigns
+        ),
+        f"dump {LIST_ROWS}: compiled": lambda: dump_campaigns(campaigns),
+        "dump insights: marshmallow": lambda: insight_schema.dump(insight),
+        "dump insights: compiled": lambda: dump_insights(insight),
+        "error: format details": lambda: format_validation_errors(
+            invalid_messages
+        ),
+        "error: 400 response": render_error,
+    }
+
+
+def peak_allocation(fn):
+    """Peak bytes allocated while running ``fn`` once."""
+    fn()  # warm caches first so they are not attributed to the call
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        fn()
+        return tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+
+def measure(fn, repeat):
+    """Return calls per second (best of ``repeat`` runs of >= 0.2 s)."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return number / best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", help="Only run cases containing this.")
+    parser.add_argument("--output", help="Write results as JSON here.")
+    args = parser.parse_args(argv)
+
+    app = create_app("testing")
+    cases = build_cases(app)
+    if args.filter:
+        cases = {k: v for k, v in cases.items() if args.filter in k}
+
+    results = {}
+    print(f"  {'case':<32} {'ops/s':>12} {'us/op':>10} {'peak B':>10}")
+    for name, fn in cases.items():
+        ops = measure(fn, args.repeat)
+        peak = peak_allocation(fn)
+        results[name] = {"ops_per_sec": round(ops, 1), "peak_bytes": peak}
+        print(f"  {name:<32} {ops:12,.0f} {1e6 / ops:10.1f} {peak:10,}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+            handle.write("\n")
+
+
+if __name__ == "__main__":
+    main()
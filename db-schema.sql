@@ -50,7 +50,10 @@ EXECUTE FUNCTION set_updated_at();
 CREATE INDEX IF NOT EXISTS campaigns_status_idx ON campaigns (status);
 CREATE INDEX IF NOT EXISTS campaigns_platform_idx ON campaigns (platform);
 CREATE INDEX IF NOT EXISTS campaigns_dates_idx ON campaigns (start_date, end_date);
-CREATE INDEX IF NOT EXISTS campaigns_updated_at_idx ON campaigns (updated_at DESC);
+-- Keyset pagination: ORDER BY updated_at DESC, id DESC with a row-value seek
+DROP INDEX IF EXISTS campaigns_updated_at_idx;
+CREATE INDEX IF NOT EXISTS campaigns_updated_at_id_idx
+  ON campaigns (updated_at DESC, id DESC);
 
 -- Substring search for name/description/target_audience
 CREATE INDEX IF NOT EXISTS campaigns_name_trgm_idx
@@ -60,6 +63,23 @@ CREATE INDEX IF NOT EXISTS campaigns_desc_trgm_idx
 CREATE INDEX IF NOT EXISTS campaigns_audience_trgm_idx
   ON campaigns USING gin (lower(target_audience) gin_trgm_ops);
 
+-- Typeahead: lower(name) COLLATE "C" LIKE 'prefix%' becomes an index range
+-- that is already in ORDER BY order (text_pattern_ops cannot provide the
+-- ordering, so every prefix match would be sorted)
+CREATE INDEX IF NOT EXISTS campaigns_name_prefix_idx
+  ON campaigns ((lower(name) COLLATE "C"), id);
+
+-- Full-text search (searchMode=fulltext): weighted document, kept in sync
+-- by PostgreSQL as a stored generated column
+ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS search_vector tsvector
+  GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', name), 'A') ||
+    setweight(to_tsvector('english', description), 'B') ||
+    setweight(to_tsvector('english', target_audience), 'C')
+  ) STORED;
+CREATE INDEX IF NOT EXISTS campaigns_search_vector_idx
+  ON campaigns USING gin (search_vector);
+
 CREATE TABLE IF NOT EXISTS campaign_insights (
   id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
   campaign_id uuid NOT NULL REFERENCES campaigns(id) ON DELETE CASCADE,
@@ -77,3 +97,95 @@ CREATE TABLE IF NOT EXISTS campaign_insights (
 
 CREATE INDEX IF NOT EXISTS campaign_insights_campaign_time_idx
   ON campaign_insights (campaign_id, captured_at DESC);
+
+-- Dashboard rollup: one row per (status, platform), maintained by
+-- statement-level triggers so bulk writes pay one upsert per group rather
+-- than per row.  Rebuild from scratch with `flask summary rebuild`.
+CREATE TABLE IF NOT EXISTS campaign_summary (
+  status campaign_status NOT NULL,
+  platform platform NOT NULL,
+  campaign_count bigint NOT NULL DEFAULT 0,
+  total_budget numeric NOT NULL DEFAULT 0,
+  PRIMARY KEY (status, platform)
+);
+
+-- Backfill for databases that had campaigns before the rollup existed;
+-- groups already maintained by the triggers are left alone.
+INSERT INTO campaign_summary (status, platform, campaign_count, total_budget)
+SELECT status, platform, count(*), sum(budget)
+FROM campaigns
+GROUP BY 1, 2
+ON CONFLICT DO NOTHING;
+
+CREATE OR REPLACE FUNCTION campaign_summary_apply()
+RETURNS trigger AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    INSERT INTO campaign_summary AS s (status, platform, campaign_count, total_budget)
+    SELECT status, platform, count(*), sum(budget)
+    FROM new_rows
+    GROUP BY status, platform
+    ORDER BY status, platform
+    ON CONFLICT (status, platform) DO UPDATE
+      SET campaign_count = s.campaign_count + EXCLUDED.campaign_count,
+          total_budget = s.total_budget + EXCLUDED.total_budget;
+  ELSIF TG_OP = 'DELETE' THEN
+    INSERT INTO campaign_summary AS s (status, platform, campaign_count, total_budget)
+    SELECT status, platform, -count(*), -sum(budget)
+    FROM old_rows
+    GROUP BY status, platform
+    ORDER BY status, platform
+    ON CONFLICT (status, platform) DO UPDATE
+      SET campaign_count = s.campaign_count + EXCLUDED.campaign_count,
+          total_budget = s.total_budget + EXCLUDED.total_budget;
+  ELSE
+    -- Net delta per group; updates that leave status/platform/budget
+    -- untouched produce no rows and therefore no writes.
+    INSERT INTO campaign_summary AS s (status, platform, campaign_count, total_budget)
+    SELECT status, platform, sum(n), sum(b)
+    FROM (
+      SELECT status, platform, 1 AS n, budget AS b FROM new_rows
+      UNION ALL
+      SELECT status, platform, -1, -budget FROM old_rows
+    ) d
+    GROUP BY status, platform
+    HAVING sum(n) <> 0 OR sum(b) <> 0
+    ORDER BY status, platform
+    ON CONFLICT (status, platform) DO UPDATE
+      SET campaign_count = s.campaign_count + EXCLUDED.campaign_count,
+          total_budget = s.total_budget + EXCLUDED.total_budget;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION campaign_summary_truncate()
+RETURNS trigger AS $$
+BEGIN
+  TRUNCATE campaign_summary;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER campaigns_summary_insert
+AFTER INSERT ON campaigns
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION campaign_summary_apply();
+
+CREATE OR REPLACE TRIGGER campaigns_summary_update
+AFTER UPDATE ON campaigns
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION campaign_summary_apply();
+
+CREATE OR REPLACE TRIGGER campaigns_summary_delete
+AFTER DELETE ON campaigns
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION campaign_summary_apply();
+
+CREATE OR REPLACE TRIGGER campaigns_summary_truncate
+AFTER TRUNCATE ON campaigns
+FOR EACH STATEMENT
+EXECUTE FUNCTION campaign_summary_truncate();
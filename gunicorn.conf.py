@@ -0,0 +1,8 @@
+"""gunicorn settings, read from the working directory at startup."""
+
+
+def child_exit(server, worker):
+    """Drop the live metrics gauges of a worker that exited or was killed."""
+    from app.metrics import mark_process_dead
+
+    mark_process_dead(worker.pid)
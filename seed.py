@@ -13,6 +13,7 @@ from app import create_app
 from app.extensions import db
 from app.models.campaign import Campaign
 from app.models.campaign_insight import CampaignInsight
+from app.services.dashboard_service import DashboardService
 
 STATUSES = ["active", "paused", "completed", "draft"]
 PLATFORMS = ["facebook", "google", "instagram", "linkedin", "twitter"]
@@ -130,6 +131,11 @@ def seed():
         db.session.commit()
         print(f"✓ Seeded {len(campaigns)} campaigns with insights.")
 
+        # Tables created by create_all() have no rollup triggers; rebuilding
+        # keeps the dashboard correct either way.
+        DashboardService.rebuild_summary()
+        print("✓ Dashboard summary rebuilt.")
+
 
 if __name__ == "__main__":
     seed()
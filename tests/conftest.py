@@ -6,12 +6,33 @@ indexes exist.  Each test runs inside a rolled-back transaction to keep
 tests isolated without the overhead of recreating tables every time.
 """
 
+import atexit
+import contextlib
 import os
+import shutil
+import tempfile
 
 import pytest
 
-from app import create_app
-from app.extensions import db as _db
+# Metrics as under gunicorn (one file per process); prometheus_client
+# reads the directory when it is first imported.
+if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(
+        prefix="metrics-"
+    )
+    atexit.register(
+        shutil.rmtree,
+        os.environ["PROMETHEUS_MULTIPROC_DIR"],
+        ignore_errors=True,
+    )
+
+from app import create_app  # noqa: E402
+from app.extensions import cache  # noqa: E402
+from app.extensions import db as _db  # noqa: E402
+from app.middleware.query_audit import (  # noqa: E402
+    instrument_engine,
+    record_queries,
+)
 
 
 @pytest.fixture(scope="session")
@@ -49,6 +70,29 @@ def clean_tables(app):
         _db.session.execute(_db.text("DELETE FROM campaign_insights"))
         _db.session.execute(_db.text("DELETE FROM campaigns"))
         _db.session.commit()
+    cache.clear()
+
+
+@pytest.fixture()
+def query_budget(app):
+    """Fail if a block runs more SQL statements than allowed.
+
+    ``with query_budget(3): client.get("/api/campaigns")`` -- the failure
+    lists every statement.  The recorder is yielded for finer checks.
+    """
+    with app.app_context():
+        instrument_engine(_db.engine)
+
+    @contextlib.contextmanager
+    def check(max_queries):
+        with record_queries() as recorder:
+            yield recorder
+        assert recorder.count <= max_queries, (
+            f"{recorder.count} queries (budget {max_queries}):\n"
+            + recorder.report()
+        )
+
+    return check
 
 
 def make_campaign_payload(**overrides):
@@ -1,9 +1,12 @@
 """Tests for the Campaign API endpoints."""
 
+import base64
 import json
 
 import pytest
 
+from app.extensions import cache, db
+from app.services.campaign_service import CampaignService
 from tests.conftest import make_campaign_payload
 
 
@@ -19,6 +22,27 @@ def _post_campaign(client, **overrides):
     return resp
 
 
+def _ingest_snapshot(client, campaign_id, **overrides):
+    """Load one insight snapshot through the ingest endpoint."""
+    row = {
+        "campaignId": campaign_id,
+        "impressions": 200,
+        "clicks": 10,
+        "conversions": 1,
+        "cpc": 1.0,
+        "roi": 50.0,
+        "engagementLikes": 0,
+        "engagementShares": 0,
+        "engagementComments": 0,
+    }
+    row.update(overrides)
+    return client.post(
+        "/api/insights/ingest",
+        data=json.dumps(row),
+        content_type="application/x-ndjson",
+    )
+
+
 # ------------------------------------------------------------------ CREATE
 class TestCreateCampaign:
     def test_create_success(self, client):
@@ -69,6 +93,78 @@ class TestCreateCampaign:
         assert resp.status_code == 400
 
 
+# ------------------------------------------------------------------ BATCH
+class TestBatchCreateCampaigns:
+    def _post_batch(self, client, items, query=""):
+        return client.post(
+            f"/api/campaigns/batch{query}",
+            data=json.dumps(items),
+            content_type="application/json",
+        )
+
+    def test_batch_success(self, client):
+        items = [make_campaign_payload(name=f"Bulk {i}") for i in range(3)]
+        resp = self._post_batch(client, items)
+        assert resp.status_code == 201
+        body = resp.get_json()
+        assert [c["name"] for c in body["created"]] == [
+            "Bulk 0",
+            "Bulk 1",
+            "Bulk 2",
+        ]
+        assert body["errors"] == []
+        assert client.get("/api/campaigns").headers["X-Total-Count"] == "3"
+
+    def test_batch_partial_failure(self, client):
+        items = [
+            make_campaign_payload(name="Good"),
+            make_campaign_payload(budget=0),
+            make_campaign_payload(name="Also good"),
+        ]
+        resp = self._post_batch(client, items)
+        assert resp.status_code == 207
+        body = resp.get_json()
+        assert len(body["created"]) == 2
+        assert body["errors"][0]["index"] == 1
+        assert body["errors"][0]["details"][0]["field"] == "budget"
+
+    def test_batch_atomic_rejects_all(self, client):
+        items = [make_campaign_payload(), make_campaign_payload(status="x")]
+        resp = self._post_batch(client, items, "?atomic=true")
+        assert resp.status_code == 400
+        body = resp.get_json()
+        assert body["code"] == "validation_error"
+        assert body["details"][0]["field"] == "[1].status"
+        assert client.get("/api/campaigns").headers["X-Total-Count"] == "0"
+
+    def test_batch_ndjson(self, client):
+        lines = [
+            json.dumps(make_campaign_payload(name="Line 1")),
+            "{not json",
+            json.dumps(make_campaign_payload(name="Line 3")),
+        ]
+        resp = client.post(
+            "/api/campaigns/batch",
+            data="\n".join(lines),
+            content_type="application/x-ndjson",
+        )
+        assert resp.status_code == 207
+        body = resp.get_json()
+        assert len(body["created"]) == 2
+        assert body["errors"][0]["index"] == 1
+
+    def test_batch_too_large(self, app, client, monkeypatch):
+        monkeypatch.setitem(app.config, "BATCH_MAX_SIZE", 2)
+        items = [make_campaign_payload() for _ in range(3)]
+        resp = self._post_batch(client, items)
+        assert resp.status_code == 413
+        assert resp.get_json()["code"] == "batch_too_large"
+
+    def test_batch_requires_array(self, client):
+        resp = self._post_batch(client, make_campaign_payload())
+        assert resp.status_code == 400
+
+
 # ------------------------------------------------------------------ LIST
 class TestListCampaigns:
     def test_list_empty(self, client):
@@ -114,6 +210,82 @@ class TestListCampaigns:
         assert len(data) == 1
         assert data[0]["name"] == "Summer Sale"
 
+    def test_list_search_description_and_audience(self, client):
+        _post_campaign(client, name="A", description="Holiday promo push")
+        _post_campaign(client, name="B", targetAudience="Young families")
+        _post_campaign(client, name="C")
+
+        data = client.get("/api/campaigns?search=HOLIDAY").get_json()
+        assert [c["name"] for c in data] == ["A"]
+        data = client.get("/api/campaigns?search=famil").get_json()
+        assert [c["name"] for c in data] == ["B"]
+
+    def test_list_search_escapes_wildcards(self, client):
+        _post_campaign(client, name="100% Off")
+        _post_campaign(client, name="1000 Offers")
+
+        data = client.get("/api/campaigns?search=100%25").get_json()
+        assert [c["name"] for c in data] == ["100% Off"]
+
+    def test_list_sort_relevance(self, client):
+        _post_campaign(client, name="Summer Sale")
+        _post_campaign(client, name="Summer Splash Sale Weekend")
+        _post_campaign(client, name="Winter Promo")
+
+        resp = client.get("/api/campaigns?search=sumer sale&sort=relevance")
+        assert resp.status_code == 200
+        assert "X-Next-Cursor" not in resp.headers
+        names = [c["name"] for c in resp.get_json()]
+        assert names[0] == "Summer Sale"
+        assert "Winter Promo" not in names
+
+        # Without relevance the typo is a plain substring miss.
+        resp = client.get("/api/campaigns?search=sumer sale")
+        assert resp.get_json() == []
+
+    def test_list_sort_relevance_requires_search(self, client):
+        resp = client.get("/api/campaigns?sort=relevance")
+        assert resp.status_code == 400
+
+    def test_list_fulltext_search(self, client):
+        _post_campaign(
+            client, name="Holiday Promo", targetAudience="Young families"
+        )
+        _post_campaign(client, name="Holiday Clearance")
+        _post_campaign(client, name="Spring Launch")
+
+        resp = client.get(
+            "/api/campaigns?searchMode=fulltext&search=holiday promo family"
+        )
+        assert resp.status_code == 200
+        assert [c["name"] for c in resp.get_json()] == ["Holiday Promo"]
+
+        resp = client.get(
+            "/api/campaigns?searchMode=fulltext&search=holiday -promo"
+        )
+        assert [c["name"] for c in resp.get_json()] == ["Holiday Clearance"]
+
+    def test_list_fulltext_relevance_with_filter(self, client):
+        _post_campaign(
+            client, name="Launch", description="Summer launch summer deals",
+            status="active",
+        )
+        _post_campaign(client, name="Summer", status="active")
+        _post_campaign(client, name="Summer Draft", status="draft")
+
+        resp = client.get(
+            "/api/campaigns?searchMode=fulltext&search=summer"
+            "&sort=relevance&status=active&include=latestInsight"
+        )
+        assert resp.status_code == 200
+        names = [c["name"] for c in resp.get_json()]
+        assert names == ["Summer", "Launch"]
+        assert resp.headers["X-Total-Count"] == "2"
+
+    def test_list_invalid_search_mode(self, client):
+        resp = client.get("/api/campaigns?searchMode=regex&search=x")
+        assert resp.status_code == 400
+
     def test_list_pagination(self, client):
         for i in range(5):
             _post_campaign(client, name=f"Camp {i}")
@@ -126,6 +298,314 @@ class TestListCampaigns:
         resp = client.get("/api/campaigns?limit=999")
         assert resp.status_code == 400
 
+    def test_list_cursor_pagination(self, client):
+        for i in range(5):
+            _post_campaign(client, name=f"Camp {i}")
+
+        seen = []
+        url = "/api/campaigns?limit=2"
+        while True:
+            resp = client.get(url)
+            assert resp.status_code == 200
+            seen.extend(c["id"] for c in resp.get_json())
+            cursor = resp.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+            url = f"/api/campaigns?limit=2&cursor={cursor}"
+
+        assert len(seen) == 5
+        assert len(set(seen)) == 5
+
+    def test_list_cursor_with_filter(self, client):
+        for i in range(3):
+            _post_campaign(client, name=f"Active {i}", status="active")
+        _post_campaign(client, name="Draft", status="draft")
+
+        first = client.get("/api/campaigns?status=active&limit=2")
+        cursor = first.headers["X-Next-Cursor"]
+        resp = client.get(f"/api/campaigns?status=active&limit=2&cursor={cursor}")
+        data = resp.get_json()
+        assert len(data) == 1
+        assert data[0]["status"] == "active"
+        assert "X-Next-Cursor" not in resp.headers
+
+    def test_list_invalid_cursor(self, client):
+        resp = client.get("/api/campaigns?cursor=not-a-cursor")
+        assert resp.status_code == 400
+        assert resp.get_json()["code"] == "validation_error"
+
+    @pytest.mark.parametrize(
+        "key",
+        [["2025-01-01T00:00:00+00:00", 5], {"a": 1}, ["2025-01-01"], 7],
+    )
+    def test_list_malformed_cursor_key(self, client, key):
+        cursor = base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+        resp = client.get(f"/api/campaigns?cursor={cursor.rstrip('=')}")
+        assert resp.status_code == 400
+        assert resp.get_json()["code"] == "validation_error"
+
+    def test_list_cursor_with_offset_rejected(self, client):
+        _post_campaign(client)
+        _post_campaign(client)
+        cursor = client.get("/api/campaigns?limit=1").headers["X-Next-Cursor"]
+        resp = client.get(f"/api/campaigns?cursor={cursor}&offset=1")
+        assert resp.status_code == 400
+
+    def test_list_count_exact_by_default(self, client):
+        _post_campaign(client)
+        resp = client.get("/api/campaigns")
+        assert resp.headers.get("X-Total-Count") == "1"
+        assert resp.headers.get("X-Total-Count-Mode") == "exact"
+
+    def test_list_count_none(self, client):
+        _post_campaign(client)
+        resp = client.get("/api/campaigns?count=none")
+        assert resp.status_code == 200
+        assert len(resp.get_json()) == 1
+        assert "X-Total-Count" not in resp.headers
+        assert resp.headers.get("X-Total-Count-Mode") == "none"
+
+    def test_list_count_estimate_small_result_is_exact(self, client):
+        _post_campaign(client, status="active")
+        _post_campaign(client, status="draft")
+        resp = client.get("/api/campaigns?count=estimate&status=active")
+        assert resp.headers.get("X-Total-Count") == "1"
+        assert resp.headers.get("X-Total-Count-Mode") == "exact"
+
+    def test_list_count_estimate_uses_planner(self, app, client, monkeypatch):
+        monkeypatch.setitem(app.config, "COUNT_ESTIMATE_THRESHOLD", 0)
+        _post_campaign(client, status="active")
+        resp = client.get("/api/campaigns?count=estimate&status=active")
+        assert resp.status_code == 200
+        assert resp.headers.get("X-Total-Count-Mode") == "estimate"
+        assert int(resp.headers["X-Total-Count"]) >= 0
+
+    def test_list_conditional_not_modified(self, client):
+        _post_campaign(client)
+        etag = client.get("/api/campaigns").headers["ETag"]
+
+        resp = client.get("/api/campaigns", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.data == b""
+
+        other = client.get(
+            "/api/campaigns?status=draft", headers={"If-None-Match": etag}
+        )
+        assert other.status_code == 200
+
+    def test_list_conditional_after_create(self, client):
+        _post_campaign(client, name="First")
+        etag = client.get("/api/campaigns").headers["ETag"]
+
+        _post_campaign(client, name="Second")
+        resp = client.get("/api/campaigns", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert len(resp.get_json()) == 2
+
+    def test_list_invalid_count_mode(self, client):
+        resp = client.get("/api/campaigns?count=sometimes")
+        assert resp.status_code == 400
+
+    def test_list_include_latest_insight(self, client):
+        measured = _post_campaign(client, name="Measured").get_json()["id"]
+        _post_campaign(client, name="Fresh")
+        _ingest_snapshot(
+            client, measured, capturedAt="2025-06-01T00:00:00+00:00",
+            impressions=100,
+        )
+        _ingest_snapshot(
+            client, measured, capturedAt="2025-06-02T00:00:00+00:00",
+            impressions=200,
+        )
+
+        resp = client.get("/api/campaigns?include=latestInsight&limit=1")
+        assert resp.status_code == 200
+        body = resp.get_json()
+        assert [c["name"] for c in body] == ["Fresh"]
+        assert body[0]["latestInsight"]["impressions"] == 0
+
+        cursor = resp.headers["X-Next-Cursor"]
+        body = client.get(
+            f"/api/campaigns?include=latestInsight&cursor={cursor}"
+        ).get_json()
+        assert [c["name"] for c in body] == ["Measured"]
+        assert body[0]["latestInsight"]["impressions"] == 200
+        assert body[0]["latestInsight"]["ctr"] == 5.0
+
+    def test_list_without_include_has_no_insight(self, client):
+        _post_campaign(client)
+        body = client.get("/api/campaigns").get_json()
+        assert "latestInsight" not in body[0]
+
+    def test_list_include_etag_tracks_insights(self, client):
+        cid = _post_campaign(client).get_json()["id"]
+        url = "/api/campaigns?include=latestInsight"
+        etag = client.get(url).headers["ETag"]
+        resp = client.get(url, headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+
+        _ingest_snapshot(client, cid)
+        resp = client.get(url, headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+
+    def test_list_invalid_include(self, client):
+        resp = client.get("/api/campaigns?include=everything")
+        assert resp.status_code == 400
+
+    def test_list_sparse_fields(self, client, query_budget):
+        for i in range(3):
+            _post_campaign(client, name=f"Camp {i}")
+
+        with query_budget(1) as recorder:
+            resp = client.get(
+                "/api/campaigns?fields=name, id,budget&limit=2&count=none"
+            )
+        assert resp.status_code == 200
+        data = resp.get_json()
+        assert [set(c) for c in data] == [{"id", "name", "budget"}] * 2
+        assert resp.headers.get("X-Next-Cursor")
+        page_sql = recorder.statements[-1]
+        assert "campaigns.budget" in page_sql
+        assert "campaigns.description" not in page_sql
+
+        cursor = resp.headers["X-Next-Cursor"]
+        rest = client.get(
+            f"/api/campaigns?fields=name&cursor={cursor}"
+        ).get_json()
+        assert rest == [{"name": "Camp 0"}]
+
+    def test_list_skips_identity_map(self, app, client):
+        _post_campaign(client)
+        with app.app_context():
+            page = CampaignService.list_campaigns(include="latestInsight")
+            assert len(page.items) == 1
+            assert len(db.session.identity_map) == 0
+
+    def test_list_sparse_fields_with_include(self, client):
+        _post_campaign(client)
+        data = client.get(
+            "/api/campaigns?fields=status&include=latestInsight"
+        ).get_json()
+        assert set(data[0]) == {"status", "latestInsight"}
+
+    def test_list_sparse_fields_etag(self, client):
+        _post_campaign(client)
+        etag = client.get("/api/campaigns?fields=id").headers["ETag"]
+        resp = client.get("/api/campaigns", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+
+    def test_list_unknown_field(self, client):
+        resp = client.get("/api/campaigns?fields=id,secret,target_audience")
+        assert resp.status_code == 400
+        messages = " ".join(d["message"] for d in resp.get_json()["details"])
+        assert "secret" in messages
+        assert "target_audience" in messages
+
+
+# ------------------------------------------------------------------ SUGGEST
+class TestSuggestCampaigns:
+    def test_suggest_prefix_first(self, client):
+        _post_campaign(client, name="Best Summer Deals")
+        _post_campaign(client, name="Summer Sale", status="active")
+        _post_campaign(client, name="summit Launch")
+        _post_campaign(client, name="Winter Promo")
+
+        resp = client.get("/api/campaigns/suggest?q=  SUM ")
+        assert resp.status_code == 200
+        data = resp.get_json()
+        assert [s["name"] for s in data] == [
+            "Summer Sale",
+            "summit Launch",
+            "Best Summer Deals",
+        ]
+        assert set(data[0]) == {"id", "name", "status", "platform"}
+        assert data[0]["status"] == "active"
+
+    def test_suggest_short_prefix_skips_fuzzy(self, client):
+        _post_campaign(client, name="Best Summer Deals")
+        _post_campaign(client, name="Summer Sale")
+
+        data = client.get("/api/campaigns/suggest?q=su").get_json()
+        assert [s["name"] for s in data] == ["Summer Sale"]
+
+    def test_suggest_limit_cap(self, client):
+        for i in range(5):
+            _post_campaign(client, name=f"Promo {i}")
+
+        data = client.get("/api/campaigns/suggest?q=promo&limit=3").get_json()
+        assert [s["name"] for s in data] == ["Promo 0", "Promo 1", "Promo 2"]
+
+        resp = client.get("/api/campaigns/suggest?q=promo&limit=21")
+        assert resp.status_code == 400
+
+    def test_suggest_requires_query(self, client):
+        assert client.get("/api/campaigns/suggest").status_code == 400
+        assert client.get("/api/campaigns/suggest?q=%20").status_code == 400
+
+    def test_suggest_cache_invalidated_by_create(self, client):
+        _post_campaign(client, name="Alpha")
+        assert len(client.get("/api/campaigns/suggest?q=alp").get_json()) == 1
+        assert len(client.get("/api/campaigns/suggest?q=ALP").get_json()) == 1
+        assert cache.stats["hits"] >= 1
+
+        _post_campaign(client, name="Alpine")
+        assert len(client.get("/api/campaigns/suggest?q=alp").get_json()) == 2
+
+
+# ------------------------------------------------------------------ EXPORT
+@pytest.fixture()
+def small_export_batches(app, monkeypatch):
+    """Fetch two rows per export chunk so a stream spans several."""
+    monkeypatch.setitem(app.config, "EXPORT_BATCH_SIZE", 2)
+
+
+class TestExportCampaigns:
+    def test_export_ndjson_matches_list(self, client, small_export_batches):
+        for i in range(3):
+            _post_campaign(client, name=f"Camp {i}", status="active")
+        _post_campaign(client, name="Other", status="paused")
+
+        resp = client.get("/api/campaigns/export?status=active")
+        assert resp.status_code == 200
+        assert resp.mimetype == "application/x-ndjson"
+        exported = [json.loads(line) for line in resp.data.splitlines()]
+        listed = client.get("/api/campaigns?status=active").get_json()
+        assert sorted(exported, key=lambda c: c["id"]) == exported
+        assert sorted(listed, key=lambda c: c["id"]) == exported
+
+    def test_export_csv(self, client):
+        _post_campaign(client, name="Comma, quoted")
+        resp = client.get("/api/campaigns/export?format=csv&search=comma")
+        assert resp.mimetype == "text/csv"
+        assert "campaigns.csv" in resp.headers["Content-Disposition"]
+        lines = resp.data.decode().splitlines()
+        assert lines[0] == (
+            "id,name,status,platform,budget,startDate,endDate,description,"
+            "targetAudience,createdAt,updatedAt"
+        )
+        assert len(lines) == 2
+        assert '"Comma, quoted"' in lines[1]
+
+    def test_export_empty_csv_has_header(self, client):
+        resp = client.get("/api/campaigns/export?format=csv")
+        assert resp.data.decode().startswith("id,name,")
+        assert len(resp.data.decode().splitlines()) == 1
+
+    def test_unread_export_releases_connection(self, app, client):
+        _post_campaign(client)
+        with app.app_context():
+            in_use = db.engine.pool.checkedout()
+
+        resp = client.head("/api/campaigns/export")
+        assert resp.status_code == 200
+        resp.close()
+        with app.app_context():
+            assert db.engine.pool.checkedout() == in_use
+
+    def test_export_invalid_format(self, client):
+        resp = client.get("/api/campaigns/export?format=xml")
+        assert resp.status_code == 400
+
 
 # ------------------------------------------------------------------ GET
 class TestGetCampaign:
@@ -144,6 +624,61 @@ class TestGetCampaign:
         assert resp.status_code == 404
         assert resp.get_json()["code"] == "not_found"
 
+    def test_get_conditional_not_modified(self, client):
+        cid = _post_campaign(client).get_json()["id"]
+
+        first = client.get(f"/api/campaigns/{cid}")
+        etag = first.headers["ETag"]
+        resp = client.get(
+            f"/api/campaigns/{cid}", headers={"If-None-Match": etag}
+        )
+        assert resp.status_code == 304
+        assert resp.data == b""
+        assert resp.headers["ETag"] == etag
+
+    def test_get_conditional_after_update(self, client):
+        cid = _post_campaign(client).get_json()["id"]
+        etag = client.get(f"/api/campaigns/{cid}").headers["ETag"]
+
+        client.patch(
+            f"/api/campaigns/{cid}",
+            data=json.dumps({"name": "Renamed"}),
+            content_type="application/json",
+        )
+        resp = client.get(
+            f"/api/campaigns/{cid}", headers={"If-None-Match": etag}
+        )
+        assert resp.status_code == 200
+        assert resp.get_json()["name"] == "Renamed"
+        assert resp.headers["ETag"] != etag
+
+    def test_get_conditional_not_found(self, client):
+        resp = client.get(
+            "/api/campaigns/00000000-0000-0000-0000-000000000000",
+            headers={"If-None-Match": '"abc"'},
+        )
+        assert resp.status_code == 404
+
+    def test_get_sparse_fields(self, client):
+        cid = _post_campaign(client).get_json()["id"]
+
+        resp = client.get(f"/api/campaigns/{cid}?fields=targetAudience,id")
+        assert resp.status_code == 200
+        assert resp.get_json() == {"id": cid, "targetAudience": "Adults 25-45"}
+
+        full_etag = client.get(f"/api/campaigns/{cid}").headers["ETag"]
+        assert resp.headers["ETag"] != full_etag
+        conditional = client.get(
+            f"/api/campaigns/{cid}?fields=targetAudience,id",
+            headers={"If-None-Match": resp.headers["ETag"]},
+        )
+        assert conditional.status_code == 304
+
+    def test_get_unknown_field(self, client):
+        cid = _post_campaign(client).get_json()["id"]
+        resp = client.get(f"/api/campaigns/{cid}?fields=nope")
+        assert resp.status_code == 400
+
 
 # ------------------------------------------------------------------ UPDATE
 class TestUpdateCampaign:
@@ -219,3 +754,67 @@ class TestCampaignInsights:
             "/api/campaigns/00000000-0000-0000-0000-000000000000/insights"
         )
         assert resp.status_code == 404
+
+
+# ------------------------------------------------------------------ QUERIES
+class TestQueryBudgets:
+    def test_list(self, client, query_budget):
+        _post_campaign(client)
+        # exact count, page
+        with query_budget(2):
+            assert client.get("/api/campaigns").status_code == 200
+        with query_budget(0):
+            assert client.get("/api/campaigns").status_code == 200
+
+    def test_list_without_count_runs_only_the_page(
+        self, client, query_budget
+    ):
+        for i in range(3):
+            _post_campaign(client, name=f"Camp {i}", status="active")
+        with query_budget(1):
+            resp = client.get(
+                "/api/campaigns?count=none&limit=2&status=active"
+            )
+        cursor = resp.headers["X-Next-Cursor"]
+        with query_budget(1):
+            resp = client.get(
+                f"/api/campaigns?count=none&limit=2&cursor={cursor}"
+            )
+        assert resp.status_code == 200
+
+    def test_list_not_modified(self, client, query_budget):
+        _post_campaign(client)
+        etag = client.get("/api/campaigns").headers["ETag"]
+        # The payload (and its ETag) is cached: no query at all.
+        with query_budget(0):
+            resp = client.get(
+                "/api/campaigns", headers={"If-None-Match": etag}
+            )
+        assert resp.status_code == 304
+
+    def test_get(self, client, query_budget):
+        cid = _post_campaign(client).get_json()["id"]
+        with query_budget(1):
+            assert client.get(f"/api/campaigns/{cid}").status_code == 200
+
+    def test_create(self, client, query_budget):
+        # INSERT, then the refresh of server defaults after commit
+        with query_budget(2):
+            assert _post_campaign(client).status_code == 201
+
+    def test_batch_does_not_reload_per_row(self, client, query_budget):
+        items = [make_campaign_payload(name=f"Bulk {i}") for i in range(20)]
+        with query_budget(2):
+            resp = client.post("/api/campaigns/batch", json=items)
+        assert resp.status_code == 201
+        assert len(resp.get_json()["created"]) == 20
+
+    def test_delete_leaves_insights_to_the_database(
+        self, client, query_budget
+    ):
+        cid = _post_campaign(client).get_json()["id"]
+        _ingest_snapshot(client, cid)
+        _ingest_snapshot(client, cid, impressions=300)
+        with query_budget(2):
+            assert client.delete(f"/api/campaigns/{cid}").status_code == 204
+        assert client.get(f"/api/campaigns/{cid}/insights").status_code == 404
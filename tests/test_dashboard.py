@@ -1,10 +1,21 @@
 """Tests for the Dashboard API endpoints."""
 
 import json
+import time
 
+from app.extensions import cache, db
 from tests.conftest import make_campaign_payload
 
 
+def _post_campaign(client, **overrides):
+    payload = make_campaign_payload(**overrides)
+    return client.post(
+        "/api/campaigns",
+        data=json.dumps(payload),
+        content_type="application/json",
+    )
+
+
 class TestDashboardMetrics:
     def test_metrics_empty_db(self, client):
         resp = client.get("/api/dashboard/metrics")
@@ -58,6 +69,93 @@ class TestDashboardMetrics:
         assert data["budgetByPlatform"]["facebook"] == 1500.0
         assert data["budgetByPlatform"]["google"] == 2000.0
 
+    def test_metrics_follow_updates_and_deletes(self, client):
+        cid = _post_campaign(
+            client, status="active", platform="facebook", budget=1000
+        ).get_json()["id"]
+        _post_campaign(client, status="active", platform="google", budget=200)
+
+        client.patch(
+            f"/api/campaigns/{cid}",
+            data=json.dumps({"status": "paused", "platform": "twitter"}),
+            content_type="application/json",
+        )
+        data = client.get("/api/dashboard/metrics").get_json()
+        assert data["campaignsByStatus"]["active"] == 1
+        assert data["campaignsByStatus"]["paused"] == 1
+        assert data["budgetByPlatform"]["facebook"] == 0.0
+        assert data["budgetByPlatform"]["twitter"] == 1000.0
+        assert data["totalActiveBudget"] == 200.0
+
+        client.delete(f"/api/campaigns/{cid}")
+        data = client.get("/api/dashboard/metrics").get_json()
+        assert data["campaignsByStatus"]["paused"] == 0
+        assert data["budgetByPlatform"]["twitter"] == 0.0
+
+
+class TestSummaryRebuild:
+    def test_rebuild_repairs_drift(self, app, client):
+        _post_campaign(client, status="active", platform="google", budget=750)
+
+        with app.app_context():
+            db.session.execute(db.text("DELETE FROM campaign_summary"))
+            db.session.commit()
+        drifted = client.get("/api/dashboard/metrics").get_json()
+        assert drifted["campaignsByStatus"]["active"] == 0
+
+        result = app.test_cli_runner().invoke(args=["summary", "rebuild"])
+        assert result.exit_code == 0
+
+        data = client.get("/api/dashboard/metrics").get_json()
+        assert data["campaignsByStatus"]["active"] == 1
+        assert data["totalActiveBudget"] == 750.0
+
+
+class TestResponseCache:
+    def test_metrics_cached_until_write(self, client):
+        client.get("/api/dashboard/metrics")
+        client.get("/api/dashboard/metrics")
+        stats = client.get("/api/cache/stats").get_json()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+
+        _post_campaign(client, status="active", budget=300)
+        data = client.get("/api/dashboard/metrics").get_json()
+        assert data["campaignsByStatus"]["active"] == 1
+        assert client.get("/api/cache/stats").get_json()["misses"] == 2
+
+    def test_list_cached_per_params(self, client):
+        _post_campaign(client, status="active")
+        client.get("/api/campaigns?status=active")
+        client.get("/api/campaigns?status=active")
+        client.get("/api/campaigns?status=draft")
+        stats = client.get("/api/cache/stats").get_json()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+
+    def test_stale_entry_served_then_refreshed(self, app, client, monkeypatch):
+        monkeypatch.setattr(cache, "ttl", 0)
+        client.get("/api/dashboard/metrics")
+        resp = client.get("/api/dashboard/metrics")
+        assert resp.status_code == 200
+        assert client.get("/api/cache/stats").get_json()["staleHits"] == 1
+
+    def test_stale_refresh_stores_new_value(self, app, monkeypatch):
+        monkeypatch.setattr(cache, "ttl", 0)
+        with app.test_request_context():
+            assert cache.get_or_set("refresh-test", lambda: "old") == "old"
+            assert cache.get_or_set("refresh-test", lambda: "new") == "old"
+
+        # Poll for the background refresh thread to store the new value.
+        deadline = time.monotonic() + 5
+        entry = cache.backend.get("refresh-test")
+        while entry["value"] != "new" and time.monotonic() < deadline:
+            time.sleep(0.01)
+            entry = cache.backend.get("refresh-test")
+        assert entry["value"] == "new"
+        assert entry["version"] == cache.backend.get_version()
+        assert cache.stats["stale_hits"] == 1
+
 
 class TestHealthCheck:
     def test_health(self, client):
@@ -0,0 +1,543 @@
+"""Tests for the Insight API endpoints."""
+
+import io
+import json
+
+import pytest
+
+from tests.conftest import make_campaign_payload
+
+
+def _create_campaign(client, **overrides):
+    resp = client.post(
+        "/api/campaigns",
+        data=json.dumps(make_campaign_payload(**overrides)),
+        content_type="application/json",
+    )
+    return resp.get_json()["id"]
+
+
+def _snapshot(campaign_id, **overrides):
+    row = {
+        "campaignId": campaign_id,
+        "capturedAt": "2025-06-01T10:00:00+00:00",
+        "impressions": 1000,
+        "clicks": 50,
+        "conversions": 5,
+        "cpc": 1.25,
+        "roi": 120.5,
+        "engagementLikes": 10,
+        "engagementShares": 2,
+        "engagementComments": 1,
+    }
+    row.update(overrides)
+    return row
+
+
+def _ingest_ndjson(client, rows):
+    body = "\n".join(json.dumps(r) for r in rows)
+    return client.post(
+        "/api/insights/ingest", data=body, content_type="application/x-ndjson"
+    )
+
+
+# ------------------------------------------------------------------ INGEST
+class TestIngestInsights:
+    def test_ingest_ndjson_computes_ctr(self, client):
+        cid = _create_campaign(client)
+        resp = _ingest_ndjson(client, [_snapshot(cid)])
+        assert resp.status_code == 200
+        summary = resp.get_json()
+        assert summary["received"] == 1
+        assert summary["inserted"] == 1
+
+        data = client.get(f"/api/campaigns/{cid}/insights").get_json()
+        assert data["impressions"] == 1000
+        assert data["ctr"] == 5.0
+        assert data["engagement"]["likes"] == 10
+
+    def test_ingest_many_chunks_is_not_an_n_plus_one(
+        self, app, client, monkeypatch
+    ):
+        # One statement set per chunk: more chunks than the repeat
+        # threshold must pass the (raising) query audit.
+        monkeypatch.setitem(app.config, "INGEST_CHUNK_SIZE", 2)
+        chunks = app.config["QUERY_REPEAT_THRESHOLD"] * 2
+        cid = _create_campaign(client)
+        rows = [
+            _snapshot(cid, capturedAt=f"2025-06-01T10:{i:02d}:00Z")
+            for i in range(chunks * 2)
+        ]
+        resp = _ingest_ndjson(client, rows)
+        assert resp.status_code == 200
+        assert resp.get_json()["inserted"] == chunks * 2
+
+    def test_ingest_csv(self, client):
+        cid = _create_campaign(client)
+        body = (
+            "campaignId,capturedAt,impressions,clicks,conversions,ctr,cpc,"
+            "roi,engagementLikes,engagementShares,engagementComments\n"
+            f"{cid},2025-06-01T10:00:00Z,200,10,1,4.5,0.5,10,1,1,1\n"
+            f"{cid},2025-06-02T10:00:00Z,400,10,1,,0.5,10,1,1,1\n"
+        )
+        resp = client.post(
+            "/api/insights/ingest", data=body, content_type="text/csv"
+        )
+        assert resp.get_json()["inserted"] == 2
+
+        data = client.get(f"/api/campaigns/{cid}/insights").get_json()
+        assert data["impressions"] == 400
+        assert data["ctr"] == 2.5
+
+    def test_ingest_reports_invalid_rows(self, client):
+        cid = _create_campaign(client)
+        rows = [
+            _snapshot(cid),
+            _snapshot(cid, clicks=-1),
+            _snapshot("not-a-uuid"),
+        ]
+        summary = _ingest_ndjson(client, rows).get_json()
+        assert summary["inserted"] == 1
+        assert summary["rejected"] == 2
+        assert summary["errors"][0]["line"] == 2
+        assert summary["errors"][0]["details"][0]["field"] == "clicks"
+        assert summary["errors"][1]["details"][0]["field"] == "campaignId"
+
+    def test_ingest_rejects_values_the_columns_cannot_hold(self, client):
+        cid = _create_campaign(client)
+        rows = [
+            _snapshot(cid),
+            _snapshot(cid, impressions=2**63),
+            # numeric(5,2) rounds half up to 1000.00; the float rounds down
+            _snapshot(cid, ctr=999.995),
+            _snapshot(cid, cpc="1e8"),
+            _snapshot(cid, roi="NaN"),
+        ]
+        resp = _ingest_ndjson(client, rows)
+        assert resp.status_code == 200
+        summary = resp.get_json()
+        assert summary["inserted"] == 1
+        assert [e["details"][0]["field"] for e in summary["errors"]] == [
+            "impressions",
+            "ctr",
+            "cpc",
+            "roi",
+        ]
+
+    def test_ingest_is_idempotent(self, client):
+        cid = _create_campaign(client)
+        rows = [_snapshot(cid), _snapshot(cid)]
+        first = _ingest_ndjson(client, rows).get_json()
+        assert first["inserted"] == 1
+        assert first["duplicates"] == 1
+
+        second = _ingest_ndjson(client, rows).get_json()
+        assert second["inserted"] == 0
+        assert second["duplicates"] == 2
+
+    def test_ingest_skips_unknown_campaigns(self, client):
+        rows = [_snapshot("00000000-0000-0000-0000-000000000000")]
+        summary = _ingest_ndjson(client, rows).get_json()
+        assert summary["inserted"] == 0
+        assert summary["unknownCampaigns"] == 1
+
+    def test_ingest_multiple_chunks(self, app, client, monkeypatch):
+        monkeypatch.setitem(app.config, "INGEST_CHUNK_SIZE", 2)
+        cid = _create_campaign(client)
+        rows = [
+            _snapshot(cid, capturedAt=f"2025-06-0{day}T00:00:00Z")
+            for day in range(1, 6)
+        ]
+        assert _ingest_ndjson(client, rows).get_json()["inserted"] == 5
+
+    def test_ingest_from_plain_wsgi_input(self, client):
+        # gunicorn passes its own read()-only Body object through.
+        class Body:
+            def __init__(self, data):
+                self._data = io.BytesIO(data)
+
+            def read(self, size=-1):
+                return self._data.read(size)
+
+        cid = _create_campaign(client)
+        body = json.dumps(_snapshot(cid)).encode()
+        resp = client.post(
+            "/api/insights/ingest",
+            data=body,
+            content_type="application/x-ndjson",
+            environ_overrides={
+                "wsgi.input": Body(body),
+                "wsgi.input_terminated": True,
+            },
+        )
+        assert resp.status_code == 200
+        assert resp.get_json()["inserted"] == 1
+
+    def test_ingest_unsupported_media_type(self, client):
+        resp = client.post(
+            "/api/insights/ingest", data="{}", content_type="application/json"
+        )
+        assert resp.status_code == 415
+
+    def test_ingest_cli(self, app, client, tmp_path):
+        cid = _create_campaign(client)
+        source = tmp_path / "snapshots.ndjson"
+        source.write_text(json.dumps(_snapshot(cid)) + "\n")
+
+        result = app.test_cli_runner().invoke(
+            args=["insights", "ingest", str(source)]
+        )
+        assert result.exit_code == 0, result.output
+        assert "Ingested 1 of 1 rows" in result.output
+
+
+# ------------------------------------------------------------------ SERIES
+class TestInsightSeries:
+    def _seed(self, client):
+        cid = _create_campaign(client)
+        rows = [
+            _snapshot(
+                cid,
+                capturedAt="2025-06-01T01:00:00Z",
+                impressions=1000,
+                clicks=10,
+                cpc=1.0,
+            ),
+            _snapshot(
+                cid,
+                capturedAt="2025-06-01T13:00:00Z",
+                impressions=3000,
+                clicks=90,
+                cpc=2.0,
+            ),
+            _snapshot(cid, capturedAt="2025-06-03T05:00:00Z", clicks=20),
+        ]
+        _ingest_ndjson(client, rows)
+        return cid
+
+    def test_series_daily_buckets(self, client):
+        cid = self._seed(client)
+        resp = client.get(
+            f"/api/campaigns/{cid}/insights/series"
+            "?from=2025-06-01T00:00:00Z&to=2025-06-04T00:00:00Z&bucket=day"
+        )
+        assert resp.status_code == 200
+        body = resp.get_json()
+        assert body["bucket"] == "day"
+        assert body["bucketSeconds"] == 86400
+
+        first, second = body["points"]
+        assert first["start"].startswith("2025-06-01T00:00:00")
+        assert first["impressions"] == 4000
+        assert first["clicks"] == 100
+        assert first["ctr"] == 2.5  # 100 / 4000, not the mean of 1% and 3%
+        assert first["cpc"] == 1.9  # (10 * 1 + 90 * 2) / 100
+        assert second["start"].startswith("2025-06-03")
+
+    def test_series_downsamples_to_max_points(self, app, client, monkeypatch):
+        monkeypatch.setitem(app.config, "SERIES_MAX_POINTS", 2)
+        cid = self._seed(client)
+        body = client.get(
+            f"/api/campaigns/{cid}/insights/series"
+            "?from=2025-06-01T00:00:00Z&to=2025-06-04T00:00:00Z&bucket=hour"
+        ).get_json()
+        assert body["bucketSeconds"] == 36 * 3600
+        assert len(body["points"]) == 2
+        assert sum(p["impressions"] for p in body["points"]) == 5000
+
+    def test_series_range_filter(self, client):
+        cid = self._seed(client)
+        body = client.get(
+            f"/api/campaigns/{cid}/insights/series"
+            "?from=2025-06-02T00:00:00Z&to=2025-06-04T00:00:00Z"
+        ).get_json()
+        assert len(body["points"]) == 1
+
+    def test_series_date_range_covers_whole_days(self, client):
+        cid = self._seed(client)
+        base = f"/api/campaigns/{cid}/insights/series"
+        body = client.get(f"{base}?from=2025-06-01&to=2025-06-01").get_json()
+        assert [p["impressions"] for p in body["points"]] == [4000]
+
+        body = client.get(f"{base}?from=2025-06-02&to=2025-06-03").get_json()
+        assert [p["start"][:10] for p in body["points"]] == ["2025-06-03"]
+        assert client.get(f"{base}?from=2025-06-31").status_code == 400
+
+    def test_series_invalid_params(self, client):
+        cid = _create_campaign(client)
+        base = f"/api/campaigns/{cid}/insights/series"
+        assert client.get(f"{base}?bucket=month").status_code == 400
+        resp = client.get(
+            f"{base}?from=2025-06-02T00:00:00Z&to=2025-06-01T00:00:00Z"
+        )
+        assert resp.status_code == 400
+
+    def test_series_campaign_not_found(self, client):
+        resp = client.get(
+            "/api/campaigns/00000000-0000-0000-0000-000000000000"
+            "/insights/series"
+        )
+        assert resp.status_code == 404
+
+
+# ------------------------------------------------------------------ LATEST
+class TestLatestInsights:
+    def test_latest_for_many_campaigns(self, client):
+        with_data = _create_campaign(client, name="With data")
+        without_data = _create_campaign(client, name="Empty")
+        _ingest_ndjson(
+            client,
+            [
+                _snapshot(with_data, capturedAt="2025-06-01T00:00:00Z"),
+                _snapshot(
+                    with_data,
+                    capturedAt="2025-06-02T00:00:00Z",
+                    impressions=4242,
+                ),
+            ],
+        )
+        missing = "00000000-0000-0000-0000-000000000000"
+
+        resp = client.post(
+            "/api/insights/latest",
+            data=json.dumps({"campaignIds": [with_data, without_data, missing]}),
+            content_type="application/json",
+        )
+        assert resp.status_code == 200
+        body = resp.get_json()
+        assert body["insights"][with_data]["impressions"] == 4242
+        assert body["insights"][without_data]["impressions"] == 0
+        assert body["insights"][without_data]["engagement"]["likes"] == 0
+        assert body["notFound"] == [missing]
+
+    def test_latest_matches_single_endpoint(self, client):
+        cid = _create_campaign(client)
+        _ingest_ndjson(client, [_snapshot(cid)])
+
+        single = client.get(f"/api/campaigns/{cid}/insights").get_json()
+        batch = client.get(f"/api/insights/latest?ids={cid}").get_json()
+        assert batch["insights"][cid] == single
+
+    def test_latest_validation(self, app, client, monkeypatch):
+        assert client.get("/api/insights/latest").status_code == 400
+        assert client.get("/api/insights/latest?ids=nope").status_code == 400
+
+        monkeypatch.setitem(app.config, "LATEST_INSIGHTS_MAX_IDS", 1)
+        cid = _create_campaign(client)
+        resp = client.get(f"/api/insights/latest?ids={cid},{cid}")
+        assert resp.status_code == 400
+        assert resp.get_json()["details"][0]["field"] == "campaignIds"
+
+
+# ------------------------------------------------------------------ EXPORT
+class TestExportInsights:
+    def test_export_ndjson_round_trips(self, client):
+        cid = _create_campaign(client)
+        rows = [
+            _snapshot(cid, capturedAt="2025-06-02T00:00:00+00:00", ctr=7.5),
+            _snapshot(cid, capturedAt="2025-06-01T00:00:00+00:00"),
+        ]
+        _ingest_ndjson(client, rows)
+
+        resp = client.get("/api/insights/export")
+        assert resp.status_code == 200
+        assert resp.mimetype == "application/x-ndjson"
+        assert "insights.ndjson" in resp.headers["Content-Disposition"]
+        lines = [json.loads(line) for line in resp.data.splitlines()]
+        assert [r["capturedAt"] for r in lines] == [
+            "2025-06-01T00:00:00+00:00",
+            "2025-06-02T00:00:00+00:00",
+        ]
+        assert lines[0] == {**rows[1], "ctr": 5.0}
+        assert lines[1]["ctr"] == 7.5
+
+        client.delete(f"/api/campaigns/{cid}")
+        cid = _create_campaign(client)
+        reimport = [dict(r, campaignId=cid) for r in lines]
+        assert _ingest_ndjson(client, reimport).get_json()["inserted"] == 2
+
+    def test_export_csv_with_filters(self, client):
+        kept = _create_campaign(client, platform="google")
+        other = _create_campaign(client, platform="twitter")
+        _ingest_ndjson(
+            client,
+            [
+                _snapshot(kept, capturedAt="2025-06-01T00:00:00Z"),
+                _snapshot(kept, capturedAt="2025-07-01T00:00:00Z"),
+                _snapshot(other, capturedAt="2025-06-01T00:00:00Z"),
+            ],
+        )
+        resp = client.get(
+            "/api/insights/export?format=csv&platform=google"
+            "&from=2025-05-01T00:00:00Z&to=2025-06-15T00:00:00Z"
+        )
+        assert resp.mimetype == "text/csv"
+        header, *lines = resp.data.decode().splitlines()
+        assert header.startswith("campaignId,capturedAt,impressions")
+        assert len(lines) == 1
+        assert lines[0].startswith(f"{kept},2025-06-01")
+
+    def test_export_by_campaign(self, client):
+        cid = _create_campaign(client)
+        _ingest_ndjson(client, [_snapshot(cid)])
+        missing = "00000000-0000-0000-0000-000000000000"
+        resp = client.get(f"/api/insights/export?campaignId={missing}")
+        assert resp.status_code == 200
+        assert resp.data == b""
+
+    def test_export_invalid_range(self, client):
+        resp = client.get(
+            "/api/insights/export?from=2025-06-02T00:00:00Z"
+            "&to=2025-06-01T00:00:00Z"
+        )
+        assert resp.status_code == 400
+
+
+class TestColumnarExport:
+    @pytest.fixture(autouse=True)
+    def _pyarrow(self):
+        pytest.importorskip("pyarrow")
+
+    def _ingest(self, client):
+        kept = _create_campaign(client, platform="google", status="active")
+        other = _create_campaign(client, platform="twitter")
+        _ingest_ndjson(
+            client,
+            [
+                _snapshot(kept, capturedAt="2025-06-01T00:00:00Z", ctr=7.25),
+                _snapshot(kept, capturedAt="2025-07-01T00:00:00Z"),
+                _snapshot(other, capturedAt="2025-06-01T00:00:00Z"),
+            ],
+        )
+        return kept, other
+
+    def test_export_arrow_stream(self, client):
+        import pyarrow as pa
+
+        kept, other = self._ingest(client)
+        resp = client.get("/api/insights/export?format=arrow")
+        assert resp.status_code == 200
+        assert resp.mimetype == "application/vnd.apache.arrow.stream"
+        assert "insights.arrows" in resp.headers["Content-Disposition"]
+
+        table = pa.ipc.open_stream(resp.data).read_all()
+        assert table.num_rows == 3
+        assert str(table.schema.field("ctr").type) == "decimal128(5, 2)"
+        assert str(table.schema.field("captured_at").type) == (
+            "timestamp[us, tz=UTC]"
+        )
+        rows = sorted(table.to_pylist(), key=lambda r: r["captured_at"])
+        assert {r["campaign_id"] for r in rows} == {kept, other}
+        assert rows[-1]["captured_at"].isoformat() == (
+            "2025-07-01T00:00:00+00:00"
+        )
+
+    def test_export_parquet_with_campaign_columns(self, client):
+        import io
+
+        import pyarrow.parquet as pq
+
+        kept, _ = self._ingest(client)
+        resp = client.get(
+            "/api/insights/export?format=parquet&include=campaign"
+            "&platform=google&to=2025-06-15T00:00:00Z"
+        )
+        assert resp.mimetype == "application/vnd.apache.parquet"
+        rows = pq.read_table(io.BytesIO(resp.data)).to_pylist()
+        assert len(rows) == 1
+        assert rows[0]["campaign_id"] == kept
+        assert rows[0]["status"] == "active"
+        assert rows[0]["platform"] == "google"
+        assert str(rows[0]["ctr"]) == "7.25"
+
+    def test_export_empty(self, client):
+        import pyarrow as pa
+
+        resp = client.get("/api/insights/export?format=arrow&include=campaign")
+        table = pa.ipc.open_stream(resp.data).read_all()
+        assert table.num_rows == 0
+        assert table.schema.names[-2:] == ["status", "platform"]
+
+    def _ingest_hourly(self, app, client, monkeypatch, campaign_id):
+        """More COPY output than the first block and the pipe buffer
+        hold, so the COPY thread is still writing after the first block."""
+        from datetime import datetime, timedelta, timezone
+
+        monkeypatch.setitem(app.config, "EXPORT_COLUMNAR_BLOCK_SIZE", 4096)
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        _ingest_ndjson(
+            client,
+            [
+                _snapshot(
+                    campaign_id,
+                    capturedAt=(start + timedelta(hours=i)).isoformat(),
+                )
+                for i in range(2000)
+            ],
+        )
+
+    def test_unread_export_releases_connection(
+        self, app, client, monkeypatch
+    ):
+        import threading
+
+        from app.extensions import db
+        from app.services.export_service import ExportService
+
+        cid = _create_campaign(client)
+        self._ingest_hourly(app, client, monkeypatch, cid)
+        with app.app_context():
+            in_use = db.engine.pool.checkedout()
+            chunks = ExportService.export_insights("parquet")
+            chunks.close()  # e.g. a HEAD request: never iterated
+            assert "export-copy" not in {
+                t.name for t in threading.enumerate()
+            }
+            assert db.engine.pool.checkedout() == in_use
+
+    @pytest.mark.parametrize(
+        "column, value",
+        [("captured_at", "infinity"), ("ctr", "NaN")],
+    )
+    def test_export_rejects_unrepresentable_values(
+        self, app, client, monkeypatch, column, value
+    ):
+        import threading
+
+        from app.extensions import db
+
+        cid = _create_campaign(client)
+        with app.app_context():
+            # Ingest refuses these; insert directly, first in table order.
+            row = {
+                "campaign_id": cid,
+                "captured_at": "2024-01-01T00:00:00Z",
+                "ctr": "1.00",
+                column: value,
+            }
+            db.session.execute(
+                db.text(
+                    "INSERT INTO campaign_insights (campaign_id,"
+                    " captured_at, impressions, clicks, conversions, ctr,"
+                    " cpc, roi, engagement_likes, engagement_shares,"
+                    " engagement_comments) VALUES (:campaign_id,"
+                    " :captured_at, 1, 0, 0, :ctr, 0, 0, 0, 0, 0)"
+                ),
+                row,
+            )
+            db.session.commit()
+            in_use = db.engine.pool.checkedout()
+        self._ingest_hourly(app, client, monkeypatch, cid)
+
+        resp = client.get("/api/insights/export?format=arrow")
+        assert resp.status_code == 500
+        assert resp.get_json()["code"] == "unexportable_value"
+        assert "export-copy" not in {t.name for t in threading.enumerate()}
+        with app.app_context():
+            assert db.engine.pool.checkedout() == in_use
+
+    def test_columnar_rejects_search(self, client):
+        resp = client.get("/api/insights/export?format=parquet&search=x")
+        assert resp.status_code == 400
+        resp = client.get("/api/insights/export?include=campaign")
+        assert resp.status_code == 400
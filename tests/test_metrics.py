@@ -0,0 +1,89 @@
+"""Tests for the Prometheus /api/metrics endpoint."""
+
+import os
+import re
+
+from app.extensions import metrics
+from app.metrics import MULTIPROCESS_DIR, POOL_GAUGES, mark_process_dead
+
+_SAMPLE = re.compile(r"^(\w+)(\{.*\})? (\S+)$")
+
+
+def _scrape(client):
+    resp = client.get("/api/metrics")
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/plain"
+    samples = {}
+    for line in resp.get_data(as_text=True).splitlines():
+        match = _SAMPLE.match(line)
+        if match:
+            name, labels, value = match.groups()
+            samples[name + (labels or "")] = float(value)
+    return samples
+
+
+def _delta(before, after, key):
+    return after.get(key, 0) - before.get(key, 0)
+
+
+class TestMetricsEndpoint:
+    def test_counts_requests_latency_and_error_codes(self, client):
+        before = _scrape(client)
+        client.get("/api/campaigns")
+        client.post("/api/campaigns", json={})
+        after = _scrape(client)
+
+        listed = 'endpoint="campaigns.list_campaigns",method="GET"'
+        assert _delta(
+            before, after, f"http_requests_total{{{listed},status=\"200\"}}"
+        ) == 1
+        assert _delta(
+            before, after, f"http_request_duration_seconds_count{{{listed}}}"
+        ) == 1
+        assert _delta(
+            before,
+            after,
+            # merged samples list their labels sorted by name
+            'http_request_duration_seconds_bucket{endpoint='
+            '"campaigns.list_campaigns",le="+Inf",method="GET"}',
+        ) == 1
+        assert _delta(
+            before,
+            after,
+            'http_errors_total{code="validation_error",status="400"}',
+        ) == 1
+        assert _delta(before, after, "sqlalchemy_pool_wait_seconds_count") >= 1
+        assert after["sqlalchemy_pool_size"] >= 1
+        assert after["sqlalchemy_pool_checked_out"] >= 0
+
+    def test_aggregates_across_processes(self, client):
+        key = (
+            'http_requests_total{endpoint="forked",method="GET",'
+            'status="200"}'
+        )
+        before = _scrape(client)
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover - child process
+            try:
+                metrics.observe_request("forked", "GET", 200, 0.01)
+            finally:
+                os._exit(0)
+        os.waitpid(pid, 0)
+        metrics.observe_request("forked", "GET", 200, 0.01)
+        assert _delta(before, _scrape(client), key) == 2
+
+
+    def test_exited_worker_gauges_are_dropped(self):
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover - child process
+            try:
+                POOL_GAUGES["size"].set(100)
+                mark_process_dead()  # what atexit runs in a worker
+            finally:
+                os._exit(0)
+        os.waitpid(pid, 0)
+        assert not [
+            name
+            for name in os.listdir(MULTIPROCESS_DIR)
+            if name.startswith("gauge_live") and name.endswith(f"_{pid}.db")
+        ]
@@ -0,0 +1,99 @@
+"""Tests for the query budget / N+1 request audit."""
+
+import logging
+
+import pytest
+
+from app import create_app
+from app.extensions import db
+from app.middleware.query_audit import (
+    QueryBudgetExceeded,
+    query_budget,
+    record_queries,
+)
+
+
+@pytest.fixture(scope="module")
+def audited_app(app):
+    """A second testing app with a budgeted route and an N+1 loop."""
+    audited = create_app("testing")
+
+    @query_budget(1)
+    def over_budget():
+        db.session.execute(db.text("SELECT 1"))
+        db.session.execute(db.text("SELECT 2"))
+        return "ok"
+
+    def n_plus_one():
+        for i in range(audited.config["QUERY_REPEAT_THRESHOLD"]):
+            db.session.execute(db.text("SELECT :i"), {"i": i})
+        return "ok"
+
+    @query_budget(1)
+    def committed_over_budget():
+        db.session.execute(db.text("SELECT 1"))
+        db.session.commit()
+        db.session.execute(db.text("SELECT 2"))
+        return "ok"
+
+    @query_budget(repeats_ok=True)
+    def chunked():
+        return n_plus_one()
+
+    audited.add_url_rule("/_audit/budget", "over_budget", over_budget)
+    audited.add_url_rule("/_audit/loop", "n_plus_one", n_plus_one)
+    audited.add_url_rule(
+        "/_audit/committed", "committed_over_budget", committed_over_budget
+    )
+    audited.add_url_rule("/_audit/chunked", "chunked", chunked)
+    return audited
+
+
+@pytest.fixture()
+def audited_client(audited_app):
+    return audited_app.test_client()
+
+
+class TestQueryAudit:
+    def test_budget_overrun_raises(self, audited_client):
+        with pytest.raises(QueryBudgetExceeded) as excinfo:
+            audited_client.get("/_audit/budget")
+        message = str(excinfo.value)
+        assert "ran 2 queries (budget 1)" in message
+        assert "1. SELECT 1" in message and "2. SELECT 2" in message
+
+    def test_repeated_statement_reported_as_n_plus_one(
+        self, audited_app, audited_client
+    ):
+        threshold = audited_app.config["QUERY_REPEAT_THRESHOLD"]
+        with pytest.raises(QueryBudgetExceeded) as excinfo:
+            audited_client.get("/_audit/loop")
+        assert f"possible N+1: {threshold} x SELECT" in str(excinfo.value)
+
+    def test_repeats_ok_skips_the_n_plus_one_check(self, audited_client):
+        assert audited_client.get("/_audit/chunked").status_code == 200
+
+    def test_committed_request_is_logged_not_raised(
+        self, audited_client, caplog
+    ):
+        with caplog.at_level(logging.ERROR, "app.middleware.query_audit"):
+            resp = audited_client.get("/_audit/committed")
+        assert resp.status_code == 200
+        assert "ran 2 queries (budget 1)" in caplog.text
+        assert "not raised: the request committed" in caplog.text
+
+    def test_warn_mode_logs(
+        self, audited_app, audited_client, monkeypatch, caplog
+    ):
+        monkeypatch.setitem(audited_app.config, "QUERY_AUDIT", "warn")
+        with caplog.at_level(logging.WARNING, "app.middleware.query_audit"):
+            resp = audited_client.get("/_audit/budget")
+        assert resp.status_code == 200
+        assert "ran 2 queries (budget 1)" in caplog.text
+
+    def test_recorders_nest_with_the_request(self, client, query_budget):
+        with query_budget(2) as outer:
+            with record_queries() as inner:
+                client.get("/api/campaigns")
+            assert inner.count == outer.count == 2
+        assert [s.split()[0] for s in outer.statements] == ["SELECT"] * 2
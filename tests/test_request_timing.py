@@ -0,0 +1,46 @@
+"""Tests for the Server-Timing request instrumentation."""
+
+import logging
+import re
+
+from app.middleware.request_timing import current_timing, phase
+from tests.conftest import make_campaign_payload
+
+
+def _timings(header):
+    return dict(re.findall(r"(\w+);dur=([\d.]+)", header))
+
+
+class TestRequestTiming:
+    def test_sampled_request_reports_phases(
+        self, app, client, monkeypatch, caplog
+    ):
+        monkeypatch.setitem(app.config, "REQUEST_TIMING_SAMPLE_RATE", 1.0)
+        client.post("/api/campaigns", json=make_campaign_payload())
+
+        with caplog.at_level(logging.INFO, logger="app.request_timing"):
+            resp = client.get("/api/campaigns")
+        assert resp.status_code == 200
+
+        header = resp.headers["Server-Timing"]
+        durations = _timings(header)
+        assert set(durations) == {"db", "serialize", "app", "total"}
+        assert float(durations["total"]) >= float(durations["db"]) > 0
+        queries = int(re.search(r'desc="(\d+) queries"', header).group(1))
+        assert queries >= 1
+
+        line = caplog.records[-1].getMessage()
+        assert "path=/api/campaigns" in line
+        assert f"queries={queries} " in line
+        assert "status=200" in line
+
+    def test_unsampled_request_has_no_header(self, app, client, monkeypatch):
+        monkeypatch.setitem(app.config, "REQUEST_TIMING_SAMPLE_RATE", 0.0)
+        resp = client.get("/api/campaigns")
+        assert "Server-Timing" not in resp.headers
+
+    def test_phase_outside_sampled_request_is_noop(self):
+        assert current_timing() is None
+        with phase("serialize"):
+            pass
+        assert current_timing() is None
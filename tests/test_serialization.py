@@ -0,0 +1,138 @@
+"""Parity tests for the precompiled dumpers and the orjson JSON provider."""
+
+import json
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from flask.json.provider import DefaultJSONProvider
+from marshmallow import Schema, fields
+
+from app.models.campaign import Campaign
+from app.schemas import (
+    CampaignInsightSchema,
+    CampaignSchema,
+    compile_dumper,
+    dump_campaign,
+    dump_campaign_rows,
+    dump_campaigns,
+    dump_insights,
+)
+from app.services.campaign_service import CampaignService
+from app.services.insight_service import insight_payload
+from tests.conftest import make_campaign_payload
+
+
+def _campaign(**overrides):
+    values = {
+        "id": uuid.uuid4(),
+        "name": "Summer Sale – été",
+        "status": "active",
+        "platform": "google",
+        "budget": Decimal("1234.50"),
+        "start_date": date(2025, 6, 1),
+        "end_date": date(2025, 8, 31),
+        "description": "Seasonal push",
+        "target_audience": "Adults 25-45",
+        "created_at": datetime(2025, 5, 1, 9, 30, tzinfo=timezone.utc),
+        "updated_at": datetime(
+            2025, 5, 2, 10, 15, 30, 123456, tzinfo=timezone.utc
+        ),
+    }
+    values.update(overrides)
+    return Campaign(**values)
+
+
+class TestFastDumpers:
+    def test_campaign_parity(self):
+        campaigns = [
+            _campaign(),
+            _campaign(budget=Decimal("0.01"), name="Ünïcode ✓"),
+            _campaign(created_at=None, updated_at=None),
+        ]
+        expected = CampaignSchema(many=True).dump(campaigns)
+        assert dump_campaigns(campaigns) == expected
+        assert dump_campaign(campaigns[0]) == expected[0]
+        assert list(dump_campaign(campaigns[0])) == list(expected[0])
+
+    def test_campaign_row_parity(self, app, client):
+        client.post("/api/campaigns", json=make_campaign_payload())
+        with app.app_context():
+            rows = CampaignService.list_campaigns(count="none").items
+            only = ("name", "budget")
+            sparse = CampaignService.get_campaign(rows[0].id, only)
+        assert dump_campaign_rows(rows) == CampaignSchema(many=True).dump(rows)
+        assert dump_campaign_rows([sparse], only) == [
+            CampaignSchema(only=only).dump(sparse)
+        ]
+
+    def test_insights_parity(self):
+        class Row:
+            impressions = 1000
+            clicks = 50
+            conversions = 5
+            ctr = Decimal("5.00")
+            cpc = Decimal("1.25")
+            roi = Decimal("-12.30")
+            engagement_likes = 10
+            engagement_shares = 2
+            engagement_comments = 1
+
+        schema = CampaignInsightSchema()
+        for payload in (insight_payload(Row()), insight_payload(None)):
+            assert dump_insights(payload) == schema.dump(payload)
+
+    def test_respects_only(self):
+        schema = CampaignSchema(only=("id", "start_date"))
+        campaign = _campaign()
+        assert compile_dumper(schema)(campaign) == schema.dump(campaign)
+
+    def test_unsupported_field_rejected(self):
+        class Custom(Schema):
+            total = fields.Method("get_total")
+
+            def get_total(self, obj):
+                return 0
+
+        with pytest.raises(TypeError):
+            compile_dumper(Custom())
+
+
+class TestJSONProvider:
+    def test_matches_default_provider(self, app):
+        payload = {
+            "b": [1, 2.5, None, True],
+            "a": {"id": uuid.UUID(int=1), "budget": Decimal("10.10")},
+            "when": datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            "day": date(2025, 1, 2),
+            "body": dump_campaign(_campaign(name="ascii only")),
+        }
+        default = DefaultJSONProvider(app)
+        compact = {"separators": (",", ":")}
+        assert app.json.dumps(payload, **compact) == default.dumps(
+            payload, **compact
+        )
+        assert app.json.dumps(payload, indent=2) == default.dumps(
+            payload, indent=2
+        )
+        assert app.json.dumps(payload) == default.dumps(payload)
+
+        with app.test_request_context():
+            fast = app.json.response(payload).get_data()
+            expected = default.response(payload).get_data()
+        assert fast == expected
+        assert fast.endswith(b"\n")
+
+    def test_non_ascii_round_trips(self, app):
+        payload = {"name": "Ünïcode ✓"}
+        assert json.loads(app.json.dumps(payload)) == payload
+
+    def test_falls_back_for_unsupported_values(self, app):
+        payload = {"big": 2**70}
+        with app.test_request_context():
+            body = app.json.response(payload).get_data()
+        assert body == b'{"big":1180591620717411303424}\n'
+
+    def test_loads(self, app):
+        assert app.json.loads(b'{"a": [1, "x"]}') == {"a": [1, "x"]}